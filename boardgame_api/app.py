@@ -23,6 +23,14 @@ if os.getenv('FLASK_ENV') == 'production':
 else:
     app.config.from_object('config.DevelopmentConfig')
 
+# Faster JSON encoding when orjson is available
+from utils.json_provider import init_json_provider
+init_json_provider(app)
+
+# gzip/brotli compression of large JSON responses
+from utils.compression import init_compression
+init_compression(app)
+
 @app.before_request 
 def before_request(): 
     headers = { 'Access-Control-Allow-Origin': '*', 'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS', 'Access-Control-Allow-Headers': 'Content-Type' } 
@@ -36,11 +44,21 @@ from controllers.game_controller import game_bp
 from controllers.player_controller import player_bp
 from controllers.game_play_controller import game_play_bp
 from controllers.ranking_controller import ranking_bp
+from controllers.export_controller import export_bp
+from controllers.dashboard_controller import dashboard_bp
+from controllers.job_controller import job_bp
 
 app.register_blueprint(game_bp, url_prefix='/api/games')
 app.register_blueprint(player_bp, url_prefix='/api/players')
 app.register_blueprint(game_play_bp, url_prefix='/api/game-plays')
 app.register_blueprint(ranking_bp, url_prefix='/api/rankings')
+app.register_blueprint(export_bp, url_prefix='/api/export')
+app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+app.register_blueprint(job_bp, url_prefix='/api/jobs')
+
+# Run background jobs (BGG imports) in worker threads, resuming unfinished ones
+from services.job_service import init_job_runner
+init_job_runner(app)
 
 # Error handlers
 @app.errorhandler(404)
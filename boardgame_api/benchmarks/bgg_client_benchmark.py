@@ -0,0 +1,89 @@
+"""
+BGG client benchmark: shared rate limit across processes and 202 retries.
+
+Starts several processes that each send BGG thing requests through
+services.bgg_client as fast as they can, against the local BGG stub (see
+bgg_stub.py). All of them draw from the one token bucket in the shared
+cache file, so the aggregate rate should stay at --rate however many
+processes there are. Then fetches a collection the stub keeps answering
+with 202 for --queued attempts, which the client must retry through.
+The client's counters from /api/games/bgg-client are printed at the end.
+
+    python benchmarks/bgg_client_benchmark.py --processes 4 --requests 10 --rate 5
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import multiprocessing
+import time
+
+from app import app
+from services import bgg_client
+from benchmarks.bgg_stub import start_stub
+
+def send_requests(index, count):
+    """Send `count` thing requests; returns the times they were sent"""
+    sent = []
+    with app.app_context():
+        for n in range(count):
+            response = bgg_client.get('thing', params={'id': index * count + n + 1, 'stats': 1})
+            response.close()
+            sent.append(time.time())
+    return sent
+
+def max_in_window(times, seconds=1.0):
+    """Most requests sent within any `seconds` long window"""
+    times = sorted(times)
+    start, best = 0, 0
+    for end, sent in enumerate(times):
+        while sent - times[start] > seconds:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+def run(args):
+    server, api_url = start_stub(delay=args.delay, queued=args.queued)
+    app.config.update(
+        BGG_API_URL=api_url, BGG_REQUESTS_PER_SECOND=args.rate, BGG_RATE_BURST=args.burst,
+        BGG_BACKOFF_BASE=args.backoff
+    )
+    
+    try:
+        started = time.time()
+        with multiprocessing.get_context('fork').Pool(args.processes) as pool:
+            sent = [t for times in pool.starmap(send_requests, [(i, args.requests) for i in range(args.processes)]) for t in times]
+        seconds = time.time() - started
+        total = len(sent)
+        print(f"{args.processes} processes x {args.requests} requests, limit {args.rate}/s, burst {args.burst}")
+        # The first `burst` requests may go out at once; the rate applies to the rest
+        print(f"took {seconds:.2f}s (limit allows no less than {(total - args.burst) / args.rate:.2f}s), "
+              f"{total / seconds:.2f} requests/s overall, at most {max_in_window(sent)} in any 1s window")
+        
+        with app.app_context():
+            started = time.time()
+            response = bgg_client.get('collection', params={'username': 'benchmark'})
+            items = response.text.count('<item ')
+            print(f"collection answered 202 {args.queued} time(s), then {items} items after {time.time() - started:.2f}s")
+            stats = bgg_client.get_client_stats()
+    finally:
+        server.shutdown()
+    
+    print("client counters: " + ", ".join(
+        f"{key} {stats[key]}" for key in ('requests', 'retries', 'failures', 'avg_request_ms', 'rate_limit_wait_ms')
+    ))
+    if max_in_window(sent) > args.burst + args.rate + 1:
+        print("RATE LIMIT EXCEEDED")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check the BGG client rate limit across processes and its 202 retries')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=10, help='Requests per process')
+    parser.add_argument('--rate', type=float, default=5.0, help='BGG_REQUESTS_PER_SECOND for the run')
+    parser.add_argument('--burst', type=float, default=2.0, help='BGG_RATE_BURST for the run')
+    parser.add_argument('--delay', type=float, default=0.05, help='Seconds the stub takes per request')
+    parser.add_argument('--queued', type=int, default=2, help='202 answers before the stub returns the collection')
+    parser.add_argument('--backoff', type=float, default=0.2, help='BGG_BACKOFF_BASE for the run')
+    run(parser.parse_args())
@@ -0,0 +1,112 @@
+"""
+BGG collection parsing benchmark: whole-tree parsing vs the streaming parser.
+
+Writes synthetic collection XML files with stats (like BGG's
+/collection?stats=1) of increasing size, then parses each one the old
+way (ET.parse and findall over the whole tree) and with
+iter_bgg_collection, measuring peak traced memory with tracemalloc and
+wall time. Both must yield the same games. The streaming parser's peak
+should stay flat as the collection grows.
+
+    python benchmarks/bgg_collection_parse_benchmark.py --sizes 1000 10000 50000
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+from app import app
+from services.bgg_service import iter_bgg_collection
+
+def write_collection(path, size):
+    """Write a collection of `size` items, one at a time so the file is never held in memory"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'<?xml version="1.0" encoding="utf-8" standalone="yes"?>\n<items totalitems="{size}" '
+                'termsofuse="https://boardgamegeek.com/xmlapi/termsofuse" pubdate="Sat, 17 Oct 2026 00:00:00 +0000">\n')
+        for n in range(size):
+            bgg_id = n + 1
+            f.write(
+                f'<item objecttype="thing" objectid="{bgg_id}" subtype="boardgame" collid="{9000000 + n}">'
+                f'<name sortindex="1">Synthetic game {bgg_id}</name><yearpublished>{1990 + n % 35}</yearpublished>'
+                f'<image>https://cf.geekdo-images.com/{bgg_id}/original.jpg</image>'
+                f'<thumbnail>https://cf.geekdo-images.com/{bgg_id}/thumb.jpg</thumbnail>'
+                f'<stats minplayers="2" maxplayers="4" minplaytime="30" maxplaytime="90" playingtime="90" numowned="{n * 7 % 50000}">'
+                f'<rating value="N/A"><usersrated value="{n % 9000}"/><average value="7.1"/><bayesaverage value="6.8"/>'
+                f'<stddev value="1.4"/><median value="0"/>'
+                f'<ranks><rank type="subtype" id="1" name="boardgame" friendlyname="Board Game Rank" value="{bgg_id}" bayesaverage="6.8"/></ranks>'
+                f'</rating></stats>'
+                f'<status own="1" prevowned="0" fortrade="0" want="0" wanttoplay="0" wanttobuy="0" wishlist="0" preordered="0" lastmodified="2026-01-01 00:00:00"/>'
+                f'<numplays>{n % 12}</numplays><comment>{quoteattr("Comment & notes " + str(bgg_id))[1:-1]}</comment></item>\n'
+            )
+        f.write('</items>\n')
+
+def parse_whole_tree(path):
+    """The previous approach: build the whole tree, then walk its items"""
+    games = []
+    for item in ET.parse(path).getroot().findall('item'):
+        year = item.find('yearpublished')
+        numplays = item.find('numplays')
+        games.append({
+            'bgg_id': int(item.get('objectid')),
+            'name': item.find('name').text,
+            'release_year': int(year.text) if year is not None else None,
+            'image_url': item.findtext('image'),
+            'thumbnail_url': item.findtext('thumbnail'),
+            'comment': item.findtext('comment'),
+            'numplays': int(numplays.text) if numplays is not None else 0
+        })
+    return games
+
+def measure(func):
+    """(result, peak traced MB, seconds) of func()"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak / 1024 / 1024, seconds
+
+def run(args):
+    print(f"{'items':>8} {'file MB':>8} {'tree peak MB':>13} {'tree s':>7} {'stream peak MB':>15} {'stream s':>9}")
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f'collection-{size}.xml')
+            write_collection(path, size)
+            
+            tree_games, tree_peak, tree_seconds = measure(lambda: parse_whole_tree(path))
+            # Compare each streamed game with the tree parse without keeping it, as the importer would
+            checked = {'count': 0, 'mismatches': 0}
+            
+            def stream():
+                for game in iter_bgg_collection(path):
+                    if game != tree_games[checked['count']]:
+                        checked['mismatches'] += 1
+                    checked['count'] += 1
+            
+            _, stream_peak, stream_seconds = measure(stream)
+            print(f"{size:>8} {os.path.getsize(path) / 1024 / 1024:>8.1f} {tree_peak:>13.1f} {tree_seconds:>7.2f} "
+                  f"{stream_peak:>15.2f} {stream_seconds:>9.2f}")
+            if checked['count'] != len(tree_games) or checked['mismatches']:
+                print(f"MISMATCH: streamed {checked['count']} games, {checked['mismatches']} differ from the tree parse")
+                failed = True
+            del tree_games
+    
+    if failed:
+        sys.exit(1)
+    print("Streaming parse matches the whole-tree parse")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Peak memory of whole-tree vs streaming BGG collection parsing')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='Collection sizes to parse')
+    args = parser.parse_args()
+    # Same setup as the importer, which parses inside the app
+    with app.app_context():
+        run(args)
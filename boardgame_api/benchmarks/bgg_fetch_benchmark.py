@@ -0,0 +1,74 @@
+"""
+BGG thing fetch benchmark: one request per game, batched requests and the cache.
+
+Runs fetch_game_from_bgg for each id and fetch_games_from_bgg for all of
+them (both bypassing the BGG response cache), then fetch_games_from_bgg
+again served from the cache, against the local BGG stub (see
+bgg_stub.py). Checks all three return the same game data and compares
+request counts and wall time. The fixture
+games are always included, so parsing of the sample BGG responses is
+checked on every run.
+
+    python benchmarks/bgg_fetch_benchmark.py --games 100 --delay 0.2 --rate 1000
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+from app import app
+from services.game_service import fetch_game_from_bgg, fetch_games_from_bgg
+from benchmarks.bgg_stub import start_stub, load_fixture_items
+
+# Generated games get ids far above the fixture ones
+FIRST_GENERATED_ID = 1_000_000
+
+def run(args):
+    server, api_url = start_stub(delay=args.delay)
+    app.config.update(BGG_API_URL=api_url, BGG_REQUESTS_PER_SECOND=args.rate, BGG_RATE_BURST=max(1.0, args.rate))
+    bgg_ids = list(load_fixture_items()) + list(range(FIRST_GENERATED_ID, FIRST_GENERATED_ID + args.games))
+    
+    try:
+        with app.app_context():
+            started = time.perf_counter()
+            single = {bgg_id: fetch_game_from_bgg(bgg_id, force_refresh=True) for bgg_id in bgg_ids}
+            single_seconds = time.perf_counter() - started
+            single_requests = len(server.requests)
+            
+            started = time.perf_counter()
+            batched = fetch_games_from_bgg(bgg_ids, chunk_size=args.chunk_size, force_refresh=True)
+            batched_seconds = time.perf_counter() - started
+            batched_requests = len(server.requests) - single_requests
+            
+            started = time.perf_counter()
+            cached = fetch_games_from_bgg(bgg_ids, chunk_size=args.chunk_size)
+            cached_seconds = time.perf_counter() - started
+            cached_requests = len(server.requests) - single_requests - batched_requests
+    finally:
+        server.shutdown()
+    
+    missing = [bgg_id for bgg_id in bgg_ids if bgg_id not in batched or bgg_id not in cached]
+    mismatched = [
+        bgg_id for bgg_id in bgg_ids
+        if bgg_id not in missing and not batched[bgg_id] == cached[bgg_id] == single[bgg_id]
+    ]
+    print(f"{len(bgg_ids)} games, {args.delay}s stub latency, at most {args.rate} BGG requests/s")
+    print(f"{'mode':<10} {'requests':>9} {'seconds':>9}")
+    print(f"{'per id':<10} {single_requests:>9} {single_seconds:>9.2f}")
+    print(f"{'batched':<10} {batched_requests:>9} {batched_seconds:>9.2f}")
+    print(f"{'cached':<10} {cached_requests:>9} {cached_seconds:>9.2f}")
+    if missing or mismatched:
+        print(f"MISMATCH: missing {missing}, different {mismatched}")
+        sys.exit(1)
+    print("Batched and cached results match the per-id results")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare per-id and batched BGG thing fetches')
+    parser.add_argument('--games', type=int, default=100, help='Generated games on top of the fixture games')
+    parser.add_argument('--delay', type=float, default=0.2, help='Seconds the stub takes per request')
+    parser.add_argument('--rate', type=float, default=1000.0,
+                        help='BGG_REQUESTS_PER_SECOND for the run (production default is 0.5)')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Ids per request (default BGG_THING_BATCH_SIZE)')
+    run(parser.parse_args())
@@ -0,0 +1,190 @@
+"""
+Load test: ranking endpoint latency while BGG imports are running.
+
+Starts gunicorn with gunicorn.conf.py against the benchmark database and
+the local BGG stub (bgg_stub.py), which answers every request after a
+delay. Concurrent clients hit the ranking endpoints, first on their own
+and then while several /api/games/import-bgg requests are in flight.
+Latency percentiles and failures are printed for both phases.
+
+    python benchmarks/bgg_import_load_test.py --results 200000
+    python benchmarks/bgg_import_load_test.py --reuse --worker-class sync --threads 1
+
+The second form reproduces the old sync workers, where each import holds
+a whole worker until it finishes. Uses the same throwaway database as
+ranking_benchmark.py unless BENCHMARK_DATABASE_URL is set. SQLite allows
+one writer at a time, so concurrent imports into it can report "database
+is locked" errors; point BENCHMARK_DATABASE_URL at Postgres to avoid them.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.ranking_benchmark import percentile
+from app import app
+from benchmarks.synthetic_data import load_dataset
+from benchmarks.bgg_stub import start_stub
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    '/api/rankings/overall',
+    '/api/rankings/games/1',
+    '/api/rankings/players/1',
+]
+
+# Imported games get ids far above anything in the synthetic dataset
+BGG_ID_OFFSET = 10_000_000
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def start_gunicorn(args, bgg_url):
+    port = free_port()
+    env = dict(
+        os.environ,
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        BGG_API_URL=bgg_url,
+        BGG_REQUESTS_PER_SECOND='1000',
+        BGG_RATE_BURST='1000',
+        RANKING_CACHE_PATH=os.path.join(tempfile.mkdtemp(), 'cache.sqlite3'),
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    wait_for(base_url + ENDPOINTS[0])
+    return server, base_url
+
+def hit_rankings(base_url, duration, clients, timeout):
+    """Request the ranking endpoints from `clients` threads for `duration` seconds"""
+    latencies, failures = [], []
+    deadline = time.time() + duration
+    
+    def client(index):
+        n = index
+        while time.time() < deadline:
+            url = base_url + ENDPOINTS[n % len(ENDPOINTS)]
+            n += 1
+            started = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=timeout).read()
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception as e:
+                failures.append(type(e).__name__)
+    
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(client, range(clients)))
+    return latencies, failures
+
+def start_imports(base_url, count, games, timeout):
+    """Fire `count` concurrent collection imports; returns the threads and their outcomes"""
+    outcomes = []
+    # Fresh ids on every run so reused databases still import every game
+    first_id = BGG_ID_OFFSET + random.randrange(100_000) * count * games
+    
+    def run(index):
+        request = urllib.request.Request(
+            base_url + '/api/games/import-bgg',
+            data=json.dumps({'username': f'loadtest-{first_id + index * games}'}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        started = time.perf_counter()
+        try:
+            body = json.loads(urllib.request.urlopen(request, timeout=timeout).read())
+            outcomes.append((
+                time.perf_counter() - started,
+                f"{len(body.get('addedGames', []))} added, {len(body.get('errors', []))} errors"
+            ))
+        except Exception as e:
+            outcomes.append((time.perf_counter() - started, type(e).__name__))
+    
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+def report(phase, latencies, failures):
+    if latencies:
+        print(f"{phase:<16} {len(latencies):>8} {percentile(latencies, 50):>9.1f} "
+              f"{percentile(latencies, 95):>9.1f} {max(latencies):>9.1f} {len(failures):>9}")
+    else:
+        print(f"{phase:<16} {0:>8} {'-':>9} {'-':>9} {'-':>9} {len(failures):>9}")
+
+def run(args):
+    if not args.reuse:
+        with app.app_context():
+            print(f"Generating {args.results} results for {args.players} players and {args.games} games...")
+            load_dataset(players=args.players, games=args.games, results=args.results, seed=args.seed)
+    
+    stub, bgg_url = start_stub(delay=args.bgg_delay, collection_size=args.import_games)
+    
+    server, base_url = start_gunicorn(args, bgg_url)
+    try:
+        print(f"gunicorn: {args.workers} x {args.worker_class} worker(s), {args.threads} thread(s) each; "
+              f"{args.imports} import(s) of {args.import_games} games at {args.bgg_delay}s per BGG call")
+        print(f"{'phase':<16} {'requests':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'failures':>9}")
+        # Warm each worker's caches before measuring
+        hit_rankings(base_url, 1.0, args.clients, args.timeout)
+        report('baseline', *hit_rankings(base_url, args.duration, args.clients, args.timeout))
+        
+        threads, outcomes = start_imports(base_url, args.imports, args.import_games, timeout=args.import_games * args.bgg_delay * 4 + 60)
+        # Give the imports time to occupy their workers or threads
+        time.sleep(min(1.0, args.bgg_delay / 2))
+        report('during imports', *hit_rankings(base_url, args.duration, args.clients, args.timeout))
+        
+        for thread in threads:
+            thread.join()
+        for seconds, outcome in outcomes:
+            print(f"import finished in {seconds:.1f}s: {outcome}")
+    finally:
+        server.terminate()
+        server.wait()
+        stub.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Ranking latency under concurrent BGG imports')
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reuse', action='store_true', help='Use the existing benchmark database as-is')
+    parser.add_argument('--worker-class', default='gthread')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--imports', type=int, default=4, help='Concurrent import-bgg requests')
+    parser.add_argument('--import-games', type=int, default=5, help='Games in each stub collection')
+    parser.add_argument('--bgg-delay', type=float, default=2.0, help='Seconds the stub takes per BGG request')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent ranking clients')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per measurement phase')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Ranking request timeout in seconds')
+    run(parser.parse_args())
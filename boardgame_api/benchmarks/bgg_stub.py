@@ -0,0 +1,102 @@
+"""
+Local stand-in for the BGG XML API, used by the benchmarks that exercise BGG code.
+
+/thing answers every requested id: ids present in fixtures/bgg_things.xml
+get their sample item, any other id a generated one. /collection answers
+usernames ending in -<n> with a collection of `collection_size` games
+starting at BGG id n, and any other username with the fixture games. Like
+BGG, the first `queued` requests for each collection are answered with
+202 while it is "being prepared". Every request waits `delay` seconds
+first, to mimic BGG latency, and is logged in `server.requests`.
+
+    server, api_url = start_stub(delay=0.5)
+    ...
+    server.shutdown()
+"""
+import copy
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'bgg_things.xml')
+
+def load_fixture_items(path=FIXTURE_PATH):
+    """{bgg_id: <item> element} from a BGG thing response"""
+    return {int(item.get('id')): item for item in ET.parse(path).getroot().findall('item')}
+
+def generated_item(bgg_id):
+    """A thing <item> for ids without a fixture"""
+    return ET.fromstring(
+        f'<item type="boardgame" id="{bgg_id}"><image>https://example.com/{bgg_id}.jpg</image>'
+        f'<name type="primary" sortindex="1" value="Stub game {bgg_id}"/>'
+        '<description>Generated by the BGG stub</description><yearpublished value="2020"/>'
+        '<minplayers value="2"/><maxplayers value="4"/><playingtime value="60"/>'
+        '<statistics page="1"><ratings><averageweight value="2.5"/></ratings></statistics></item>'
+    )
+
+def thing_response(bgg_ids, fixtures):
+    root = ET.Element('items')
+    for bgg_id in bgg_ids:
+        root.append(copy.deepcopy(fixtures[bgg_id]) if bgg_id in fixtures else generated_item(bgg_id))
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+def collection_response(username, size, fixtures):
+    suffix = username.rsplit('-', 1)[-1]
+    bgg_ids = range(int(suffix), int(suffix) + size) if suffix.isdigit() else list(fixtures)
+    root = ET.Element('items', totalitems=str(len(bgg_ids)))
+    for bgg_id in bgg_ids:
+        name = fixtures[bgg_id].find('name').get('value') if bgg_id in fixtures else f'Stub game {bgg_id}'
+        item = ET.SubElement(root, 'item', objecttype='thing', objectid=str(bgg_id), subtype='boardgame')
+        ET.SubElement(item, 'name', sortindex='1').text = name
+        ET.SubElement(item, 'yearpublished').text = '2020'
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+class StubBGGHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        time.sleep(server.delay)
+        
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.endswith('/thing') and 'id' in query:
+            body = thing_response([int(bgg_id) for bgg_id in query['id'][0].split(',')], server.fixtures)
+        elif url.path.endswith('/collection') and 'username' in query:
+            with server.lock:
+                attempts = server.collection_attempts.get(query['username'][0], 0)
+                server.collection_attempts[query['username'][0]] = attempts + 1
+            if attempts < server.queued:
+                self.send_response(202)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = collection_response(query['username'][0], server.collection_size, server.fixtures)
+        else:
+            self.send_error(400)
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+def start_stub(delay=0.0, collection_size=5, queued=0):
+    """Serve the stub API on a free local port; returns (server, BGG_API_URL for it)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubBGGHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.collection_size = collection_size
+    server.queued = queued
+    server.fixtures = load_fixture_items()
+    server.requests = []
+    server.collection_attempts = {}
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/xmlapi2'
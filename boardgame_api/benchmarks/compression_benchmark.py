@@ -0,0 +1,62 @@
+"""
+Response compression benchmark.
+
+For each large endpoint, compares body size and latency of an identity
+response against gzip and brotli, and the latency of the first compressed
+request (serialize + compress) against repeats served from the compressed
+response cache.
+
+    python benchmarks/compression_benchmark.py --results 200000
+    python benchmarks/compression_benchmark.py --reuse
+
+Uses the same throwaway database as ranking_benchmark.py unless
+BENCHMARK_DATABASE_URL is set.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+
+from benchmarks.ranking_benchmark import QueryCounter, percentile
+from benchmarks.conditional_get_benchmark import timed_requests
+from app import app
+from extensions import db
+from benchmarks.synthetic_data import load_dataset
+from utils.compression import supported_encodings
+
+ENDPOINTS = [
+    '/api/games/',
+    '/api/game-plays/',
+    '/api/game-plays/?limit=200&expand=game,players',
+    '/api/rankings/overall',
+]
+
+def run(args):
+    with app.app_context():
+        if not args.reuse:
+            print(f"Generating {args.results} results for {args.players} players and {args.games} games...")
+            load_dataset(players=args.players, games=args.games, results=args.results, seed=args.seed)
+        counter = QueryCounter(db.engine)
+    
+    client = app.test_client()
+    print(f"{'endpoint':<48} {'encoding':>8} {'bytes':>10} {'first ms':>9} {'cached p50 ms':>14} {'cached queries':>15}")
+    for url in ENDPOINTS:
+        for encoding in ('identity',) + supported_encodings():
+            headers = {'Accept-Encoding': encoding}
+            # Cache keys include the encoding, so the first request of each is a miss
+            first, _, _ = timed_requests(client, counter, url, 1, headers)
+            size = len(client.get(url, headers=headers).get_data())
+            cached, cached_queries, _ = timed_requests(client, counter, url, args.repeat, headers)
+            print(f"{url:<48} {encoding:>8} {size:>10} {first[0]:>9.1f} "
+                  f"{percentile(cached, 50):>14.2f} {cached_queries:>15.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark compressed and cached compressed responses')
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=20, help='Cached requests per endpoint and encoding')
+    parser.add_argument('--reuse', action='store_true', help='Benchmark the existing benchmark database as-is')
+    run(parser.parse_args())
@@ -0,0 +1,81 @@
+"""
+Conditional GET benchmark.
+
+For each cached endpoint, times full 200 responses against revalidations
+that send back the ETag (If-None-Match) and counts the SQL statements each
+issues. Once the data version mirror is warm the 304 path should issue none.
+
+    python benchmarks/conditional_get_benchmark.py --results 200000
+    python benchmarks/conditional_get_benchmark.py --reuse
+
+Uses the same throwaway database as ranking_benchmark.py unless
+BENCHMARK_DATABASE_URL is set.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import statistics
+import time
+
+from benchmarks.ranking_benchmark import QueryCounter, percentile
+from app import app
+from extensions import db
+from benchmarks.synthetic_data import load_dataset
+
+ENDPOINTS = [
+    '/api/games/',
+    '/api/players/',
+    '/api/game-plays/?limit=50',
+    '/api/rankings/overall',
+    '/api/rankings/games/1',
+    '/api/rankings/players/1',
+]
+
+def timed_requests(client, counter, url, repeat, headers=None):
+    latencies, queries, statuses = [], [], set()
+    for _ in range(repeat):
+        before = counter.count
+        started = time.perf_counter()
+        response = client.get(url, headers=headers or {})
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count - before)
+        statuses.add(response.status_code)
+    return latencies, statistics.mean(queries), statuses
+
+def run(args):
+    with app.app_context():
+        if not args.reuse:
+            print(f"Generating {args.results} results for {args.players} players and {args.games} games...")
+            load_dataset(players=args.players, games=args.games, results=args.results, seed=args.seed)
+        counter = QueryCounter(db.engine)
+    
+    client = app.test_client()
+    print(f"{'endpoint':<28} {'200 p50 ms':>11} {'200 queries':>12} {'304 p50 ms':>11} {'304 queries':>12}")
+    for url in ENDPOINTS:
+        etag = client.get(url).headers.get('ETag')
+        if not etag:
+            print(f"{url:<28} no ETag returned")
+            continue
+        
+        full, full_queries, _ = timed_requests(client, counter, url, args.repeat)
+        cached, cached_queries, statuses = timed_requests(
+            client, counter, url, args.repeat, headers={'If-None-Match': etag}
+        )
+        if statuses != {304}:
+            print(f"{url:<28} revalidation returned {sorted(statuses)}")
+            continue
+        
+        print(f"{url:<28} {percentile(full, 50):>11.2f} {full_queries:>12.1f} "
+              f"{percentile(cached, 50):>11.2f} {cached_queries:>12.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark 200 vs 304 responses on cached endpoints')
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=20, help='Requests per endpoint and path')
+    parser.add_argument('--reuse', action='store_true', help='Benchmark the existing benchmark database as-is')
+    run(parser.parse_args())
@@ -0,0 +1,176 @@
+"""
+Ranking service benchmark.
+
+Generates a synthetic dataset (see synthetic_data.py), then times every
+public ranking_service function and counts the SQL statements each call
+issues. Results are written as JSON so runs from different commits can be
+compared:
+    
+    python benchmarks/ranking_benchmark.py --players 500 --games 5000 --results 1000000
+    python benchmarks/ranking_benchmark.py --reuse --compare benchmarks/results/<previous>.json
+
+By default the data goes into a throwaway SQLite file; set
+BENCHMARK_DATABASE_URL to benchmark against a local Postgres instead.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Never point the benchmark at a real database
+default_database = os.path.join(tempfile.gettempdir(), 'boardgame_ranking_benchmark.sqlite3')
+os.environ['DATABASE_URL'] = os.getenv('BENCHMARK_DATABASE_URL', f'sqlite:///{default_database}')
+os.environ.pop('FLASK_ENV', None)
+
+from sqlalchemy import event, func
+from app import app
+from extensions import db
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from services import ranking_service
+from benchmarks.synthetic_data import load_dataset
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+class QueryCounter:
+    """Counts statements sent to the database while active"""
+    
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+    
+    def _on_execute(self, *args):
+        self.count += 1
+
+def measure(name, func, args_list, counter, repeat):
+    """Call func once per args (cycling) `repeat` times; return latency and query stats"""
+    latencies = []
+    queries = []
+    for i in range(repeat):
+        args = args_list[i % len(args_list)]
+        db.session.expire_all()
+        before = counter.count
+        started = time.perf_counter()
+        func(*args)
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count - before)
+    
+    return {
+        'function': name,
+        'calls': repeat,
+        'queries_per_call': statistics.mean(queries),
+        'p50_ms': percentile(latencies, 50),
+        'p90_ms': percentile(latencies, 90),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': max(latencies),
+        'mean_ms': statistics.mean(latencies)
+    }
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    with app.app_context():
+        app.config['RANKING_ENGINE'] = args.engine
+        
+        if args.reuse:
+            dataset = {
+                'plays': GamePlay.query.count(),
+                'results': PlayResult.query.count(),
+                'reused': True
+            }
+        else:
+            print(f"Generating {args.results} results for {args.players} players and {args.games} games...")
+            started = time.time()
+            dataset = load_dataset(players=args.players, games=args.games, results=args.results, seed=args.seed)
+            print(f"Loaded {dataset['plays']} plays in {time.time() - started:.1f}s\n")
+        
+        rng = random.Random(args.seed)
+        played_games = [game_id for game_id, in db.session.query(GamePlay.game_id).distinct().limit(1000)]
+        player_ids = [player_id for player_id, in db.session.query(PlayResult.player_id).distinct().limit(1000)]
+        latest = db.session.query(func.max(GamePlay.start_time)).scalar() or datetime.utcnow()
+        
+        sample_games = [(rng.choice(played_games),) for _ in range(args.repeat)] if played_games else [(1,)]
+        sample_players = [(rng.choice(player_ids),) for _ in range(args.repeat)] if player_ids else [(1,)]
+        
+        counter = QueryCounter(db.engine)
+        benchmarks = [
+            ('get_player_overall_ranking', ranking_service.get_player_overall_ranking, [()]),
+            ('get_player_yearly_ranking', ranking_service.get_player_yearly_ranking, [(latest.year,), (latest.year - 1,)]),
+            ('get_game_ranking', ranking_service.get_game_ranking, sample_games),
+            ('get_player_game_ranking', ranking_service.get_player_game_ranking, sample_players),
+            ('get_player_stats', ranking_service.get_player_stats, sample_players),
+        ]
+        
+        # One untimed call each so connection setup and engine loading are not measured
+        for _, func_, args_list in benchmarks:
+            func_(*args_list[0])
+        
+        results = [measure(name, func_, args_list, counter, args.repeat) for name, func_, args_list in benchmarks]
+        
+        return {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'database': db.engine.url.get_backend_name(),
+            'engine': args.engine,
+            'dataset': dataset,
+            'results': results
+        }
+
+def print_report(report, baseline=None):
+    previous = {r['function']: r for r in baseline['results']} if baseline else {}
+    print(f"{'function':<30} {'queries':>8} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'vs base p50':>12}")
+    for result in report['results']:
+        delta = ''
+        if result['function'] in previous and previous[result['function']]['p50_ms']:
+            change = result['p50_ms'] / previous[result['function']]['p50_ms'] - 1
+            delta = f"{change:+.0%}"
+        print(f"{result['function']:<30} {result['queries_per_call']:>8.1f} {result['p50_ms']:>10.2f} "
+              f"{result['p90_ms']:>10.2f} {result['p99_ms']:>10.2f} {delta:>12}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark ranking_service against synthetic data')
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=20, help='Timed calls per function')
+    parser.add_argument('--engine', choices=['sql', 'memory'], default='sql')
+    parser.add_argument('--reuse', action='store_true', help='Benchmark the existing benchmark database as-is')
+    parser.add_argument('--output', help='JSON output path (default: benchmarks/results/ranking-<commit>-<time>.json)')
+    parser.add_argument('--compare', help='Previous JSON result to compare p50 latencies against')
+    args = parser.parse_args()
+    
+    report = run(args)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, 'results',
+        f"ranking-{report['commit'] or 'nocommit'}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
@@ -0,0 +1,95 @@
+"""
+Rating replay benchmark.
+
+Builds synthetic histories of growing size in a throwaway SQLite database and
+measures how many plays get_current_ratings() replays after a new play is
+logged near the end of the history. With checkpoints the replay should stay
+around RATING_CHECKPOINT_INTERVAL plays however long the history is.
+    
+    python benchmarks/rating_replay_benchmark.py --sizes 1000 5000 20000
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Never point the benchmark at a real database
+database_path = os.path.join(tempfile.mkdtemp(), 'rating_benchmark.sqlite3')
+os.environ['DATABASE_URL'] = os.getenv('BENCHMARK_DATABASE_URL', f'sqlite:///{database_path}')
+os.environ.pop('FLASK_ENV', None)
+
+from sqlalchemy import insert
+from app import app
+from extensions import db
+from models.game import Game
+from models.player import Player
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from models.rating_checkpoint import RatingCheckpoint
+from services.rating_service import get_current_ratings
+
+def load_history(num_plays, num_players=50, num_games=20, seed=42):
+    """Insert num_plays synthetic plays, one hour apart, with 2-5 ranked players each"""
+    rng = random.Random(seed)
+    db.drop_all()
+    db.create_all()
+    
+    db.session.execute(insert(Player), [{'name': f'Player {i}'} for i in range(1, num_players + 1)])
+    db.session.execute(insert(Game), [{'name': f'Game {i}'} for i in range(1, num_games + 1)])
+    
+    start = datetime(2020, 1, 1)
+    db.session.execute(insert(GamePlay), [
+        {'play_id': play_id, 'game_id': rng.randint(1, num_games), 'start_time': start + timedelta(hours=play_id)}
+        for play_id in range(1, num_plays + 1)
+    ])
+    
+    results = []
+    for play_id in range(1, num_plays + 1):
+        players = rng.sample(range(1, num_players + 1), rng.randint(2, 5))
+        results.extend({'play_id': play_id, 'player_id': player_id, 'rank': rank}
+                       for rank, player_id in enumerate(players, start=1))
+    db.session.execute(insert(PlayResult), results)
+    db.session.commit()
+    
+    return start + timedelta(hours=num_plays)
+
+def timed(func):
+    started = time.perf_counter()
+    _, replayed = func()
+    return replayed, (time.perf_counter() - started) * 1000
+
+def run(sizes):
+    client = app.test_client()
+    interval = app.config['RATING_CHECKPOINT_INTERVAL']
+    print(f"Checkpoint interval: {interval} plays\n")
+    print(f"{'history':>10} {'full replay':>22} {'after new play':>22} {'checkpoints':>12}")
+    
+    for size in sizes:
+        with app.app_context():
+            last_play_time = load_history(size)
+            full_replayed, full_ms = timed(get_current_ratings)
+        
+        # Log a play through the API, slightly before the latest one
+        response = client.post('/api/game-plays/', json={
+            'game_id': 1,
+            'start_time': (last_play_time - timedelta(minutes=30)).isoformat(),
+            'results': [{'player_id': 1, 'rank': 1}, {'player_id': 2, 'rank': 2}]
+        })
+        assert response.status_code == 201, response.get_data(as_text=True)
+        
+        with app.app_context():
+            replayed, replay_ms = timed(get_current_ratings)
+            checkpoints = RatingCheckpoint.query.count()
+        
+        print(f"{size:>10} {full_replayed:>8} plays {full_ms:>8.1f}ms {replayed:>8} plays {replay_ms:>8.1f}ms {checkpoints:>12}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure rating replay cost as history grows')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    args = parser.parse_args()
+    run(args.sizes)
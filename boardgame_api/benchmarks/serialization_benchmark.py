@@ -0,0 +1,92 @@
+"""
+List endpoint serialization benchmark.
+
+Compares the ORM path (hydrate models, call to_dict(), encode with Flask's
+default JSON provider) against the column-tuple serializers encoded with the
+orjson provider, for the games, players and game plays lists. Both outputs are
+checked for equality before timing.
+
+    python benchmarks/serialization_benchmark.py --games 5000 --results 200000
+    python benchmarks/serialization_benchmark.py --reuse
+
+Uses the same throwaway database as ranking_benchmark.py unless
+BENCHMARK_DATABASE_URL is set.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+
+default_database = os.path.join(tempfile.gettempdir(), 'boardgame_ranking_benchmark.sqlite3')
+os.environ['DATABASE_URL'] = os.getenv('BENCHMARK_DATABASE_URL', f'sqlite:///{default_database}')
+os.environ.pop('FLASK_ENV', None)
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.orm import undefer_group
+from app import app
+from extensions import db
+from models.game import Game
+from models.player import Player
+from services.game_play_service import get_all_game_plays
+from utils.json_provider import OrjsonProvider, orjson
+from utils.serializers import game_dicts, player_dicts, game_play_dicts
+from benchmarks.synthetic_data import load_dataset
+
+def orm_path(provider, load):
+    return provider.dumps([item.to_dict() for item in load()], separators=(',', ':'))
+
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        db.session.expire_all()
+        started = time.perf_counter()
+        output = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), output
+
+def run(args):
+    if orjson is None:
+        sys.exit("orjson is not installed")
+    
+    with app.app_context():
+        if not args.reuse:
+            print(f"Generating {args.results} results for {args.players} players and {args.games} games...")
+            load_dataset(players=args.players, games=args.games, results=args.results, seed=args.seed)
+        
+        default_provider = DefaultJSONProvider(app)
+        fast_provider = OrjsonProvider(app)
+        
+        # description and comment are deferred on the model; load them up front as to_dict() needs them
+        games_query = Game.query.options(undefer_group('game_text'))
+        cases = [
+            ('games', lambda: orm_path(default_provider, games_query.all), lambda: fast_provider.dumps(game_dicts())),
+            ('players', lambda: orm_path(default_provider, Player.query.all), lambda: fast_provider.dumps(player_dicts())),
+            ('game_plays', lambda: orm_path(default_provider, get_all_game_plays),
+             lambda: fast_provider.dumps(game_play_dicts())),
+        ]
+        
+        print(f"{'list':<12} {'rows':>8} {'to_dict ms':>12} {'fast ms':>10} {'speedup':>9} {'same bytes':>11}")
+        for name, orm, fast in cases:
+            orm_ms, orm_output = time_call(orm, args.repeat)
+            fast_ms, fast_output = time_call(fast, args.repeat)
+            
+            if json.loads(orm_output) != json.loads(fast_output):
+                sys.exit(f"{name}: fast serializer output differs from to_dict()")
+            
+            print(f"{name:<12} {len(json.loads(fast_output)):>8} {orm_ms:>12.1f} {fast_ms:>10.1f} "
+                  f"{orm_ms / fast_ms:>8.1f}x {str(orm_output == fast_output):>11}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark list endpoint serialization paths')
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per path (median is reported)')
+    parser.add_argument('--reuse', action='store_true', help='Benchmark the existing benchmark database as-is')
+    run(parser.parse_args())
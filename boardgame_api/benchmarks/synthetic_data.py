@@ -0,0 +1,79 @@
+"""
+Synthetic players, games, plays and results for benchmarks.
+
+Only ever run against a throwaway database: load_dataset() drops and
+recreates every table.
+"""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from extensions import db
+from models.game import Game
+from models.player import Player
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from services.ranking_service import calculate_victory_points
+from services.leaderboard_service import round_victory_points, rebuild_leaderboard
+
+INSERT_BATCH = 10000
+
+def _insert(model, rows):
+    for i in range(0, len(rows), INSERT_BATCH):
+        db.session.execute(insert(model), rows[i:i + INSERT_BATCH])
+
+def load_dataset(players=500, games=5000, results=1000000, start=datetime(2019, 1, 1),
+                 end=datetime(2026, 1, 1), min_players=2, max_players=6, seed=42):
+    """
+    Recreate the schema and fill it with roughly `results` play results.
+    
+    Plays are spread uniformly over [start, end) and ranked randomly; victory
+    points are computed with the real scoring rule. Returns a summary dict.
+    """
+    rng = random.Random(seed)
+    db.drop_all()
+    db.create_all()
+    
+    _insert(Player, [{'player_id': i, 'name': f'Player {i}', 'alias': f'P{i}'} for i in range(1, players + 1)])
+    _insert(Game, [{'game_id': i, 'name': f'Game {i}', 'description': 'Synthetic game ' * 50}
+                   for i in range(1, games + 1)])
+    
+    span = (end - start).total_seconds()
+    play_rows = []
+    result_rows = []
+    play_id = 0
+    while len(result_rows) < results:
+        play_id += 1
+        start_time = start + timedelta(seconds=rng.random() * span)
+        play_rows.append({
+            'play_id': play_id,
+            'game_id': rng.randint(1, games),
+            'start_time': start_time,
+            'end_time': start_time + timedelta(minutes=90),
+            'duration': 90,
+            'mode': 'Standard'
+        })
+        
+        seated = rng.sample(range(1, players + 1), rng.randint(min_players, max_players))
+        player_ranks = [(player_id, rank) for rank, player_id in enumerate(seated, start=1)]
+        victory_points_map = calculate_victory_points(player_ranks)
+        result_rows.extend({
+            'play_id': play_id,
+            'player_id': player_id,
+            'rank': rank,
+            'score': rng.randint(0, 200),
+            'victory_points': round_victory_points(victory_points_map[player_id])
+        } for player_id, rank in player_ranks)
+    
+    _insert(GamePlay, play_rows)
+    _insert(PlayResult, result_rows)
+    db.session.commit()
+    
+    rebuild_leaderboard()
+    
+    return {
+        'players': players,
+        'games': games,
+        'plays': len(play_rows),
+        'results': len(result_rows),
+        'seed': seed
+    }
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 class Config:
     """Base configuration."""
@@ -6,6 +7,55 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     DEBUG = False
     TESTING = False
+    
+    # Ranking result cache, shared by all gunicorn workers on the host
+    RANKING_CACHE_PATH = os.getenv(
+        'RANKING_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'boardgame_ranking_cache.sqlite3')
+    )
+    RANKING_CACHE_MAX_ENTRIES = int(os.getenv('RANKING_CACHE_MAX_ENTRIES', 256))
+    
+    # Seconds a data version read for an ETag is trusted before re-checking the database
+    DATA_VERSION_TTL = float(os.getenv('DATA_VERSION_TTL', 2))
+    
+    # Responses at least this many bytes are gzip/brotli compressed when the client accepts it
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))
+    # Compressed bodies of ETag-cached responses, kept in the ranking cache file
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # BoardGameGeek XML API; BGG_API_URL can point at a stub for load tests
+    BGG_API_URL = os.getenv('BGG_API_URL', 'https://boardgamegeek.com/xmlapi2')
+    # Seconds to wait for BGG to connect and to send each chunk of a response
+    BGG_TIMEOUT = float(os.getenv('BGG_TIMEOUT', 30))
+    # BGG requests from all processes on the host share one token bucket
+    BGG_REQUESTS_PER_SECOND = float(os.getenv('BGG_REQUESTS_PER_SECOND', 0.5))
+    BGG_RATE_BURST = float(os.getenv('BGG_RATE_BURST', 2))
+    # Retries of 202 "queued", 429 and 5xx answers, backing off from BGG_BACKOFF_BASE seconds
+    BGG_MAX_RETRIES = int(os.getenv('BGG_MAX_RETRIES', 5))
+    BGG_BACKOFF_BASE = float(os.getenv('BGG_BACKOFF_BASE', 2))
+    BGG_BACKOFF_MAX = float(os.getenv('BGG_BACKOFF_MAX', 60))
+    BGG_POOL_SIZE = int(os.getenv('BGG_POOL_SIZE', 10))
+    BGG_USER_AGENT = os.getenv('BGG_USER_AGENT', 'boardgame-system')
+    # Ids per thing request; BGG rejects more than 20
+    BGG_THING_BATCH_SIZE = int(os.getenv('BGG_THING_BATCH_SIZE', 20))
+    # Raw BGG XML is kept gzip-compressed in the ranking cache file; entries older
+    # than their TTL are refetched, but still served if BGG cannot be reached
+    BGG_CACHE_TTL = int(os.getenv('BGG_CACHE_TTL', 7 * 24 * 3600))
+    BGG_COLLECTION_CACHE_TTL = int(os.getenv('BGG_COLLECTION_CACHE_TTL', 3600))
+    BGG_CACHE_MAX_BYTES = int(os.getenv('BGG_CACHE_MAX_BYTES', 128 * 1024 * 1024))
+    
+    # Background jobs (BGG imports): threads per worker process, seconds without a
+    # heartbeat before another worker takes a running job over, and runs before giving up
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_STALE_AFTER = int(os.getenv('JOB_STALE_AFTER', 300))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    
+    # 'memory' serves leaderboards from the in-process pandas engine instead of SQL
+    RANKING_ENGINE = os.getenv('RANKING_ENGINE', 'sql')
+    
+    # Elo ratings are checkpointed every this many replayed plays
+    RATING_CHECKPOINT_INTERVAL = int(os.getenv('RATING_CHECKPOINT_INTERVAL', 100))
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -0,0 +1,32 @@
+from flask import Blueprint, request, jsonify
+from services.cache_service import get_or_compute, RANKINGS_VERSION, GAMES_VERSION, PLAYERS_VERSION, GAME_PLAYS_VERSION
+from services.dashboard_service import get_dashboard
+from utils.date_range import MIN_YEAR, MAX_YEAR
+from utils.http_cache import conditional
+
+dashboard_bp = Blueprint('dashboard_bp', __name__)
+
+# Upper bound on ?top= and ?recent= so the summary stays small
+MAX_DASHBOARD_ROWS = 50
+
+@dashboard_bp.route('', methods=['GET'])
+@conditional(RANKINGS_VERSION, GAMES_VERSION, PLAYERS_VERSION, GAME_PLAYS_VERSION)
+def get_dashboard_summary():
+    """Get dashboard totals, recent plays, grade-point player rankings and win rates (?year=&min_plays=&top=)"""
+    try:
+        year = request.args.get('year')
+        year = int(year) if year else None
+        min_plays = int(request.args.get('min_plays', 1))
+        top = int(request.args.get('top', 5))
+        recent = int(request.args.get('recent', 5))
+    except ValueError:
+        return jsonify({'error': 'year, min_plays, top and recent must be integers'}), 400
+    
+    if year is not None and not MIN_YEAR <= year <= MAX_YEAR:
+        return jsonify({'error': f'year must be between {MIN_YEAR} and {MAX_YEAR}'}), 400
+    if not (1 <= top <= MAX_DASHBOARD_ROWS and 1 <= recent <= MAX_DASHBOARD_ROWS):
+        return jsonify({'error': f'top and recent must be between 1 and {MAX_DASHBOARD_ROWS}'}), 400
+    
+    # Every write bumps the rankings version, so it also keys the cached summary
+    dashboard = get_or_compute('dashboard', get_dashboard, year, max(min_plays, 1), top, recent)
+    return jsonify(dashboard)
@@ -0,0 +1,25 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from services.export_service import export_ndjson
+from utils.date_range import parse_datetime
+
+export_bp = Blueprint('export_bp', __name__)
+
+@export_bp.route('', methods=['GET'])
+def export_history():
+    """
+    Stream all games, players and game plays as NDJSON.
+    
+    ?since= limits the export to records created at or after a time, plus
+    plays whose results were edited since. Other edits and deletions are
+    not included; take a full export to capture them.
+    """
+    try:
+        since = parse_datetime(request.args.get('since'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return Response(
+        stream_with_context(export_ndjson(since)),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename=boardgame-export.ndjson'}
+    )
@@ -1,33 +1,52 @@
 from flask import Blueprint, request, jsonify
 from extensions import db
+from services.cache_service import bump_data_version, RANKINGS_VERSION, GAMES_VERSION
 from models.game import Game
-from services.game_service import fetch_game_from_bgg, get_all_games, get_game_by_id
-from services.bgg_service import import_bgg_collection
+from services.game_service import fetch_game_from_bgg, get_game_by_id
+from services.bgg_service import BGG_IMPORT_JOB
+from services.bgg_client import get_client_stats
+from services.job_service import enqueue_job
+from utils.serializers import game_dicts, parse_fields, field_names, GAME_FIELDS, GAME_FIELD_PRESETS
+from utils.http_cache import conditional
 
 game_bp = Blueprint('game_bp', __name__)
 
+def _force_refresh():
+    """?refresh=true skips the BGG response cache"""
+    return request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+
 @game_bp.route('/', methods=['GET'])
+@conditional(GAMES_VERSION)
 def get_games():
-    """Get all games"""
-    games = get_all_games()
-    return jsonify([game.to_dict() for game in games])
+    """Get all games (?fields=name,image_url or ?fields=compact for a subset of fields)"""
+    try:
+        only = parse_fields(request.args.get('fields'), field_names(GAME_FIELDS), GAME_FIELD_PRESETS, always=('game_id',))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(game_dicts(only=only))
 
 @game_bp.route('/<int:game_id>', methods=['GET'])
+@conditional(GAMES_VERSION)
 def get_game(game_id):
-    """Get a game by ID"""
-    game = get_game_by_id(game_id)
-    if not game:
+    """Get a game by ID (?fields= as for the list)"""
+    try:
+        only = parse_fields(request.args.get('fields'), field_names(GAME_FIELDS), GAME_FIELD_PRESETS, always=('game_id',))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    games = game_dicts(Game.query.filter_by(game_id=game_id), only)
+    if not games:
         return jsonify({'error': 'Game not found'}), 404
-    return jsonify(game.to_dict())
+    return jsonify(games[0])
 
 @game_bp.route('/', methods=['POST'])
 def create_game():
-    """Create a new game"""
+    """Create a new game (with a bgg_id, details come from BGG; ?refresh=true skips the BGG cache)"""
     data = request.json
     
     # If BGG ID is provided, fetch data from BGG API
     if 'bgg_id' in data and data['bgg_id']:
-        bgg_data = fetch_game_from_bgg(data['bgg_id'])
+        bgg_data = fetch_game_from_bgg(data['bgg_id'], force_refresh=_force_refresh())
         if bgg_data:
             data.update(bgg_data)
     
@@ -42,6 +61,7 @@ def create_game():
     )
     
     db.session.add(game)
+    bump_data_version(RANKINGS_VERSION, GAMES_VERSION)
     db.session.commit()
     
     return jsonify(game.to_dict()), 201
@@ -63,6 +83,7 @@ def update_game(game_id):
     game.image_url = data.get('image_url', game.image_url)
     game.bgg_id = data.get('bgg_id', game.bgg_id)
     
+    bump_data_version(RANKINGS_VERSION, GAMES_VERSION)
     db.session.commit()
     
     return jsonify(game.to_dict())
@@ -75,24 +96,34 @@ def delete_game(game_id):
         return jsonify({'error': 'Game not found'}), 404
     
     db.session.delete(game)
+    bump_data_version(RANKINGS_VERSION, GAMES_VERSION)
     db.session.commit()
     
     return jsonify({'message': 'Game deleted successfully'})
 
+@game_bp.route('/bgg-client', methods=['GET'])
+def get_bgg_client_stats():
+    """Get request, retry and rate-limit counters for the BGG client"""
+    return jsonify(get_client_stats())
+
 @game_bp.route('/import-bgg', methods=['POST'])
 def import_bgg_games():
+    """
+    Start a background import of a BGG user's collection.
+    
+    Returns 202 with the job; poll GET /api/jobs/<job_id> (also in the
+    Location header) for progress, added games and errors. ?refresh=true
+    refetches everything from BGG instead of using cached responses.
+    """
     try:
         username = request.json.get('username')
         if not username:
             return jsonify({'error': 'BGG username is required'}), 400
-            
-        added_games, errors = import_bgg_collection(username)
-
-        print(added_games)
         
-        return jsonify({
-            'addedGames': [game.to_dict() for game in added_games],
-            'errors': errors
-        })
+        job = enqueue_job(BGG_IMPORT_JOB, {'username': username, 'force_refresh': _force_refresh()})
+        
+        response = jsonify(job.to_dict())
+        response.headers['Location'] = f'/api/jobs/{job.job_id}'
+        return response, 202
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -1,33 +1,103 @@
 from flask import Blueprint, request, jsonify
 from extensions import db
+from services.cache_service import (
+    bump_data_version, RANKINGS_VERSION, RANKINGS_REWRITE_VERSION, GAMES_VERSION, PLAYERS_VERSION, GAME_PLAYS_VERSION
+)
 from models.game_play import GamePlay
 from models.play_result import PlayResult
-from services.game_play_service import get_all_game_plays, get_game_play_by_id
+from services.game_play_service import (
+    get_game_play_by_id, get_game_plays_page, parse_expand,
+    validate_bulk_game_plays, bulk_create_game_plays,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_BULK_PLAYS
+)
 from services.ranking_service import calculate_victory_points
+from services.leaderboard_service import apply_results_to_leaderboard
+from services.rating_service import invalidate_rating_checkpoints
+from utils.date_range import parse_range_args
+from utils.serializers import game_play_dicts, parse_fields, field_names, GAME_PLAY_FIELDS
+from utils.http_cache import conditional
 from datetime import datetime
 
 game_play_bp = Blueprint('game_play_bp', __name__)
 
+# Query args that switch the listing to paginated mode
+PAGE_ARGS = ('limit', 'cursor', 'game_id', 'player_id', 'mode', 'from', 'to', 'preset')
+
+def _serialization_args(args):
+    """Read ?expand= and ?fields= (raises ValueError on unknown names)"""
+    expand = parse_expand(args.get('expand'))
+    only = parse_fields(args.get('fields'), field_names(GAME_PLAY_FIELDS) + ['results'], always=('play_id',))
+    return expand, only
+
 @game_play_bp.route('/', methods=['GET'])
+@conditional(GAME_PLAYS_VERSION, GAMES_VERSION, PLAYERS_VERSION)
 def get_game_plays():
-    """Get all game plays"""
-    game_plays = get_all_game_plays()
-    return jsonify([game_play.to_dict() for game_play in game_plays])
+    """
+    Get game plays.
+    
+    Without arguments returns every play as a list. With any of ?limit=,
+    ?cursor=, ?game_id=, ?player_id=, ?mode= or a date range (?from=&to= or
+    ?preset=) returns one page as {'items': [...], 'next_cursor': ...}; pass
+    next_cursor back as ?cursor= to get the following page.
+    
+    ?expand=game,players embeds the game name and each result's player, and
+    ?fields=start_time,results limits the fields returned for each play.
+    """
+    try:
+        expand, only = _serialization_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not any(arg in request.args for arg in PAGE_ARGS):
+        return jsonify(game_play_dicts(expand=expand, only=only))
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        game_id = request.args.get('game_id')
+        game_id = int(game_id) if game_id else None
+        player_id = request.args.get('player_id')
+        player_id = int(player_id) if player_id else None
+    except ValueError:
+        return jsonify({'error': 'limit, game_id and player_id must be integers'}), 400
+    
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    
+    try:
+        start, end = parse_range_args(request.args)
+        items, next_cursor = get_game_plays_page(
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            game_id=game_id,
+            player_id=player_id,
+            mode=request.args.get('mode') or None,
+            start=start,
+            end=end,
+            expand=expand,
+            fields=only
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'items': items,
+        'next_cursor': next_cursor
+    })
 
 @game_play_bp.route('/<int:play_id>', methods=['GET'])
+@conditional(GAME_PLAYS_VERSION, GAMES_VERSION, PLAYERS_VERSION)
 def get_game_play(play_id):
-    """Get a game play by ID"""
-    game_play = get_game_play_by_id(play_id)
-    if not game_play:
-        return jsonify({'error': 'Game play not found'}), 404
+    """Get a game play by ID (?expand= and ?fields= as for the list)"""
+    try:
+        expand, only = _serialization_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Get results for this game play
-    results = [result.to_dict() for result in game_play.results]
-    
-    response = game_play.to_dict()
-    response['results'] = results
+    game_plays = game_play_dicts(GamePlay.query.filter_by(play_id=play_id), expand, only)
+    if not game_plays:
+        return jsonify({'error': 'Game play not found'}), 404
     
-    return jsonify(response)
+    return jsonify(game_plays[0])
 
 @game_play_bp.route('/', methods=['POST'])
 def create_game_play():
@@ -71,6 +141,10 @@ def create_game_play():
         db.session.add(result)
         results.append(result)
     
+    apply_results_to_leaderboard(results)
+    invalidate_rating_checkpoints(game_play.start_time or game_play.created_at)
+    
+    bump_data_version(RANKINGS_VERSION, GAME_PLAYS_VERSION)
     db.session.commit()
     
     response = game_play.to_dict()
@@ -78,6 +152,49 @@ def create_game_play():
     
     return jsonify(response), 201
 
+@game_play_bp.route('/bulk', methods=['POST'])
+def bulk_create_game_plays_endpoint():
+    """
+    Create many game plays with results in one transaction.
+    
+    Accepts a list of plays (the same shape as POST /) or
+    {'plays': [...], 'partial': true}. Every play is validated before
+    anything is written. By default one invalid play rejects the whole batch
+    with a 400; with partial (a JSON boolean in the body, or
+    ?partial=true|false) the valid plays are inserted and the invalid ones
+    reported. Returns
+    {'created': [{'index', 'play_id'}], 'errors': [{'index', 'errors'}]}.
+    """
+    data = request.get_json(silent=True)
+    partial = request.args.get('partial', 'false').lower()
+    if partial not in ('true', 'false'):
+        return jsonify({'error': 'partial must be true or false'}), 400
+    partial = partial == 'true'
+    if isinstance(data, dict):
+        if not isinstance(data.get('partial', False), bool):
+            return jsonify({'error': 'partial must be a boolean'}), 400
+        partial = partial or data.get('partial', False)
+        data = data.get('plays')
+    
+    if not isinstance(data, list) or not data:
+        return jsonify({'error': 'Expected a non-empty list of plays'}), 400
+    if len(data) > MAX_BULK_PLAYS:
+        return jsonify({'error': f'At most {MAX_BULK_PLAYS} plays per request'}), 400
+    
+    validated = validate_bulk_game_plays(data)
+    errors = [{'index': index, 'errors': item_errors} for index, _, _, item_errors in validated if item_errors]
+    accepted = [item for item in validated if not item[3]]
+    
+    if errors and (not partial or not accepted):
+        db.session.rollback()
+        return jsonify({'created': [], 'errors': errors}), 400
+    
+    play_ids = bulk_create_game_plays(accepted)
+    db.session.commit()
+    
+    created = [{'index': index, 'play_id': play_id} for (index, _, _, _), play_id in zip(accepted, play_ids)]
+    return jsonify({'created': created, 'errors': errors}), 201
+
 @game_play_bp.route('/<int:play_id>', methods=['PUT'])
 def update_game_play(play_id):
     """Update a game play"""
@@ -86,6 +203,7 @@ def update_game_play(play_id):
         return jsonify({'error': 'Game play not found'}), 404
     
     data = request.json
+    previous_play_time = game_play.start_time or game_play.created_at
     
     # Parse dates
     start_time = datetime.fromisoformat(data.get('start_time')) if data.get('start_time') else game_play.start_time
@@ -101,6 +219,7 @@ def update_game_play(play_id):
     # Update results if provided
     if 'results' in data:
         # Delete existing results
+        apply_results_to_leaderboard(game_play.results, sign=-1)
         for result in game_play.results:
             db.session.delete(result)
         
@@ -124,7 +243,11 @@ def update_game_play(play_id):
             )
             db.session.add(result)
             results.append(result)
+        
+        apply_results_to_leaderboard(results)
     
+    invalidate_rating_checkpoints(previous_play_time, game_play.start_time or game_play.created_at)
+    bump_data_version(RANKINGS_VERSION, RANKINGS_REWRITE_VERSION, GAME_PLAYS_VERSION)
     db.session.commit()
     
     response = game_play.to_dict()
@@ -139,7 +262,10 @@ def delete_game_play(play_id):
     if not game_play:
         return jsonify({'error': 'Game play not found'}), 404
     
+    apply_results_to_leaderboard(game_play.results, sign=-1)
+    invalidate_rating_checkpoints(game_play.start_time or game_play.created_at)
     db.session.delete(game_play)
+    bump_data_version(RANKINGS_VERSION, RANKINGS_REWRITE_VERSION, GAME_PLAYS_VERSION)
     db.session.commit()
     
     return jsonify({'message': 'Game play deleted successfully'})
\ No newline at end of file
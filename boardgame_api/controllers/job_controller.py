@@ -0,0 +1,18 @@
+from flask import Blueprint, jsonify
+from services.job_service import get_job, get_recent_jobs
+
+job_bp = Blueprint('job_bp', __name__)
+
+@job_bp.route('/', methods=['GET'])
+def get_jobs():
+    """Get the most recent background jobs"""
+    return jsonify([job.to_dict() for job in get_recent_jobs()])
+
+@job_bp.route('/<int:job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Get a background job's status, progress, results and errors"""
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict())
\ No newline at end of file
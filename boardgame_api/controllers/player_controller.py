@@ -1,23 +1,36 @@
 from flask import Blueprint, request, jsonify
 from extensions import db
+from services.cache_service import bump_data_version, RANKINGS_VERSION, PLAYERS_VERSION
 from models.player import Player
-from services.player_service import get_all_players, get_player_by_id
+from services.player_service import get_player_by_id
+from utils.serializers import player_dicts, parse_fields, field_names, PLAYER_FIELDS
+from utils.http_cache import conditional
 
 player_bp = Blueprint('player_bp', __name__)
 
 @player_bp.route('/', methods=['GET'])
+@conditional(PLAYERS_VERSION)
 def get_players():
-    """Get all players"""
-    players = get_all_players()
-    return jsonify([player.to_dict() for player in players])
+    """Get all players (?fields=name,alias for a subset of fields)"""
+    try:
+        only = parse_fields(request.args.get('fields'), field_names(PLAYER_FIELDS), always=('player_id',))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(player_dicts(only=only))
 
 @player_bp.route('/<int:player_id>', methods=['GET'])
+@conditional(PLAYERS_VERSION)
 def get_player(player_id):
-    """Get a player by ID"""
-    player = get_player_by_id(player_id)
-    if not player:
+    """Get a player by ID (?fields= as for the list)"""
+    try:
+        only = parse_fields(request.args.get('fields'), field_names(PLAYER_FIELDS), always=('player_id',))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    players = player_dicts(Player.query.filter_by(player_id=player_id), only)
+    if not players:
         return jsonify({'error': 'Player not found'}), 404
-    return jsonify(player.to_dict())
+    return jsonify(players[0])
 
 @player_bp.route('/', methods=['POST'])
 def create_player():
@@ -30,6 +43,7 @@ def create_player():
     )
     
     db.session.add(player)
+    bump_data_version(RANKINGS_VERSION, PLAYERS_VERSION)
     db.session.commit()
     
     return jsonify(player.to_dict()), 201
@@ -46,6 +60,7 @@ def update_player(player_id):
     player.name = data.get('name', player.name)
     player.alias = data.get('alias', player.alias)
     
+    bump_data_version(RANKINGS_VERSION, PLAYERS_VERSION)
     db.session.commit()
     
     return jsonify(player.to_dict())
@@ -58,6 +73,7 @@ def delete_player(player_id):
         return jsonify({'error': 'Player not found'}), 404
     
     db.session.delete(player)
+    bump_data_version(RANKINGS_VERSION, PLAYERS_VERSION)
     db.session.commit()
     
     return jsonify({'message': 'Player deleted successfully'})
\ No newline at end of file
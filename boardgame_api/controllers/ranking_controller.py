@@ -1,36 +1,117 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from models.player import Player
 from models.game import Game
+from services.cache_service import get_or_compute, get_cache_stats, RANKINGS_VERSION
 from services.ranking_service import (
     get_player_overall_ranking,
     get_player_yearly_ranking,
+    get_player_range_ranking,
     get_player_game_ranking,
     get_game_ranking,
-    get_player_stats
+    get_game_rankings,
+    get_player_stats,
+    get_head_to_head
 )
+from services.rating_service import get_rating_ranking, RATINGS_VERSION
+from utils.date_range import parse_range_args, MIN_YEAR, MAX_YEAR
+from utils.http_cache import conditional
 
 ranking_bp = Blueprint('ranking_bp', __name__)
 
+def preset_day():
+    """Rolling presets move at midnight, so their ETags change daily even without writes"""
+    return datetime.utcnow().date().isoformat() if request.args.get('preset') else ''
+
 @ranking_bp.route('/overall', methods=['GET'])
+@conditional(RANKINGS_VERSION)
 def get_overall_ranking():
     """Get overall player ranking"""
-    rankings = get_player_overall_ranking()
+    rankings = get_or_compute('overall', get_player_overall_ranking)
     return jsonify(rankings)
 
 @ranking_bp.route('/yearly/<int:year>', methods=['GET'])
+@conditional(RANKINGS_VERSION)
 def get_yearly_ranking(year):
     """Get yearly player ranking"""
-    rankings = get_player_yearly_ranking(year)
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        return jsonify({'error': f'year must be between {MIN_YEAR} and {MAX_YEAR}'}), 400
+    
+    rankings = get_or_compute('yearly', get_player_yearly_ranking, year)
+    return jsonify(rankings)
+
+@ranking_bp.route('/range', methods=['GET'])
+@conditional(RANKINGS_VERSION, vary=preset_day)
+def get_range_ranking():
+    """Get player ranking for plays in [from, to), or for a ?preset= window"""
+    try:
+        start, end = parse_range_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    rankings = get_or_compute('range', get_player_range_ranking, start, end)
+    return jsonify(rankings)
+
+@ranking_bp.route('/games', methods=['GET'])
+@conditional(RANKINGS_VERSION)
+def get_game_player_rankings():
+    """Get player rankings for many games (?ids=1,2,3 or ?ids=all), optionally only the top N (?top=)"""
+    ids = request.args.get('ids', 'all')
+    try:
+        top = request.args.get('top')
+        top = int(top) if top else None
+    except ValueError:
+        return jsonify({'error': 'top must be an integer'}), 400
+    if top is not None and top < 1:
+        return jsonify({'error': 'top must be at least 1'}), 400
+    
+    if ids == 'all':
+        game_ids = None
+    else:
+        try:
+            game_ids = [int(game_id) for game_id in ids.split(',') if game_id.strip()]
+        except ValueError:
+            return jsonify({'error': 'ids must be a comma-separated list of game ids or "all"'}), 400
+    
+    rankings = get_or_compute('games-batch', get_game_rankings, game_ids, top)
     return jsonify(rankings)
 
 @ranking_bp.route('/games/<int:game_id>', methods=['GET'])
+@conditional(RANKINGS_VERSION)
 def get_game_player_ranking(game_id):
     """Get player ranking for a specific game"""
-    rankings = get_game_ranking(game_id)
+    rankings = get_or_compute('games', get_game_ranking, game_id)
     return jsonify(rankings)
 
 @ranking_bp.route('/players/<int:player_id>', methods=['GET'])
+@conditional(RANKINGS_VERSION)
 def get_player_stats_endpoint(player_id):
     """Get stats for a specific player"""
-    stats = get_player_stats(player_id)
-    return jsonify(stats)
\ No newline at end of file
+    stats = get_or_compute('players', get_player_stats, player_id)
+    return jsonify(stats)
+
+@ranking_bp.route('/head-to-head', methods=['GET'])
+@conditional(RANKINGS_VERSION, vary=preset_day)
+def get_head_to_head_matrix():
+    """Get player-vs-player records, optionally for one game (?game_id=) and/or a date range"""
+    game_id = request.args.get('game_id', type=int)
+    try:
+        start, end = parse_range_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    matrix = get_or_compute('head-to-head', get_head_to_head, game_id, start, end)
+    return jsonify(matrix)
+
+@ranking_bp.route('/ratings', methods=['GET'])
+@conditional(RANKINGS_VERSION, RATINGS_VERSION)
+def get_ratings():
+    """Get Elo rating leaderboard, overall or for one game (?game_id=)"""
+    game_id = request.args.get('game_id', type=int)
+    rankings = get_or_compute('ratings', get_rating_ranking, game_id)
+    return jsonify(rankings)
+
+@ranking_bp.route('/cache', methods=['GET'])
+def get_ranking_cache_stats():
+    """Get hit/miss counters for the ranking cache"""
+    return jsonify(get_cache_stats())
@@ -1,4 +1,13 @@
-bind = "0.0.0.0:8080"
-workers = 4
-timeout = 300  # Increase timeout to 5 minutes
+import os
+
+bind = os.getenv('GUNICORN_BIND', "0.0.0.0:8080")
+
+# Threaded workers: a request waiting on BGG holds one thread, not a whole worker.
+# Capacity is workers * threads concurrent requests; set GUNICORN_WORKER_CLASS=sync
+# and GUNICORN_THREADS=1 to get the old one-request-per-worker behaviour.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 300))  # Increase timeout to 5 minutes
 keepalive = 65
\ No newline at end of file
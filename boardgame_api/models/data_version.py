@@ -0,0 +1,17 @@
+from . import db
+from datetime import datetime
+
+class DataVersion(db.Model):
+    """Monotonic write counter for a family of data, bumped in the writing transaction"""
+    __tablename__ = 'data_versions'
+    
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'version': self.version,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -6,7 +6,9 @@ class Game(db.Model):
     
     game_id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
-    description = db.Column(db.Text)
+    # Large free text, loaded together in one SELECT when either is accessed (or up front with
+    # undefer_group('game_text')); list endpoints select columns explicitly
+    description = db.deferred(db.Column(db.Text), group='game_text')
     release_year = db.Column(db.Integer)
     image_url = db.Column(db.String(512))
     min_players = db.Column(db.Integer)
@@ -14,7 +16,7 @@ class Game(db.Model):
     avg_play_time = db.Column(db.Integer)
     bgg_id = db.Column(db.Integer)
     publisher = db.Column(db.String(255))
-    comment = db.Column(db.Text)
+    comment = db.deferred(db.Column(db.Text), group='game_text')
     complexity = db.Column(db.Numeric(5, 2))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -6,7 +6,7 @@ class GamePlay(db.Model):
     
     play_id = db.Column(db.Integer, primary_key=True)
     game_id = db.Column(db.Integer, db.ForeignKey('games.game_id'), nullable=False)
-    start_time = db.Column(db.DateTime)
+    start_time = db.Column(db.DateTime, index=True)
     end_time = db.Column(db.DateTime)
     duration = db.Column(db.Integer)  # in minutes
     mode = db.Column(db.String(255))
@@ -16,8 +16,9 @@ class GamePlay(db.Model):
     # Relationships
     results = db.relationship('PlayResult', backref='game_play', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
+    def to_dict(self, expand=()):
+        """Serialize the play; expand may contain 'game' and/or 'players' to embed names"""
+        data = {
             'play_id': self.play_id,
             'game_id': self.game_id,
             'start_time': self.start_time.isoformat() if self.start_time else None,
@@ -25,6 +26,18 @@ class GamePlay(db.Model):
             'duration': self.duration,
             'mode': self.mode,
             'notes': self.notes,
-            'results': [result.to_dict() for result in self.results] if self.results else [],
+            'results': [result.to_dict(expand) for result in self.results] if self.results else [],
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+        if 'game' in expand:
+            data['game'] = {'game_id': self.game.game_id, 'name': self.game.name} if self.game else None
+        return data
+
+
+# Backs the keyset-paginated play listing (newest first, undated plays last).
+# SQLite cannot index NULLS LAST, so the index is only emitted for Postgres.
+db.Index(
+    'ix_game_plays_start_time_desc_play_id_desc',
+    GamePlay.start_time.desc().nullslast(),
+    GamePlay.play_id.desc()
+).ddl_if(dialect='postgresql')
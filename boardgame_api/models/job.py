@@ -0,0 +1,44 @@
+from . import db
+from datetime import datetime
+
+class Job(db.Model):
+    """A background task such as a BGG collection import, claimed and run by a worker thread"""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_job_id', 'status', 'job_id'),
+    )
+    
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    
+    job_id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default=QUEUED)
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer)
+    result = db.Column(db.JSON, nullable=False, default=list)
+    errors = db.Column(db.JSON, nullable=False, default=list)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params,
+            'progress': self.progress,
+            'total': self.total,
+            'result': self.result,
+            'errors': self.errors,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
\ No newline at end of file
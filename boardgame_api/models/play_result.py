@@ -13,8 +13,8 @@ class PlayResult(db.Model):
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    def to_dict(self, expand=()):
+        data = {
             'result_id': self.result_id,
             'play_id': self.play_id,
             'player_id': self.player_id,
@@ -23,4 +23,11 @@ class PlayResult(db.Model):
             'victory_points': float(self.victory_points) if self.victory_points is not None else None,
             'notes': self.notes,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+        if 'players' in expand:
+            data['player'] = {
+                'player_id': self.player.player_id,
+                'name': self.player.name,
+                'alias': self.player.alias
+            } if self.player else None
+        return data
\ No newline at end of file
@@ -0,0 +1,21 @@
+from . import db
+from datetime import datetime
+
+class PlayerRanking(db.Model):
+    """Incrementally maintained per-player aggregate backing the overall leaderboard"""
+    __tablename__ = 'player_rankings'
+    
+    player_id = db.Column(db.Integer, db.ForeignKey('players.player_id'), primary_key=True)
+    total_plays = db.Column(db.Integer, nullable=False, default=0)
+    total_vps = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    victory_rate = db.Column(db.Numeric(10, 6), nullable=False, default=0, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'player_id': self.player_id,
+            'total_plays': self.total_plays,
+            'total_vps': float(self.total_vps),
+            'victory_rate': float(self.victory_rate),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,16 @@
+from . import db
+from datetime import datetime
+
+class RatingCheckpoint(db.Model):
+    """Snapshot of all ratings after replaying plays up to (play_time, play_id)"""
+    __tablename__ = 'rating_checkpoints'
+    __table_args__ = (
+        db.Index('ix_rating_checkpoints_position', 'play_time', 'play_id'),
+    )
+    
+    checkpoint_id = db.Column(db.Integer, primary_key=True)
+    play_time = db.Column(db.DateTime, nullable=False)
+    play_id = db.Column(db.Integer, nullable=False)
+    plays_replayed = db.Column(db.Integer, nullable=False)
+    state = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,29 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from app import app
+from services.export_service import export_ndjson
+from utils.date_range import parse_datetime
+
+def main():
+    parser = argparse.ArgumentParser(description='Export games, players and game plays as newline-delimited JSON')
+    parser.add_argument('--since', help='Only export records created at or after this ISO date/time, plus plays whose '
+                        'results were edited since (other edits and deletions are not included)')
+    parser.add_argument('--output', help='File to write (default: stdout)')
+    args = parser.parse_args()
+    
+    since = parse_datetime(args.since)
+    
+    with app.app_context():
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            for chunk in export_ndjson(since):
+                out.write(chunk)
+        finally:
+            if args.output:
+                out.close()
+
+if __name__ == "__main__":
+    main()
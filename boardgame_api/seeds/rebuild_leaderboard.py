@@ -0,0 +1,28 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from app import app
+from services.leaderboard_service import rebuild_leaderboard
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the player_rankings leaderboard table from play_results')
+    parser.add_argument('--check', action='store_true',
+                        help='Only compare the table against a full recompute, do not rewrite it')
+    args = parser.parse_args()
+    
+    with app.app_context():
+        mismatches = rebuild_leaderboard(check_only=args.check)
+    
+    for mismatch in mismatches:
+        print(f"Player {mismatch['player_id']}: stored {mismatch['stored']}, expected {mismatch['expected']}")
+    
+    if args.check:
+        print(f"\nCheck complete: {len(mismatches)} players out of sync")
+        sys.exit(1 if mismatches else 0)
+    
+    print(f"\nRebuild complete: {len(mismatches)} players corrected")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from multiprocessing import Pool
+from app import app
+from extensions import db
+from services.victory_point_service import select_play_ids, recompute_chunk, finish_recompute
+from utils.date_range import parse_datetime
+
+def _init_worker():
+    # Connections inherited from the parent process must not be reused after fork
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def _recompute(args):
+    play_ids, dry_run = args
+    with app.app_context():
+        return recompute_chunk(play_ids, dry_run=dry_run)
+
+def recompute_victory_points(game_id=None, start=None, end=None, play_ids=None,
+                             batch_size=500, workers=1, dry_run=False):
+    """Recompute stored victory points for all (or a filtered subset of) plays"""
+    with app.app_context():
+        selected = select_play_ids(game_id=game_id, start=start, end=end, play_ids=play_ids)
+    
+    chunks = [selected[i:i + batch_size] for i in range(0, len(selected), batch_size)]
+    print(f"{'Dry run: ' if dry_run else ''}recomputing {len(selected)} plays in {len(chunks)} batches with {workers} workers")
+    
+    totals = {'scanned': 0, 'changed': 0, 'skipped_plays': 0}
+    samples = []
+    started = time.time()
+    
+    tasks = [(chunk, dry_run) for chunk in chunks]
+    if workers > 1:
+        pool = Pool(workers, initializer=_init_worker)
+        outcomes = pool.imap_unordered(_recompute, tasks)
+    else:
+        pool = None
+        outcomes = map(_recompute, tasks)
+    
+    completed = False
+    try:
+        for done, outcome in enumerate(outcomes, start=1):
+            for key in totals:
+                totals[key] += outcome[key]
+            samples.extend(outcome['samples'][:max(0, 10 - len(samples))])
+            print(f"[{done}/{len(chunks)}] scanned {totals['scanned']} results, "
+                  f"{totals['changed']} {'would change' if dry_run else 'changed'} "
+                  f"({time.time() - started:.1f}s)")
+        completed = True
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        # Each chunk commits on its own, so after a failure the chunks that did commit
+        # (including ones other workers finished but weren't counted yet) still need this
+        if not dry_run and (totals['changed'] or not completed):
+            with app.app_context():
+                finish_recompute()
+            print("Leaderboard rebuilt and ranking caches invalidated")
+    
+    for sample in samples:
+        print(f"  result {sample['result_id']} (play {sample['play_id']}, player {sample['player_id']}, "
+              f"rank {sample['rank']}): {sample['old']} -> {sample['new']}")
+    
+    if totals['skipped_plays']:
+        print(f"Skipped {totals['skipped_plays']} plays with unranked results")
+    
+    print(f"\n{'Dry run complete' if dry_run else 'Recompute complete'}: "
+          f"{totals['changed']} of {totals['scanned']} results {'would change' if dry_run else 'changed'}")
+    return totals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Recompute victory points with the current scoring rule')
+    parser.add_argument('--game-id', type=int, help='Only plays of this game')
+    parser.add_argument('--from', dest='start', help='Only plays starting at or after this date')
+    parser.add_argument('--to', dest='end', help='Only plays starting before this date')
+    parser.add_argument('--play-ids', type=int, nargs='+', help='Only these plays')
+    parser.add_argument('--batch-size', type=int, default=500, help='Plays per batch')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes')
+    parser.add_argument('--dry-run', action='store_true', help='Report how many rows would change without writing')
+    args = parser.parse_args()
+    
+    recompute_victory_points(
+        game_id=args.game_id,
+        start=parse_datetime(args.start),
+        end=parse_datetime(args.end),
+        play_ids=args.play_ids,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        dry_run=args.dry_run
+    )
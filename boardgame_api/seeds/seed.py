@@ -1,18 +1,30 @@
-from app import create_app
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
 from extensions import db
 from models.game import Game
 from models.player import Player
 from models.game_play import GamePlay
 from models.play_result import PlayResult
+from models.player_ranking import PlayerRanking
+from services.leaderboard_service import rebuild_leaderboard
+from services.rating_service import invalidate_rating_checkpoints
+from services.cache_service import (
+    bump_data_version, RANKINGS_VERSION, RANKINGS_REWRITE_VERSION, PLAYERS_VERSION, GAME_PLAYS_VERSION
+)
 from datetime import datetime, timedelta
 
 def seed_database():
-    app = create_app()
     with app.app_context():
         # Clear existing data
+        PlayerRanking.query.delete()
         PlayResult.query.delete()
         GamePlay.query.delete()
         Player.query.delete()
+        # Checkpoints replay from plays that no longer exist
+        invalidate_rating_checkpoints()
         
         # Seed Players
         players = [
@@ -24,6 +36,8 @@ def seed_database():
         
         for player in players:
             db.session.add(player)
+        # Every commit bumps what it changed, like the API endpoints do, so ETags and caches refresh
+        bump_data_version(RANKINGS_VERSION, RANKINGS_REWRITE_VERSION, PLAYERS_VERSION, GAME_PLAYS_VERSION)
         db.session.commit()
         
         # Seed Game Plays
@@ -44,6 +58,7 @@ def seed_database():
         
         for play in game_plays:
             db.session.add(play)
+        bump_data_version(RANKINGS_VERSION, GAME_PLAYS_VERSION)
         db.session.commit()
         
         # Seed Play Results
@@ -63,8 +78,12 @@ def seed_database():
         
         for result in results:
             db.session.add(result)
+        bump_data_version(RANKINGS_VERSION, GAME_PLAYS_VERSION)
         db.session.commit()
         
+        # Results were inserted directly, so derive the leaderboard from them
+        rebuild_leaderboard()
+        
         print("Database seeded successfully!")
 
 if __name__ == "__main__":
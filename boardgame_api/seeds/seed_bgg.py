@@ -1,65 +1,33 @@
-from app import create_app
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
 from extensions import db
 from models.game import Game
-import xml.etree.ElementTree as ET
+from services.bgg_service import iter_bgg_collection
+from services.cache_service import bump_data_version, RANKINGS_VERSION, GAMES_VERSION
 from datetime import datetime
 
+COLLECTION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_collections.xml')
+
 def parse_bgg_collection(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    games = []
-    
-    for item in root.findall('item'):
-        # Extract basic game info
-        try:
-            game_id = int(item.get('objectid'))
-            name_elem = item.find('name')
-            name = name_elem.text if name_elem is not None else "Unknown Game"
-            year_elem = item.find('yearpublished')
-            year = int(year_elem.text) if year_elem is not None and year_elem.text else None
-            
-            # Get image URLs
-            image = item.find('image')
-            image_url = image.text if image is not None else None
-            thumbnail = item.find('thumbnail')
-            thumbnail_url = thumbnail.text if thumbnail is not None else None
-            
-            # Get comment if available
-            comment = item.find('comment')
-            comment = comment.text if comment is not None else None
-            
-            # Get number of plays
-            numplays = item.find('numplays')
-            plays = int(numplays.text) if numplays is not None and numplays.text else 0
-            
-            game = {
-                'name': name,
-                'release_year': year,
-                'image_url': image_url,
-                'thumbnail_url': thumbnail_url,
-                'bgg_id': game_id,
-                'comment': comment,
-                'created_at': datetime.utcnow()
-            }
-            games.append(game)
-        except (ValueError, AttributeError) as e:
-            print(f"Skipping game due to error: {str(e)}")
-            continue
-    
-    return games
+    """Yield the games of a BGG collection export one at a time, parsed as the file is read"""
+    for game in iter_bgg_collection(xml_file):
+        game['created_at'] = datetime.utcnow()
+        yield game
 
 def seed_bgg_games():
-    app = create_app()
     with app.app_context():
         try:
             # Clear existing games
             Game.query.delete()
+            bump_data_version(RANKINGS_VERSION, GAMES_VERSION)
             db.session.commit()
             
             # Parse BGG XML and create new games
-            games = parse_bgg_collection('game_collections.xml')
-            
-            for game_data in games:
+            count = 0
+            for game_data in parse_bgg_collection(COLLECTION_PATH):
                 game = Game(
                     name=game_data['name'],
                     comment=game_data['comment'],
@@ -69,10 +37,15 @@ def seed_bgg_games():
                     created_at=game_data['created_at']
                 )
                 db.session.add(game)
+                count += 1
+                # Send inserts as we go so the session doesn't hold every game
+                if count % 500 == 0:
+                    db.session.flush()
             
+            bump_data_version(RANKINGS_VERSION, GAMES_VERSION)
             db.session.commit()
-            print(f"Successfully imported {len(games)} games from BGG collection")
-            
+            print(f"Successfully imported {count} games from BGG collection")
+        
         except Exception as e:
             print(f"Error seeding BGG games: {str(e)}")
             db.session.rollback()
@@ -2,15 +2,17 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
+
 # from app import create_app
 from app import app
 from extensions import db
 from models.game import Game
-from services.game_service import fetch_game_from_bgg
-import time
+from services.game_service import fetch_games_from_bgg
+from services.cache_service import bump_data_version, RANKINGS_VERSION, GAMES_VERSION
 
-def update_games_from_bgg():
-    """Update existing games with data from BoardGameGeek"""
+def update_games_from_bgg(force_refresh=False):
+    """Update existing games with data from BoardGameGeek (cached responses are reused unless force_refresh)"""
     # app = create_app()
     
     with app.app_context():
@@ -21,12 +23,14 @@ def update_games_from_bgg():
         updated_count = 0
         failed_count = 0
         
+        # Fetch data from BGG, many games per request
+        bgg_games = fetch_games_from_bgg([game.bgg_id for game in games], force_refresh=force_refresh)
+        
         for game in games:
             print(f"Updating {game.name} (BGG ID: {game.bgg_id})...")
             
             try:
-                # Fetch data from BGG
-                bgg_data = fetch_game_from_bgg(game.bgg_id)
+                bgg_data = bgg_games.get(game.bgg_id)
                 
                 if bgg_data:
                     # Update game attributes
@@ -35,7 +39,7 @@ def update_games_from_bgg():
                     # game.max_players = bgg_data['max_players'] or game.max_players
                     # game.avg_play_time = bgg_data['avg_play_time'] or game.avg_play_time
                     # game.image_url = bgg_data['image_url'] or game.image_url
-                    game.complexity = bgg_data['averageweight'] or game.averageweight
+                    game.complexity = bgg_data['averageweight'] or game.complexity
                     
                     db.session.add(game)
                     updated_count += 1
@@ -44,15 +48,15 @@ def update_games_from_bgg():
                     failed_count += 1
                     print(f"Failed to fetch data for {game.name}")
                 
-                # Sleep to avoid hitting BGG API rate limits
-                time.sleep(2)
-                
             except Exception as e:
                 failed_count += 1
                 print(f"Error updating {game.name}: {str(e)}")
                 continue
         
         try:
+            if updated_count:
+                # Same versions the game update endpoint bumps, so ETags and cached rankings refresh
+                bump_data_version(RANKINGS_VERSION, GAMES_VERSION)
             db.session.commit()
             print(f"\nUpdate complete!")
             print(f"Successfully updated: {updated_count} games")
@@ -62,4 +66,6 @@ def update_games_from_bgg():
             print(f"Error saving updates to database: {str(e)}")
 
 if __name__ == "__main__":
-    update_games_from_bgg()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Update games with data from BoardGameGeek')
+    parser.add_argument('--force-refresh', action='store_true', help='Refetch every game instead of using cached BGG responses')
+    update_games_from_bgg(parser.parse_args().force_refresh)
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+HTTP client for the BoardGameGeek XML API.
+
+Every BGG request in the app goes through get(), which
+- reuses a connection-pooled requests.Session per worker process,
+- takes a token from a rate limiter shared by all processes on the host
+  (gunicorn workers, job threads and seed scripts), and
+- retries 202 "queued", 429 and 5xx responses and connection errors with
+  exponential backoff, honouring Retry-After.
+
+The token bucket and the request counts, retries, failures, latency and
+rate-limit waits live in their own tables of the shared SQLite file
+(RANKING_CACHE_PATH); get_client_stats() reports them for
+/api/games/bgg-client.
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+
+RATE_LIMIT_BUCKET = 'bgg'
+RETRY_STATUSES = {202, 429, 500, 502, 503, 504}
+
+_client = {'pid': None, 'session': None}
+_lock = threading.Lock()
+# One SQLite connection per worker process; the file itself is shared by all processes on the host
+_store = {'pid': None, 'conn': None}
+_store_lock = threading.Lock()
+
+class BGGError(Exception):
+    """A BGG request that failed or was still not answered after all retries"""
+
+def _session():
+    """This process's pooled session, recreated after gunicorn forks a worker"""
+    with _lock:
+        if _client['pid'] != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=current_app.config['BGG_POOL_SIZE'])
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['User-Agent'] = current_app.config['BGG_USER_AGENT']
+            _client['session'] = session
+            _client['pid'] = os.getpid()
+        return _client['session']
+
+def _connection():
+    """Open the client's tables in the shared cache file, reopening after gunicorn forks a worker"""
+    if _store['pid'] != os.getpid():
+        conn = sqlite3.connect(
+            current_app.config['RANKING_CACHE_PATH'],
+            timeout=5,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limits ('
+            'name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE TABLE IF NOT EXISTS bgg_client_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        _store['pid'] = os.getpid()
+        _store['conn'] = conn
+    return _store['conn']
+
+def reserve_rate_limit_slot(name, rate, burst):
+    """
+    Take a token from the `name` token bucket shared by every process on the host.
+    
+    The bucket refills at `rate` tokens per second up to `burst`. A token is
+    reserved even when the bucket is empty, so callers queue up in order
+    instead of polling. Returns how many seconds to wait before using it.
+    """
+    now = time.time()
+    with _store_lock:
+        conn = _connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM rate_limits WHERE name = ?', (name,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            tokens -= 1
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limits (name, tokens, updated_at) VALUES (?, ?, ?)',
+                (name, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    return max(0.0, -tokens / rate)
+
+def _add_counts(counts):
+    """Add {name: amount} to the client's shared counters (best effort)"""
+    try:
+        with _store_lock:
+            conn = _connection()
+            conn.executemany(
+                'INSERT INTO bgg_client_counters (name, value) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                list(counts.items())
+            )
+    except sqlite3.Error as e:
+        print(f"Failed to update BGG client counters: {e}")
+
+def get_client_stats():
+    """Get request, retry and failure counts, average latency and rate-limit waits of BGG requests"""
+    with _store_lock:
+        counters = dict(_connection().execute('SELECT name, value FROM bgg_client_counters').fetchall())
+    
+    requests_sent = counters.get('requests', 0)
+    return {
+        'requests': requests_sent,
+        'retries': counters.get('retries', 0),
+        'failures': counters.get('failures', 0),
+        'avg_request_ms': counters.get('request_ms', 0) / requests_sent if requests_sent else 0,
+        'rate_limit_wait_ms': counters.get('rate_limit_wait_ms', 0),
+        'requests_per_second': current_app.config['BGG_REQUESTS_PER_SECOND'],
+        'burst': current_app.config['BGG_RATE_BURST']
+    }
+
+def _wait_for_rate_limit():
+    """Block until the shared token bucket lets another request through; returns seconds waited"""
+    config = current_app.config
+    try:
+        wait = reserve_rate_limit_slot(RATE_LIMIT_BUCKET, config['BGG_REQUESTS_PER_SECOND'], config['BGG_RATE_BURST'])
+    except Exception as e:
+        # Without the shared bucket, at least keep this thread under the rate
+        print(f"BGG rate limiter unavailable: {e}")
+        wait = 1.0 / config['BGG_REQUESTS_PER_SECOND']
+    if wait:
+        time.sleep(wait)
+    return wait
+
+def _backoff(attempt, response=None):
+    """Seconds to wait before retry `attempt` (1-based), preferring the server's Retry-After"""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), current_app.config['BGG_BACKOFF_MAX'])
+    delay = current_app.config['BGG_BACKOFF_BASE'] * 2 ** (attempt - 1)
+    # Jitter so workers that were throttled together don't retry together
+    return min(delay, current_app.config['BGG_BACKOFF_MAX']) * random.uniform(0.8, 1.2)
+
+def get(path, params=None, stream=False):
+    """
+    GET `path` (e.g. 'thing') under BGG_API_URL and return the 200 response.
+    
+    Raises BGGError on other statuses, or when BGG is still queueing,
+    throttling or failing after BGG_MAX_RETRIES retries.
+    """
+    config = current_app.config
+    url = f"{config['BGG_API_URL']}/{path}"
+    counts = {'requests': 0, 'retries': 0, 'failures': 0, 'request_ms': 0, 'rate_limit_wait_ms': 0}
+    
+    try:
+        for attempt in range(config['BGG_MAX_RETRIES'] + 1):
+            if attempt:
+                counts['retries'] += 1
+            counts['rate_limit_wait_ms'] += int(_wait_for_rate_limit() * 1000)
+            
+            started = time.perf_counter()
+            response = None
+            try:
+                response = _session().get(url, params=params, timeout=config['BGG_TIMEOUT'], stream=stream)
+                error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            counts['requests'] += 1
+            counts['request_ms'] += int((time.perf_counter() - started) * 1000)
+            
+            if response is not None and response.status_code == 200:
+                return response
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                counts['failures'] += 1
+                raise BGGError(f"BGG returned {response.status_code} for {path}")
+            
+            reason = error or f"status {response.status_code}"
+            if response is not None:
+                response.close()
+            if attempt == config['BGG_MAX_RETRIES']:
+                counts['failures'] += 1
+                raise BGGError(f"BGG {path} still failing after {attempt + 1} attempts: {reason}")
+            
+            delay = _backoff(attempt + 1, response)
+            print(f"BGG {path} returned {reason}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+    finally:
+        _add_counts(counts)
@@ -1,39 +1,155 @@
-import requests
+import io
+import zlib
 import xml.etree.ElementTree as ET
 from models.game import Game
 from extensions import db
 from datetime import datetime
-from services.game_service import fetch_game_from_bgg
-import time
+from flask import current_app
+from services import bgg_client
+from services.game_service import fetch_games_from_bgg
+from services.cache_service import (
+    bump_data_version, get_bgg_responses, store_bgg_responses, RANKINGS_VERSION, GAMES_VERSION
+)
+from services.job_service import job_handler, record_job_progress
 
-def import_bgg_collection(username):
-    url = f'https://boardgamegeek.com/xmlapi2/collection?username={username}'
-    response = requests.get(url)
+BGG_IMPORT_JOB = 'bgg_import'
+
+def _int_or_none(text):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return None
+
+def iter_bgg_collection(source, errors=None, attributes=None):
+    """
+    Parse BGG collection XML incrementally, yielding one game dict per <item>.
     
-    if response.status_code != 200:
-        raise Exception('Failed to fetch BGG collection')
+    source is a path or a binary file-like object. Elements are cleared once
+    their item is yielded, so memory use doesn't grow with the collection.
+    Items without a valid BGG ID and BGG <error> messages are appended to
+    `errors` (or printed). If given, `attributes` is filled with those of
+    the root element (e.g. totalitems) as soon as they are read.
+    """
+    def report(message):
+        if errors is not None:
+            errors.append(message)
+        else:
+            print(message)
     
-    root = ET.fromstring(response.content)
-    added_games = []
+    root = None
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = elem
+            if attributes is not None:
+                attributes.update(root.attrib)
+            continue
+        if event != 'end':
+            continue
+        
+        if elem.tag == 'item':
+            bgg_id = _int_or_none(elem.get('objectid'))
+            if bgg_id is None:
+                report(f"Skipping collection item without a valid BGG ID: {elem.get('objectid')}")
+            else:
+                yield {
+                    'bgg_id': bgg_id,
+                    'name': elem.findtext('name') or 'Unknown Game',
+                    'release_year': _int_or_none(elem.findtext('yearpublished')),
+                    'image_url': elem.findtext('image'),
+                    'thumbnail_url': elem.findtext('thumbnail'),
+                    'comment': elem.findtext('comment'),
+                    'numplays': _int_or_none(elem.findtext('numplays')) or 0
+                }
+            # Drop the finished item and the root's reference to it
+            elem.clear()
+            root.clear()
+        elif elem.tag == 'message' and root.tag == 'errors':
+            report(f"BGG error: {elem.text}")
+
+class _CachingStream:
+    """
+    File-like reader over a streamed BGG response that gzips what is read,
+    storing the document in the BGG response cache if it was read to the
+    end and the with block exits cleanly (a document that failed to parse
+    is not cached). Closing it closes the response.
+    """
+    def __init__(self, response, key):
+        self.response = response
+        self.chunks = response.iter_content(chunk_size=64 * 1024)
+        self.key = key
+        self.compressor = zlib.compressobj(wbits=31)
+        self.compressed = []
+        self.buffer = bytearray()
+    
+    def read(self, size=-1):
+        """Read up to `size` bytes (all that is left if size is negative)"""
+        while self.compressor is not None and (size is None or size < 0 or len(self.buffer) < size):
+            data = next(self.chunks, None)
+            if data:
+                self.compressed.append(self.compressor.compress(data))
+                self.buffer += data
+            elif data is None:
+                self.compressed.append(self.compressor.flush())
+                self.compressor = None
+                self.close()
+        
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+    
+    def close(self):
+        self.response.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if exc_type is None and self.compressor is None and self.compressed:
+            store_bgg_responses({self.key: b''.join(self.compressed)}, compressed=True)
+        self.compressed = []
+
+def open_bgg_collection(username, force_refresh=False):
+    """
+    Open the collection XML of a BGG user for reading as a binary stream.
+    
+    Cached for BGG_COLLECTION_CACHE_TTL unless force_refresh; an expired
+    copy is used if BGG cannot be reached. A fresh response is streamed
+    rather than downloaded first, and cached once it has been read in full.
+    Use it as a context manager so the response is closed however reading
+    ends.
+    """
+    key = f"collection:{username.lower()}"
+    cached = get_bgg_responses([key], current_app.config['BGG_COLLECTION_CACHE_TTL']).get(key)
+    if cached and cached[1] and not force_refresh:
+        return io.BytesIO(cached[0])
+    
+    try:
+        # BGG answers 202 while it builds the collection; the client retries until it is ready
+        response = bgg_client.get('collection', params={'username': username}, stream=True)
+    except Exception as e:
+        if not cached:
+            raise
+        print(f"Using cached collection for {username}: {e}")
+        return io.BytesIO(cached[0])
+    
+    return _CachingStream(response, key)
+
+def _build_games(bgg_ids, names, force_refresh):
+    """Fetch BGG metadata for bgg_ids and add a Game for each to the session; returns (games, errors)"""
+    # Fetch detailed game data from BGG API, many ids per request
+    bgg_games = fetch_games_from_bgg(bgg_ids, force_refresh=force_refresh)
+    games = []
     errors = []
     
-    for item in root.findall('item'):
+    for bgg_id in bgg_ids:
         try:
-            bgg_id = int(item.get('objectid'))
-            
-            # Check if game already exists
-            existing_game = Game.query.filter_by(bgg_id=bgg_id).first()
-            if existing_game:
-                continue
-            
-            # Fetch detailed game data from BGG API
-            bgg_data = fetch_game_from_bgg(bgg_id)
+            bgg_data = bgg_games.get(bgg_id)
             if not bgg_data:
                 errors.append(f"Failed to fetch metadata for game ID: {bgg_id}")
                 continue
-
-            # Sleep to avoid hitting BGG API rate limits
-            time.sleep(2)
             
             # Create new game with complete metadata
             game = Game(
@@ -50,23 +166,95 @@ def import_bgg_collection(username):
             )
             
             db.session.add(game)
-            added_games.append(game)
+            games.append(game)
             print(f"Successfully imported {game.name} with metadata")
-            
+        
         except Exception as e:
-            game_name = item.find('name').text if item.find('name') is not None else f"BGG ID: {bgg_id}"
+            game_name = names.get(bgg_id) or f"BGG ID: {bgg_id}"
             errors.append(f"Error importing {game_name}: {str(e)}")
             print(f"Failed to import {game_name}: {str(e)}")
     
-    if added_games:
+    return games, errors
+
+def import_bgg_collection(username, progress=None, force_refresh=False):
+    """
+    Import the games of a BGG user's collection that we don't have yet.
+    
+    The collection is parsed as it streams in, and its games are fetched
+    and committed in batches of BGG_THING_BATCH_SIZE collection items, so
+    the first batch is saved before the download finishes, an interrupted
+    import keeps what it already saved and a rerun skips it.
+    progress(done, total, added_games, errors) is called with each batch,
+    counting collection items against the collection's totalitems, just
+    before that batch commits, so callers can record progress in the same
+    transaction. force_refresh bypasses the BGG response cache. Returns
+    (added_games, errors).
+    """
+    added_games = []
+    errors = []
+    pending_errors = []
+    attributes = {}
+    batch_size = current_app.config['BGG_THING_BATCH_SIZE']
+    seen = set()
+    names = {}
+    done = 0
+    
+    def import_batch():
+        # Collection order, without games we already have
+        existing_ids = {
+            bgg_id for bgg_id, in db.session.query(Game.bgg_id).filter(Game.bgg_id.in_(list(names)))
+        }
+        new_ids = [bgg_id for bgg_id in names if bgg_id not in existing_ids]
+        batch, batch_errors = _build_games(new_ids, names, force_refresh) if new_ids else ([], [])
+        batch_errors = pending_errors + batch_errors
+        pending_errors.clear()
+        names.clear()
+        
         try:
+            if batch:
+                bump_data_version(RANKINGS_VERSION, GAMES_VERSION)
+                db.session.flush()
+            if progress:
+                total = max(done, _int_or_none(attributes.get('totalitems')) or 0)
+                progress(done, total, batch, batch_errors)
             db.session.commit()
-            print(f"\nImport complete!")
-            print(f"Successfully added: {len(added_games)} games")
-            print(f"Errors encountered: {len(errors)}")
+            added_games.extend(batch)
+            errors.extend(batch_errors)
         except Exception as e:
             db.session.rollback()
+            errors.extend(batch_errors)
             errors.append(f"Database error: {str(e)}")
             print(f"Error saving to database: {str(e)}")
     
-    return added_games, errors
\ No newline at end of file
+    # Closes the streamed response even if parsing or a batch raises
+    with open_bgg_collection(username, force_refresh) as source:
+        for item in iter_bgg_collection(source, pending_errors, attributes):
+            done += 1
+            if item['bgg_id'] not in seen:
+                seen.add(item['bgg_id'])
+                names[item['bgg_id']] = item['name']
+            if len(names) >= batch_size:
+                import_batch()
+    if names or pending_errors or progress:
+        import_batch()
+    
+    print(f"\nImport complete!")
+    print(f"Successfully added: {len(added_games)} games")
+    print(f"Errors encountered: {len(errors)}")
+    return added_games, errors
+
+@job_handler(BGG_IMPORT_JOB)
+def run_bgg_import_job(job):
+    """Import job.params['username']'s collection, saving job progress with each batch"""
+    def progress(done, total, games, errors):
+        record_job_progress(job, done, total, [
+            {'game_id': game.game_id, 'name': game.name, 'bgg_id': game.bgg_id} for game in games
+        ], errors)
+    
+    _, errors = import_bgg_collection(job.params['username'], progress, job.params.get('force_refresh', False))
+    
+    # Errors from batches that failed to commit never reached progress()
+    recorded = set(job.errors or [])
+    missing = [error for error in errors if error not in recorded]
+    if missing:
+        job.errors = list(job.errors or []) + missing
\ No newline at end of file
@@ -0,0 +1,383 @@
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from models.data_version import DataVersion
+from app import db
+
+# Bumped by every write that can change a ranking (plays, results, player or game names)
+RANKINGS_VERSION = 'rankings'
+# Bumped only when existing plays or results are edited or removed, as opposed to appended
+RANKINGS_REWRITE_VERSION = 'rankings_rewrite'
+# Bumped by writes to the matching resource; drive ETags on the list and detail endpoints
+GAMES_VERSION = 'games'
+PLAYERS_VERSION = 'players'
+GAME_PLAYS_VERSION = 'game_plays'
+
+# One SQLite connection per worker process; the file itself is shared by all workers
+_store = {'pid': None, 'conn': None}
+_lock = threading.Lock()
+
+def bump_data_version(*names):
+    """Increment the named data versions as part of the current transaction"""
+    now = datetime.utcnow()
+    names = names or (RANKINGS_VERSION,)
+    for name in names:
+        updated = DataVersion.query.filter_by(name=name).update(
+            {'version': DataVersion.version + 1, 'updated_at': now},
+            synchronize_session=False
+        )
+        if not updated:
+            db.session.add(DataVersion(name=name, version=1, updated_at=now))
+    
+    # Dropped from this host's version mirror once the transaction commits
+    db.session.info.setdefault('bumped_versions', set()).update(names)
+
+def get_data_version(name=RANKINGS_VERSION):
+    """Get the current version of a data family (0 if it was never written)"""
+    return db.session.query(DataVersion.version).filter_by(name=name).scalar() or 0
+
+def get_data_versions(*names):
+    """Get {name: version} for several data families in one query"""
+    rows = db.session.query(DataVersion.name, DataVersion.version).filter(
+        DataVersion.name.in_(names)
+    ).all()
+    versions = dict.fromkeys(names, 0)
+    versions.update(rows)
+    return versions
+
+def _connection():
+    """Open the shared cache file, reopening after gunicorn forks a worker"""
+    if _store['pid'] != os.getpid():
+        conn = sqlite3.connect(
+            current_app.config['RANKING_CACHE_PATH'],
+            timeout=5,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, generation INTEGER NOT NULL, '
+            'value TEXT NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)')
+        conn.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS versions ('
+            'name TEXT PRIMARY KEY, version INTEGER NOT NULL, '
+            'updated_at TEXT, checked_at REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, body BLOB NOT NULL, mimetype TEXT NOT NULL, '
+            'size INTEGER NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS bgg_responses ('
+            'key TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, '
+            'fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS bgg_responses_accessed_at ON bgg_responses (accessed_at)')
+        _store['pid'] = os.getpid()
+        _store['conn'] = conn
+    return _store['conn']
+
+def _forget_versions(session):
+    names = session.info.pop('bumped_versions', None)
+    if not names:
+        return
+    try:
+        with _lock:
+            _connection().executemany('DELETE FROM versions WHERE name = ?', [(name,) for name in names])
+    except sqlite3.Error as e:
+        print(f"Failed to clear data version mirror: {e}")
+
+def _discard_bumped_versions(session):
+    session.info.pop('bumped_versions', None)
+
+event.listen(db.session, 'after_commit', _forget_versions)
+event.listen(db.session, 'after_rollback', _discard_bumped_versions)
+
+def get_version_stamps(*names):
+    """
+    Get {name: (version, updated_at)} for several data families.
+    
+    Served from a mirror in the shared cache file, so conditional requests
+    normally skip the database. Entries are dropped when a write on this host
+    commits and re-read after DATA_VERSION_TTL seconds to pick up writes
+    from other hosts.
+    """
+    ttl = current_app.config['DATA_VERSION_TTL']
+    try:
+        with _lock:
+            rows = _connection().execute(
+                f"SELECT name, version, updated_at FROM versions "
+                f"WHERE name IN ({', '.join('?' * len(names))}) AND checked_at > ?",
+                (*names, time.time() - ttl)
+            ).fetchall()
+        if len(rows) == len(names):
+            return {
+                name: (version, datetime.fromisoformat(updated_at) if updated_at else None)
+                for name, version, updated_at in rows
+            }
+    except sqlite3.Error as e:
+        print(f"Data version mirror unavailable: {e}")
+    
+    rows = db.session.query(DataVersion.name, DataVersion.version, DataVersion.updated_at).filter(
+        DataVersion.name.in_(names)
+    ).all()
+    stamps = dict.fromkeys(names, (0, None))
+    stamps.update({name: (version, updated_at) for name, version, updated_at in rows})
+    
+    try:
+        with _lock:
+            _connection().executemany(
+                'INSERT OR REPLACE INTO versions (name, version, updated_at, checked_at) VALUES (?, ?, ?, ?)',
+                [(name, version, updated_at.isoformat() if updated_at else None, time.time())
+                 for name, (version, updated_at) in stamps.items()]
+            )
+    except sqlite3.Error as e:
+        print(f"Failed to update data version mirror: {e}")
+    
+    return stamps
+
+def _increment(conn, counter, amount=1):
+    conn.execute(
+        'INSERT INTO counters (name, value) VALUES (?, ?) '
+        'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+        (counter, amount)
+    )
+
+def _cache_key(endpoint, args, kwargs, generation):
+    return json.dumps([endpoint, list(args), sorted(kwargs.items()), generation], default=str)
+
+def _cache_get(key):
+    with _lock:
+        conn = _connection()
+        row = conn.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            _increment(conn, 'misses')
+            return None
+        conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        _increment(conn, 'hits')
+    return json.loads(row[0])
+
+def _cache_set(key, generation, value):
+    max_entries = current_app.config['RANKING_CACHE_MAX_ENTRIES']
+    with _lock:
+        conn = _connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, generation, value, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, generation, json.dumps(value, default=str), time.time())
+            )
+            # Entries from older generations can never be served again
+            conn.execute('DELETE FROM entries WHERE generation < ?', (generation,))
+            
+            # Least recently used eviction once the cache is over its size bound
+            excess = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0] - max_entries
+            if excess > 0:
+                conn.execute(
+                    'DELETE FROM entries WHERE key IN '
+                    '(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)',
+                    (excess,)
+                )
+                _increment(conn, 'evictions', excess)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+def get_or_compute(endpoint, compute, *args, **kwargs):
+    """
+    Return compute(*args, **kwargs), served from the cross-worker cache when possible.
+    
+    Entries are keyed by (endpoint, args, data generation), so any write that
+    bumps the rankings version makes older entries unreachable.
+    """
+    generation = get_data_version(RANKINGS_VERSION)
+    key = _cache_key(endpoint, args, kwargs, generation)
+    
+    try:
+        cached = _cache_get(key)
+    except sqlite3.Error as e:
+        print(f"Ranking cache unavailable: {e}")
+        return compute(*args, **kwargs)
+    
+    if cached is not None:
+        return cached
+    
+    result = compute(*args, **kwargs)
+    
+    try:
+        _cache_set(key, generation, result)
+    except sqlite3.Error as e:
+        print(f"Failed to store ranking cache entry: {e}")
+    
+    return result
+
+def get_cached_response(key):
+    """
+    Get (body, mimetype) of a stored compressed response, or None.
+    
+    Keys include the response ETag, so an entry is only ever served for the
+    data versions it was built from; stale entries age out of the LRU.
+    """
+    try:
+        with _lock:
+            conn = _connection()
+            row = conn.execute('SELECT body, mimetype FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                _increment(conn, 'response_misses')
+                return None
+            conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            _increment(conn, 'response_hits')
+    except sqlite3.Error as e:
+        print(f"Response cache unavailable: {e}")
+        return None
+    return bytes(row[0]), row[1]
+
+def store_cached_response(key, body, mimetype):
+    """Store a compressed response body, evicting least recently used ones over RESPONSE_CACHE_MAX_BYTES"""
+    max_bytes = current_app.config['RESPONSE_CACHE_MAX_BYTES']
+    if len(body) > max_bytes:
+        return
+    try:
+        with _lock:
+            conn = _connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, body, mimetype, size, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                    (key, body, mimetype, len(body), time.time())
+                )
+                evicted = conn.execute(
+                    'DELETE FROM responses WHERE key IN ('
+                    'SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS running '
+                    'FROM responses) WHERE running > ?)',
+                    (max_bytes,)
+                ).rowcount
+                if evicted > 0:
+                    _increment(conn, 'response_evictions', evicted)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    except sqlite3.Error as e:
+        print(f"Failed to store response cache entry: {e}")
+
+def get_bgg_responses(keys, ttl):
+    """
+    Get {key: (xml bytes, fresh)} for cached BGG responses.
+    
+    Entries older than ttl seconds come back with fresh=False rather than
+    being dropped, so callers can fall back to them when BGG is unavailable.
+    Missing keys are left out.
+    """
+    keys = list(keys)
+    found = {}
+    now = time.time()
+    try:
+        with _lock:
+            conn = _connection()
+            # Stay well under SQLite's bound parameter limit
+            for offset in range(0, len(keys), 500):
+                chunk = keys[offset:offset + 500]
+                rows = conn.execute(
+                    f"SELECT key, body, fetched_at FROM bgg_responses WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, body, fetched_at in rows:
+                    found[key] = (gzip.decompress(body), now - fetched_at < ttl)
+            if found:
+                conn.executemany('UPDATE bgg_responses SET accessed_at = ? WHERE key = ?', [(now, key) for key in found])
+            fresh = sum(1 for _, is_fresh in found.values() if is_fresh)
+            _increment(conn, 'bgg_hits', fresh)
+            _increment(conn, 'bgg_misses', len(keys) - fresh)
+    except sqlite3.Error as e:
+        print(f"BGG response cache unavailable: {e}")
+    return found
+
+def store_bgg_responses(responses, compressed=False):
+    """
+    Store {key: xml bytes} gzip-compressed, evicting least recently used ones over BGG_CACHE_MAX_BYTES.
+    
+    With compressed=True the values are already gzip data, e.g. compressed
+    while a response was being streamed.
+    """
+    if not responses:
+        return
+    now = time.time()
+    rows = []
+    for key, xml in responses.items():
+        body = xml if compressed else gzip.compress(xml, mtime=0)
+        rows.append((key, body, len(body), now, now))
+    try:
+        with _lock:
+            conn = _connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO bgg_responses (key, body, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                    rows
+                )
+                evicted = conn.execute(
+                    'DELETE FROM bgg_responses WHERE key IN ('
+                    'SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running '
+                    'FROM bgg_responses) WHERE running > ?)',
+                    (current_app.config['BGG_CACHE_MAX_BYTES'],)
+                ).rowcount
+                if evicted > 0:
+                    _increment(conn, 'bgg_evictions', evicted)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    except sqlite3.Error as e:
+        print(f"Failed to store BGG responses: {e}")
+
+def get_cache_stats():
+    """Get hit/miss counters and size of the shared ranking cache"""
+    with _lock:
+        conn = _connection()
+        counters = dict(conn.execute('SELECT name, value FROM counters').fetchall())
+        entries = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        responses, response_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        bgg_entries, bgg_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM bgg_responses').fetchone()
+    
+    hits = counters.get('hits', 0)
+    misses = counters.get('misses', 0)
+    
+    return {
+        'hits': hits,
+        'misses': misses,
+        'evictions': counters.get('evictions', 0),
+        'hit_rate': hits / (hits + misses) if hits + misses else 0,
+        'entries': entries,
+        'max_entries': current_app.config['RANKING_CACHE_MAX_ENTRIES'],
+        'generation': get_data_version(RANKINGS_VERSION),
+        'responses': {
+            'hits': counters.get('response_hits', 0),
+            'misses': counters.get('response_misses', 0),
+            'evictions': counters.get('response_evictions', 0),
+            'entries': responses,
+            'bytes': response_bytes,
+            'max_bytes': current_app.config['RESPONSE_CACHE_MAX_BYTES']
+        },
+        'bgg': {
+            'hits': counters.get('bgg_hits', 0),
+            'misses': counters.get('bgg_misses', 0),
+            'evictions': counters.get('bgg_evictions', 0),
+            'entries': bgg_entries,
+            'bytes': bgg_bytes,
+            'max_bytes': current_app.config['BGG_CACHE_MAX_BYTES']
+        }
+    }
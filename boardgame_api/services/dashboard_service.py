@@ -0,0 +1,146 @@
+from sqlalchemy import func, extract, case, cast, distinct, Float, Numeric
+from models.game import Game
+from models.player import Player
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from services.game_play_service import get_game_play_statistics, get_recent_game_plays
+from utils.date_range import year_range
+from app import db
+
+# Grade points for first and last place; places in between are spread evenly
+MAX_GRADE_POINT = 10
+MIN_GRADE_POINT = 4
+
+def get_win_rates(year=None, min_plays=1, top=5):
+    """Players with the highest share of plays won (rank 1), optionally within one year"""
+    plays = func.count(distinct(PlayResult.play_id))
+    wins = func.count(distinct(case((PlayResult.rank == 1, PlayResult.play_id))))
+    
+    query = db.session.query(
+        Player.player_id,
+        Player.name,
+        plays.label('total_plays'),
+        wins.label('wins')
+    ).join(
+        PlayResult, Player.player_id == PlayResult.player_id
+    )
+    if year is not None:
+        start, end = year_range(year)
+        query = query.join(
+            GamePlay, PlayResult.play_id == GamePlay.play_id
+        ).filter(GamePlay.start_time >= start, GamePlay.start_time < end)
+    
+    results = query.group_by(
+        Player.player_id, Player.name
+    ).having(
+        plays >= min_plays
+    ).order_by(
+        (wins * 1.0 / plays).desc(), Player.player_id
+    ).limit(top).all()
+    
+    return [{
+        'player_id': result.player_id,
+        'name': result.name,
+        'total_plays': result.total_plays,
+        'wins': result.wins,
+        'win_rate': round(100.0 * result.wins / result.total_plays, 1)
+    } for result in results]
+
+def get_grade_point_rankings(year=None, min_plays=1):
+    """
+    Players ranked by grade point, optionally within one year.
+    
+    Each result scores by finishing position (the play's player count is its
+    highest rank); the points and plays are summed per player and game in
+    SQL. A player's grade point is their average per game, weighted by the
+    games' complexity, as the frontend's gradeCalculator computes it.
+    """
+    player_count = func.max(PlayResult.rank).over(partition_by=PlayResult.play_id)
+    query = db.session.query(
+        PlayResult.player_id,
+        PlayResult.rank,
+        player_count.label('player_count'),
+        GamePlay.game_id
+    ).join(
+        GamePlay, PlayResult.play_id == GamePlay.play_id
+    ).filter(
+        PlayResult.player_id.isnot(None), PlayResult.rank.isnot(None)
+    )
+    if year is not None:
+        start, end = year_range(year)
+        query = query.filter(GamePlay.start_time >= start, GamePlay.start_time < end)
+    results = query.subquery()
+    
+    # From MAX_GRADE_POINT for first place down to MIN_GRADE_POINT for last, rounded to
+    # 2 places per result like the frontend's getRankGradePoint
+    points = case(
+        (results.c.player_count <= 1, MAX_GRADE_POINT),
+        else_=func.round(cast(
+            MAX_GRADE_POINT - (MAX_GRADE_POINT - MIN_GRADE_POINT) * cast(results.c.rank - 1, Float)
+            / (results.c.player_count - 1),
+            Numeric
+        ), 2)
+    )
+    rows = db.session.query(
+        results.c.player_id,
+        func.sum(points).label('points'),
+        func.count().label('plays'),
+        Game.complexity
+    ).join(
+        Game, Game.game_id == results.c.game_id
+    ).group_by(
+        results.c.player_id, results.c.game_id, Game.complexity
+    ).all()
+    
+    # {player_id: [(points, plays, complexity) per game]}
+    per_game = {}
+    for row in rows:
+        per_game.setdefault(row.player_id, []).append((float(row.points), row.plays, float(row.complexity or 0)))
+    
+    names = dict(db.session.query(Player.player_id, Player.name).filter(Player.player_id.in_(list(per_game))))
+    rankings = []
+    for player_id, games in per_game.items():
+        total_plays = sum(plays for _, plays, _ in games)
+        if player_id not in names or total_plays < min_plays:
+            continue
+        weights = sum(complexity for _, _, complexity in games)
+        weighted = sum(points / plays * complexity for points, plays, complexity in games)
+        rankings.append({
+            'player_id': player_id,
+            'player_name': names[player_id],
+            'total_plays': total_plays,
+            'grade_point': weighted / weights if weights > 0 else 0
+        })
+    
+    rankings.sort(key=lambda entry: (-entry['grade_point'], entry['player_id']))
+    return rankings
+
+def get_play_years():
+    """Years that have at least one dated play, newest first"""
+    year = extract('year', GamePlay.start_time)
+    rows = db.session.query(year).filter(GamePlay.start_time.isnot(None)).distinct().order_by(year.desc()).all()
+    return [int(row[0]) for row in rows]
+
+def get_dashboard(year=None, min_plays=1, top=5, recent=5):
+    """
+    Everything the dashboard shows, from a handful of aggregate queries.
+    
+    The player rankings and win rates honour year and min_plays; totals and
+    recent plays are all-time. top limits the win rates; every ranked player
+    is returned.
+    """
+    stats = get_game_play_statistics()
+    
+    return {
+        'totals': {
+            'games': stats['total_games'],
+            'players': stats['total_players'],
+            'plays': stats['total_plays'],
+            'games_played': stats['total_games_played'],
+            'average_duration': stats['average_duration']
+        },
+        'recent_plays': get_recent_game_plays(recent),
+        'player_rankings': get_grade_point_rankings(year, min_plays),
+        'win_rates': get_win_rates(year, min_plays, top),
+        'years': get_play_years()
+    }
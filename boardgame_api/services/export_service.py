@@ -0,0 +1,76 @@
+from itertools import groupby
+from flask import current_app
+from sqlalchemy import or_
+from models.game import Game
+from models.player import Player
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from utils.serializers import (
+    GAME_FIELDS, PLAYER_FIELDS, GAME_PLAY_FIELDS, PLAY_RESULT_FIELDS, columns, row_to_dict
+)
+from app import db
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+def _stream(query):
+    """Iterate a query through a server-side cursor, EXPORT_BATCH_SIZE rows at a time"""
+    return query.execution_options(stream_results=True).yield_per(EXPORT_BATCH_SIZE)
+
+def _records(model, fields, record_type, since):
+    query = db.session.query(*columns(fields))
+    if since is not None:
+        query = query.filter(model.created_at >= since)
+    for row in _stream(query.order_by(columns(fields)[0])):
+        yield {'type': record_type, **row_to_dict(fields, row)}
+
+def _play_records(since):
+    play_count = len(GAME_PLAY_FIELDS)
+    query = db.session.query(
+        *columns(GAME_PLAY_FIELDS), *columns(PLAY_RESULT_FIELDS)
+    ).outerjoin(
+        PlayResult, GamePlay.play_id == PlayResult.play_id
+    )
+    if since is not None:
+        # Editing a play's results replaces them with new rows, so recent results mark edited plays
+        edited = db.session.query(PlayResult.play_id).filter(PlayResult.created_at >= since)
+        query = query.filter(or_(GamePlay.created_at >= since, GamePlay.play_id.in_(edited)))
+    
+    # Rows arrive grouped by play, so each play is assembled from consecutive rows
+    rows = _stream(query.order_by(GamePlay.play_id, PlayResult.result_id))
+    for _, play_rows in groupby(rows, key=lambda row: row[0]):
+        play_rows = list(play_rows)
+        play = row_to_dict(GAME_PLAY_FIELDS, play_rows[0][:play_count])
+        play['results'] = [
+            row_to_dict(PLAY_RESULT_FIELDS, row[play_count:])
+            for row in play_rows if row[play_count] is not None
+        ]
+        yield {'type': 'game_play', **play}
+
+def export_records(since=None):
+    """
+    Yield every game, player and game play (with nested results) as dicts.
+    
+    Each record has a 'type' of 'game', 'player' or 'game_play'; the other
+    keys match the model's to_dict(). With since, only records created at or
+    after that time are included, plus plays whose results were replaced
+    since then. Other edits (a play's fields without its results, game or
+    player changes) and deletions are not picked up; take a full export to
+    capture those. Rows are streamed from the database, so memory use does
+    not grow with the size of the history.
+    """
+    yield from _records(Game, GAME_FIELDS, 'game', since)
+    yield from _records(Player, PLAYER_FIELDS, 'player', since)
+    yield from _play_records(since)
+
+def export_ndjson(since=None, lines_per_chunk=100):
+    """Yield the export as newline-delimited JSON, a few records per chunk"""
+    dumps = current_app.json.dumps
+    chunk = []
+    for record in export_records(since):
+        chunk.append(dumps(record))
+        if len(chunk) >= lines_per_chunk:
+            yield '\n'.join(chunk) + '\n'
+            chunk = []
+    if chunk:
+        yield '\n'.join(chunk) + '\n'
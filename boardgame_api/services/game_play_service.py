@@ -1,11 +1,112 @@
+import base64
+import json
 from extensions import db
+from sqlalchemy import and_, or_, insert
+from sqlalchemy.orm import selectinload, joinedload
+from models.game import Game
+from models.player import Player
 from models.game_play import GamePlay
 from models.play_result import PlayResult
+from services.ranking_service import calculate_victory_points
+from services.leaderboard_service import apply_results_to_leaderboard
+from services.rating_service import invalidate_rating_checkpoints
+from services.cache_service import bump_data_version, RANKINGS_VERSION, GAME_PLAYS_VERSION
+from utils.serializers import game_play_dicts
 from datetime import datetime
 
-def get_all_game_plays():
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BULK_PLAYS = 500
+
+# Related records that ?expand= can embed in game play responses
+EXPANSIONS = ('game', 'players')
+
+def parse_expand(value):
+    """Parse an ?expand=game,players argument; raises ValueError on unknown names"""
+    expand = {name.strip() for name in (value or '').split(',') if name.strip()}
+    unknown = expand - set(EXPANSIONS)
+    if unknown:
+        raise ValueError(f"Unknown expand value(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(EXPANSIONS)}")
+    return expand
+
+def _load_options(expand=()):
+    """Eager loads so serializing plays with `expand` costs a fixed number of queries"""
+    results = selectinload(GamePlay.results)
+    options = [results.joinedload(PlayResult.player) if 'players' in expand else results]
+    if 'game' in expand:
+        options.append(joinedload(GamePlay.game))
+    return options
+
+def get_all_game_plays(expand=()):
     """Get all game plays with their results"""
-    return GamePlay.query.all()
+    return GamePlay.query.options(*_load_options(expand)).all()
+
+def encode_cursor(play):
+    """Opaque token pointing just past a serialized play in listing order"""
+    payload = json.dumps([play['start_time'], play['play_id']]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on a malformed token"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        start_time, play_id = json.loads(base64.urlsafe_b64decode(padded))
+        start_time = datetime.fromisoformat(start_time) if start_time is not None else None
+        if not isinstance(play_id, int):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return start_time, play_id
+
+def get_game_plays_page(limit=DEFAULT_PAGE_SIZE, cursor=None, game_id=None, player_id=None,
+                        mode=None, start=None, end=None, expand=(), fields=None):
+    """
+    Get one page of game plays, newest start_time first (undated plays last).
+    
+    Pages are keyset-paginated on (start_time, play_id), so each page costs
+    the same however deep into the history it is. Results for the whole page
+    are loaded in one extra query. `fields` limits the serialized fields.
+    Returns (serialized plays, next_cursor); next_cursor is None on the last page.
+    """
+    query = GamePlay.query
+    
+    if game_id is not None:
+        query = query.filter(GamePlay.game_id == game_id)
+    if player_id is not None:
+        query = query.filter(GamePlay.results.any(PlayResult.player_id == player_id))
+    if mode is not None:
+        query = query.filter(GamePlay.mode == mode)
+    if start is not None:
+        query = query.filter(GamePlay.start_time >= start)
+    if end is not None:
+        query = query.filter(GamePlay.start_time < end)
+    
+    if cursor:
+        after_time, after_id = decode_cursor(cursor)
+        if after_time is None:
+            query = query.filter(GamePlay.start_time.is_(None), GamePlay.play_id < after_id)
+        else:
+            query = query.filter(or_(
+                GamePlay.start_time < after_time,
+                and_(GamePlay.start_time == after_time, GamePlay.play_id < after_id),
+                GamePlay.start_time.is_(None)
+            ))
+    
+    # Fetch one extra row to know whether another page follows
+    # The cursor is built from start_time and play_id, so select them either way
+    cursor_keys = {'start_time', 'play_id'}
+    plays = game_play_dicts(query.order_by(
+        GamePlay.start_time.desc().nullslast(), GamePlay.play_id.desc()
+    ).limit(limit + 1), expand, None if fields is None else fields | cursor_keys)
+    
+    next_cursor = encode_cursor(plays[limit - 1]) if len(plays) > limit else None
+    plays = plays[:limit]
+    
+    if fields is not None:
+        for play in plays:
+            for key in cursor_keys - fields:
+                del play[key]
+    return plays, next_cursor
 
 def get_game_play_by_id(play_id):
     """Get a specific game play by ID"""
@@ -81,17 +182,164 @@ def get_game_plays_by_game(game_id):
     return GamePlay.query.filter_by(game_id=game_id).all()
 
 def get_recent_game_plays(limit=5):
-    """Get recent game plays, ordered by creation date"""
-    return GamePlay.query.order_by(GamePlay.created_at.desc()).limit(limit).all()
+    """Get the most recently played game plays that have results, serialized with game and player names"""
+    query = GamePlay.query.filter(GamePlay.results.any()).order_by(
+        GamePlay.start_time.desc().nullslast(), GamePlay.play_id.desc()
+    ).limit(limit)
+    return game_play_dicts(query, expand={'game', 'players'})
 
 def get_game_play_statistics():
-    """Get basic statistics about game plays"""
-    total_plays = GamePlay.query.count()
-    total_games_played = db.session.query(db.func.count(db.distinct(GamePlay.game_id))).scalar()
-    avg_duration = db.session.query(db.func.avg(GamePlay.duration)).scalar()
+    """Get basic statistics about game plays, plus game and player counts, in one query"""
+    total_games = db.session.query(db.func.count(Game.game_id)).scalar_subquery()
+    total_players = db.session.query(db.func.count(Player.player_id)).scalar_subquery()
+    
+    total_plays, total_games_played, avg_duration, games, players = db.session.query(
+        db.func.count(GamePlay.play_id),
+        db.func.count(db.distinct(GamePlay.game_id)),
+        db.func.avg(GamePlay.duration),
+        total_games,
+        total_players
+    ).one()
     
     return {
         'total_plays': total_plays,
         'total_games_played': total_games_played,
-        'average_duration': round(avg_duration) if avg_duration else 0
-    }
\ No newline at end of file
+        'average_duration': round(avg_duration) if avg_duration else 0,
+        'total_games': games,
+        'total_players': players
+    }
+
+def _parse_time(value, field, errors):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        errors.append(f"{field} must be an ISO 8601 date/time")
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def validate_bulk_game_plays(items):
+    """
+    Check every play of a bulk request up front.
+    
+    Game and player ids are checked with one query each. Ids are type-checked
+    before they are hashed or compared, so any JSON value is reported as an
+    error rather than raising. Returns a list of (index, row, results,
+    errors): row holds the game_plays columns and results the play_results
+    columns, both only usable when errors is empty.
+    """
+    game_ids = {
+        item.get('game_id') for item in items
+        if isinstance(item, dict) and _is_int(item.get('game_id'))
+    }
+    player_ids = {
+        result.get('player_id')
+        for item in items if isinstance(item, dict) and isinstance(item.get('results'), list)
+        for result in item['results'] if isinstance(result, dict) and _is_int(result.get('player_id'))
+    }
+    known_games = {game_id for game_id, in db.session.query(Game.game_id).filter(
+        Game.game_id.in_(list(game_ids))
+    )}
+    known_players = {player_id for player_id, in db.session.query(Player.player_id).filter(
+        Player.player_id.in_(list(player_ids))
+    )}
+    
+    validated = []
+    for index, item in enumerate(items):
+        errors = []
+        if not isinstance(item, dict):
+            validated.append((index, None, [], ['play must be an object']))
+            continue
+        
+        game_id = item.get('game_id')
+        if not _is_int(game_id) or game_id not in known_games:
+            errors.append(f"game {game_id} does not exist")
+        start_time = _parse_time(item.get('start_time'), 'start_time', errors)
+        end_time = _parse_time(item.get('end_time'), 'end_time', errors)
+        duration = item.get('duration')
+        if duration is not None and not _is_int(duration):
+            errors.append('duration must be an integer')
+        if not duration and start_time and end_time:
+            duration = int((end_time - start_time).total_seconds() / 60)
+        for field in ('mode', 'notes'):
+            if item.get(field) is not None and not isinstance(item[field], str):
+                errors.append(f"{field} must be a string")
+        
+        results = item.get('results', [])
+        if not isinstance(results, list):
+            errors.append('results must be a list')
+            results = []
+        seen = set()
+        for position, result in enumerate(results):
+            if not isinstance(result, dict):
+                errors.append(f"results[{position}] must be an object")
+                continue
+            player_id = result.get('player_id')
+            if not _is_int(player_id) or player_id not in known_players:
+                errors.append(f"results[{position}]: player {player_id} does not exist")
+            elif player_id in seen:
+                errors.append(f"results[{position}]: player {player_id} is listed twice")
+            else:
+                seen.add(player_id)
+            if not _is_int(result.get('rank')) or result['rank'] < 1:
+                errors.append(f"results[{position}]: rank must be a positive integer")
+            if result.get('score') is not None and not _is_int(result['score']):
+                errors.append(f"results[{position}]: score must be an integer")
+            if result.get('notes') is not None and not isinstance(result['notes'], str):
+                errors.append(f"results[{position}]: notes must be a string")
+        
+        row = {
+            'game_id': game_id,
+            'start_time': start_time,
+            'end_time': end_time,
+            'duration': duration,
+            'mode': item.get('mode'),
+            'notes': item.get('notes')
+        }
+        validated.append((index, row, results, errors))
+    return validated
+
+def bulk_create_game_plays(validated):
+    """
+    Insert validated plays and their results with two multi-row INSERT ... RETURNING.
+    
+    Victory points come from calculate_victory_points, and the leaderboard,
+    rating checkpoints and data versions are updated in the same transaction.
+    The caller commits. Returns the new play ids in input order.
+    """
+    if not validated:
+        return []
+    
+    now = datetime.utcnow()
+    rows = [dict(row, created_at=now) for _, row, _, _ in validated]
+    play_ids = db.session.scalars(
+        insert(GamePlay).returning(GamePlay.play_id, sort_by_parameter_order=True),
+        rows
+    ).all()
+    
+    result_rows = []
+    for play_id, (_, _, results, _) in zip(play_ids, validated):
+        victory_points_map = calculate_victory_points([(result['player_id'], result['rank']) for result in results])
+        for result in results:
+            result_rows.append({
+                'play_id': play_id,
+                'player_id': result['player_id'],
+                'score': result.get('score'),
+                'rank': result['rank'],
+                'victory_points': victory_points_map.get(result['player_id'], 0),
+                'notes': result.get('notes'),
+                'created_at': now
+            })
+    
+    if result_rows:
+        inserted = db.session.execute(
+            insert(PlayResult).returning(PlayResult.play_id, PlayResult.player_id, PlayResult.victory_points),
+            result_rows
+        ).all()
+        apply_results_to_leaderboard(inserted)
+    
+    invalidate_rating_checkpoints(*(row['start_time'] or now for row in rows))
+    bump_data_version(RANKINGS_VERSION, GAME_PLAYS_VERSION)
+    return play_ids
@@ -1,6 +1,9 @@
-import requests
 import xml.etree.ElementTree as ET
+from flask import current_app
+from sqlalchemy.orm import undefer_group
 from models.game import Game
+from services import bgg_client
+from services.cache_service import get_bgg_responses, store_bgg_responses
 from app import db
 
 def get_all_games():
@@ -8,46 +11,97 @@ def get_all_games():
     return Game.query.all()
 
 def get_game_by_id(game_id):
-    """Get a game by ID"""
-    return Game.query.get(game_id)
+    """Get a game by ID, with its deferred text columns loaded as to_dict() needs them"""
+    return Game.query.options(undefer_group('game_text')).get(game_id)
 
-def fetch_game_from_bgg(bgg_id):
-    """Fetch game data from BoardGameGeek API"""
+def parse_bgg_thing(item):
+    """Turn one <item> of a BGG thing response into our game data dict"""
+    name = item.find('.//name[@type="primary"]')
+    description = item.find('.//description')
+    min_players = item.find('.//minplayers')
+    max_players = item.find('.//maxplayers')
+    playing_time = item.find('.//playingtime')
+    image = item.find('.//image')
+    release_year = item.find('.//yearpublished')
+    averageweight = item.find('.//averageweight')
+    
+    return {
+        'name': name.get('value') if name is not None else '',
+        'description': description.text if description is not None else '',
+        'min_players': int(min_players.get('value')) if min_players is not None else None,
+        'max_players': int(max_players.get('value')) if max_players is not None else None,
+        'avg_play_time': int(playing_time.get('value')) if playing_time is not None else None,
+        'image_url': image.text if image is not None else '',
+        'bgg_id': int(item.get('id')),
+        'release_year': int(release_year.get('value')) if release_year is not None else None,
+        'averageweight': float(averageweight.get('value')) if averageweight is not None else None
+    }
+
+def _parse_bgg_id(bgg_id):
+    """A BGG id as an int, or None if it isn't numeric"""
     try:
-        url = f'https://boardgamegeek.com/xmlapi2/thing?id={bgg_id}&stats=1'
-        response = requests.get(url)
-        
-        if response.status_code != 200:
-            return None
-        
-        # Parse XML response
-        root = ET.fromstring(response.content)
-        item = root.find('.//item')
-        
-        if item is None:
-            return None
-        
-        # Extract data
-        name = item.find('.//name[@type="primary"]')
-        description = item.find('.//description')
-        min_players = item.find('.//minplayers')
-        max_players = item.find('.//maxplayers')
-        playing_time = item.find('.//playingtime')
-        image = item.find('.//image')
-        release_year = item.find('.//yearpublished')
-        averageweight = item.find('.//averageweight')
-        
-        return {
-            'name': name.get('value') if name is not None else '',
-            'description': description.text if description is not None else '',
-            'min_players': int(min_players.get('value')) if min_players is not None else None,
-            'max_players': int(max_players.get('value')) if max_players is not None else None,
-            'avg_play_time': int(playing_time.get('value')) if playing_time is not None else None,
-            'image_url': image.text if image is not None else '',
-            'bgg_id': bgg_id,
-            'release_year': int(release_year.get('value')) if release_year is not None else None,
-            'averageweight': float(averageweight.get('value')) if averageweight is not None else None
+        return int(bgg_id)
+    except (TypeError, ValueError):
+        return None
+
+def _thing_key(bgg_id):
+    return f"thing:{bgg_id}"
+
+def fetch_games_from_bgg(bgg_ids, chunk_size=None, force_refresh=False):
+    """
+    Fetch game data for many BGG ids, several ids per thing request.
+    
+    Each game's XML is cached for BGG_CACHE_TTL, so only ids missing from
+    the cache (or all of them with force_refresh) are requested, in chunks
+    of chunk_size (BGG_THING_BATCH_SIZE by default) paced by the BGG
+    client's rate limiter. If a chunk fails, expired cached copies are used.
+    Returns {bgg_id: game data}; non-numeric ids (skipped), ids BGG did not
+    return, or whose chunk failed with nothing cached, are missing from the
+    result.
+    """
+    chunk_size = chunk_size or current_app.config['BGG_THING_BATCH_SIZE']
+    valid_ids = []
+    for bgg_id in bgg_ids:
+        parsed = _parse_bgg_id(bgg_id)
+        if parsed is None:
+            print(f"Skipping invalid BGG id: {bgg_id!r}")
+        else:
+            valid_ids.append(parsed)
+    bgg_ids = list(dict.fromkeys(valid_ids))
+    cached = get_bgg_responses(map(_thing_key, bgg_ids), current_app.config['BGG_CACHE_TTL'])
+    items = {}
+    if not force_refresh:
+        items = {
+            bgg_id: ET.fromstring(cached[_thing_key(bgg_id)][0])
+            for bgg_id in bgg_ids if cached.get(_thing_key(bgg_id), (None, False))[1]
         }
-    except Exception as e:
-        print(f"Error fetching data from BGG: {e}")
-        return None
\ No newline at end of file
+    
+    missing = [bgg_id for bgg_id in bgg_ids if bgg_id not in items]
+    for offset in range(0, len(missing), chunk_size):
+        chunk = missing[offset:offset + chunk_size]
+        fetched = {}
+        try:
+            response = bgg_client.get('thing', params={'id': ','.join(map(str, chunk)), 'stats': 1})
+            for item in ET.fromstring(response.content).findall('item'):
+                fetched[int(item.get('id'))] = item
+            store_bgg_responses({_thing_key(bgg_id): ET.tostring(item) for bgg_id, item in fetched.items()})
+        except Exception as e:
+            print(f"Error fetching data from BGG for ids {chunk}: {e}")
+            # Fall back to expired copies rather than failing the games outright
+            fetched = {
+                bgg_id: ET.fromstring(cached[_thing_key(bgg_id)][0])
+                for bgg_id in chunk if _thing_key(bgg_id) in cached
+            }
+        items.update(fetched)
+    
+    games = {}
+    for bgg_id, item in items.items():
+        try:
+            games[bgg_id] = parse_bgg_thing(item)
+        except (TypeError, ValueError) as e:
+            print(f"Skipping BGG item {bgg_id}: {e}")
+    return games
+
+def fetch_game_from_bgg(bgg_id, force_refresh=False):
+    """Fetch game data from BoardGameGeek API"""
+    return fetch_games_from_bgg([bgg_id], force_refresh=force_refresh).get(_parse_bgg_id(bgg_id))
\ No newline at end of file
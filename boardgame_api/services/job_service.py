@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_, and_
+from models.job import Job
+from app import db
+
+# Job kind -> function(job) that runs it; filled in with @job_handler by the services defining jobs
+JOB_HANDLERS = {}
+
+# One thread pool per worker process, recreated after gunicorn forks
+_runner = {'pid': None, 'executor': None, 'kicked': (None, 0.0)}
+_lock = threading.Lock()
+
+def job_handler(kind):
+    """Register the decorated function(job) as the handler for jobs of `kind`"""
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+def _executor():
+    with _lock:
+        if _runner['pid'] != os.getpid():
+            _runner['executor'] = ThreadPoolExecutor(
+                max_workers=current_app.config['JOB_WORKERS'], thread_name_prefix='jobs'
+            )
+            _runner['pid'] = os.getpid()
+        return _runner['executor']
+
+def enqueue_job(kind, params):
+    """Persist a queued job and wake this process's job threads; returns the job"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    
+    job = Job(kind=kind, status=Job.QUEUED, params=params, result=[], errors=[])
+    db.session.add(job)
+    db.session.commit()
+    kick_job_runner()
+    return job
+
+def get_job(job_id):
+    """Get a job by ID"""
+    return Job.query.get(job_id)
+
+def get_recent_jobs(limit=20):
+    """Get the most recently created jobs"""
+    return Job.query.order_by(Job.job_id.desc()).limit(limit).all()
+
+def record_job_progress(job, done, total, result=(), errors=()):
+    """Update a running job's progress and append to its results and errors; the caller commits"""
+    job.progress = done
+    job.total = total
+    job.heartbeat_at = datetime.utcnow()
+    # Assign new lists so the JSON columns are seen as changed
+    if result:
+        job.result = list(job.result or []) + list(result)
+    if errors:
+        job.errors = list(job.errors or []) + list(errors)
+
+def claim_next_job():
+    """
+    Claim the oldest queued job, or a running one whose worker stopped heartbeating.
+    
+    Rows are locked with SKIP LOCKED on Postgres, so concurrent workers never
+    claim the same job. A job that went stale JOB_MAX_ATTEMPTS times is
+    marked failed instead of run again.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_STALE_AFTER'])
+    while True:
+        job = Job.query.filter(or_(
+            Job.status == Job.QUEUED,
+            and_(Job.status == Job.RUNNING, Job.heartbeat_at < stale_before)
+        )).order_by(Job.job_id).with_for_update(skip_locked=True).first()
+        if job is None:
+            db.session.rollback()
+            return None
+        
+        now = datetime.utcnow()
+        if job.attempts >= current_app.config['JOB_MAX_ATTEMPTS']:
+            job.status = Job.FAILED
+            job.finished_at = now
+            job.errors = list(job.errors or []) + ['Job stopped responding too many times']
+            db.session.commit()
+            continue
+        
+        job.status = Job.RUNNING
+        job.attempts += 1
+        job.started_at = job.started_at or now
+        job.heartbeat_at = now
+        db.session.commit()
+        return job
+
+def run_job(job):
+    """Run a claimed job to completion, recording success or failure"""
+    print(f"Running job {job.job_id} ({job.kind}), attempt {job.attempts}")
+    try:
+        JOB_HANDLERS[job.kind](job)
+        job.status = Job.SUCCEEDED
+    except Exception as e:
+        db.session.rollback()
+        job.status = Job.FAILED
+        job.errors = list(job.errors or []) + [str(e)]
+        print(f"Job {job.job_id} failed: {e}")
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+def _drain(app):
+    with app.app_context():
+        try:
+            while True:
+                job = claim_next_job()
+                if job is None:
+                    return
+                run_job(job)
+        except Exception as e:
+            # Futures swallow exceptions; leave the job to be reclaimed once it goes stale
+            db.session.rollback()
+            print(f"Job runner error: {e}")
+
+def kick_job_runner():
+    """Have a job thread of this process run claimable jobs until none are left"""
+    _runner['kicked'] = (os.getpid(), time.monotonic())
+    _executor().submit(_drain, current_app._get_current_object())
+
+def init_job_runner(app):
+    """
+    Resume queued and orphaned jobs in each worker process once it serves its
+    first request, and again on any request once JOB_STALE_AFTER has passed
+    since the last kick, so jobs left running by a dead worker are reclaimed
+    when their heartbeat goes stale even if nothing new is enqueued.
+    """
+    @app.before_request
+    def resume_jobs():
+        pid, kicked_at = _runner['kicked']
+        if pid != os.getpid() or time.monotonic() - kicked_at >= current_app.config['JOB_STALE_AFTER']:
+            kick_job_runner()
@@ -0,0 +1,161 @@
+from models.play_result import PlayResult
+from models.player_ranking import PlayerRanking
+from services.cache_service import bump_data_version
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import db
+from decimal import Decimal, ROUND_HALF_UP
+from datetime import datetime
+
+# play_results.victory_points is Numeric(5, 2); Postgres rounds half away from zero
+VP_PRECISION = Decimal('0.01')
+RATE_PRECISION = Decimal('0.000001')
+
+def round_victory_points(value):
+    """Round a victory point value the way the play_results column stores it"""
+    if value is None:
+        return Decimal('0')
+    return Decimal(str(value)).quantize(VP_PRECISION, rounding=ROUND_HALF_UP)
+
+def _victory_rate(total_vps, total_plays):
+    return (Decimal(total_vps) / total_plays).quantize(RATE_PRECISION, rounding=ROUND_HALF_UP)
+
+def _aggregate_results(results):
+    """Collapse play results into {player_id: (distinct plays, victory points)}"""
+    plays = {}
+    vps = {}
+    for result in results:
+        plays.setdefault(result.player_id, set()).add(result.play_id)
+        vps[result.player_id] = vps.get(result.player_id, Decimal('0')) + round_victory_points(result.victory_points)
+    
+    return {player_id: (len(plays[player_id]), vps[player_id]) for player_id in plays}
+
+def apply_results_to_leaderboard(results, sign=1):
+    """
+    Add (sign=1) or remove (sign=-1) play results from the leaderboard table.
+    
+    Must be called before the surrounding commit so the aggregate is updated
+    in the same transaction as the play results themselves.
+    """
+    deltas = _aggregate_results(results)
+    if not deltas:
+        return
+    
+    if sign > 0:
+        _upsert_increments(deltas)
+        return
+    
+    rows = {
+        row.player_id: row
+        for row in PlayerRanking.query.filter(
+            PlayerRanking.player_id.in_(list(deltas.keys()))
+        ).with_for_update().all()
+    }
+    
+    for player_id, (plays, vps) in deltas.items():
+        row = rows.get(player_id)
+        if row is None:
+            # Nothing to subtract from; rebuild_leaderboard() repairs any drift
+            continue
+        
+        row.total_plays = row.total_plays - plays
+        row.total_vps = Decimal(row.total_vps) - vps
+        
+        if row.total_plays <= 0:
+            db.session.delete(row)
+        else:
+            row.victory_rate = _victory_rate(row.total_vps, row.total_plays)
+
+def _upsert_increments(deltas):
+    """
+    Add {player_id: (plays, vps)} to the leaderboard with INSERT ... ON CONFLICT DO UPDATE.
+    
+    A single statement per batch, so concurrent plays for a player without a
+    row yet can neither both insert it nor overwrite each other's totals.
+    """
+    insert = postgresql_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+    now = datetime.utcnow()
+    stmt = insert(PlayerRanking).values([
+        {
+            'player_id': player_id,
+            'total_plays': plays,
+            'total_vps': vps,
+            'victory_rate': _victory_rate(vps, plays),
+            'updated_at': now
+        }
+        for player_id, (plays, vps) in sorted(deltas.items())
+    ])
+    total_plays = PlayerRanking.total_plays + stmt.excluded.total_plays
+    total_vps = PlayerRanking.total_vps + stmt.excluded.total_vps
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlayerRanking.player_id],
+        set_={
+            'total_plays': total_plays,
+            'total_vps': total_vps,
+            'victory_rate': func.round(total_vps / total_plays, 6),
+            'updated_at': now
+        }
+    )
+    db.session.execute(stmt)
+
+def compute_leaderboard():
+    """Recompute {player_id: (total_plays, total_vps)} from play_results"""
+    results = db.session.query(
+        PlayResult.player_id,
+        func.count(PlayResult.play_id.distinct()).label('total_plays'),
+        func.sum(PlayResult.victory_points).label('total_vps')
+    ).group_by(PlayResult.player_id).all()
+    
+    return {
+        result.player_id: (result.total_plays, Decimal(result.total_vps or 0))
+        for result in results
+    }
+
+def rebuild_leaderboard(check_only=False):
+    """
+    Check the leaderboard table against a full recompute of play_results.
+    
+    Returns a list of mismatches. Unless check_only is set, the table is
+    rewritten to match the recompute and the change is committed.
+    """
+    expected = compute_leaderboard()
+    stored = {row.player_id: row for row in PlayerRanking.query.with_for_update().all()}
+    
+    mismatches = []
+    for player_id in sorted(set(expected) | set(stored)):
+        expected_plays, expected_vps = expected.get(player_id, (0, Decimal('0')))
+        row = stored.get(player_id)
+        stored_plays = row.total_plays if row else 0
+        stored_vps = Decimal(row.total_vps) if row else Decimal('0')
+        
+        if stored_plays != expected_plays or stored_vps != expected_vps:
+            mismatches.append({
+                'player_id': player_id,
+                'stored': {'total_plays': stored_plays, 'total_vps': float(stored_vps)},
+                'expected': {'total_plays': expected_plays, 'total_vps': float(expected_vps)}
+            })
+        
+        if check_only:
+            continue
+        
+        if expected_plays <= 0:
+            if row:
+                db.session.delete(row)
+            continue
+        
+        if row is None:
+            row = PlayerRanking(player_id=player_id)
+            db.session.add(row)
+        row.total_plays = expected_plays
+        row.total_vps = expected_vps
+        row.victory_rate = _victory_rate(expected_vps, expected_plays)
+    
+    if check_only:
+        db.session.rollback()
+    else:
+        if mismatches:
+            bump_data_version()
+        db.session.commit()
+    
+    return mismatches
@@ -27,5 +27,6 @@ def get_game_plays_by_game(game_id):
 
 def get_game_plays_by_year(year):
     """Get all game plays for a specific year"""
-    from sqlalchemy import extract
-    return GamePlay.query.filter(extract('year', GamePlay.start_time) == year).all()
+    from utils.date_range import year_range
+    start, end = year_range(year)
+    return GamePlay.query.filter(GamePlay.start_time >= start, GamePlay.start_time < end).all()
@@ -0,0 +1,218 @@
+import threading
+import numpy as np
+import pandas as pd
+from models.game import Game
+from models.player import Player
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from services.cache_service import get_data_versions, RANKINGS_VERSION, RANKINGS_REWRITE_VERSION
+from app import db
+
+# Result ids are allocated at flush time but become visible at commit, so an
+# append refresh re-reads this many ids below the last one seen to pick up
+# transactions that committed out of order
+RESULT_ID_OVERLAP = 1000
+
+# Plays without a start_time are kept for overall/game cubes but have no year
+NO_YEAR = -1
+
+class RankingEngine:
+    """
+    In-memory columnar copy of play_results joined with game_plays.
+    
+    All leaderboard cubes (overall, per year, per game, per player per game)
+    are built in one group-by over (year, game, player) and rolled up from
+    there. Appended plays are loaded incrementally; edits and deletions of
+    existing plays trigger a full reload.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frame = None
+        self.versions = None
+        self.leaderboards = {}
+        self.player_names = {}
+    
+    def _load_rows(self, after_result_id=None):
+        query = db.session.query(
+            PlayResult.result_id,
+            PlayResult.play_id,
+            PlayResult.player_id,
+            PlayResult.victory_points,
+            GamePlay.game_id,
+            GamePlay.start_time
+        ).join(
+            GamePlay, PlayResult.play_id == GamePlay.play_id
+        )
+        if after_result_id is not None:
+            query = query.filter(PlayResult.result_id > after_result_id)
+        
+        frame = pd.DataFrame.from_records(
+            query.order_by(PlayResult.result_id).all(),
+            columns=['result_id', 'play_id', 'player_id', 'victory_points', 'game_id', 'start_time']
+        )
+        
+        # Victory points are Numeric(5, 2); keep them as integer hundredths so sums stay exact
+        vps = pd.to_numeric(frame['victory_points'].astype(object), errors='coerce').fillna(0)
+        frame['vp_cents'] = np.rint(vps.to_numpy(dtype=float) * 100).astype(np.int64)
+        frame['start_time'] = pd.to_datetime(frame['start_time'])
+        frame['year'] = frame['start_time'].dt.year.fillna(NO_YEAR).astype(np.int64)
+        
+        return frame[['result_id', 'play_id', 'player_id', 'game_id', 'year', 'start_time', 'vp_cents']]
+    
+    def refresh(self):
+        """Bring the in-memory copy up to date with the current data versions"""
+        versions = get_data_versions(RANKINGS_VERSION, RANKINGS_REWRITE_VERSION)
+        if versions == self.versions:
+            return
+        
+        with self.lock:
+            if versions == self.versions:
+                return
+            
+            if self.frame is None or versions[RANKINGS_REWRITE_VERSION] != self.versions[RANKINGS_REWRITE_VERSION]:
+                frame = self._load_rows()
+            else:
+                last_result_id = int(self.frame['result_id'].max()) if len(self.frame) else 0
+                new_rows = self._load_rows(after_result_id=last_result_id - RESULT_ID_OVERLAP)
+                # Appended rows aren't in result_id order, so compare against every id already loaded
+                new_rows = new_rows[~new_rows['result_id'].isin(self.frame['result_id'])]
+                frame = pd.concat([self.frame, new_rows], ignore_index=True) if len(new_rows) else self.frame
+            
+            player_names = dict(db.session.query(Player.player_id, Player.name).all())
+            game_names = dict(db.session.query(Game.game_id, Game.name).all())
+            
+            self.leaderboards = self._build_leaderboards(frame, player_names, game_names)
+            self.player_names = player_names
+            self.frame = frame
+            self.versions = versions
+    
+    def _build_leaderboards(self, frame, player_names, game_names):
+        base = _totals(frame, ['year', 'game_id', 'player_id'])
+        
+        def rollup(keys):
+            return _with_rates(base.groupby(keys, sort=False)[['total_plays', 'vp_cents']].sum().reset_index())
+        
+        def player_rows(cube):
+            return _player_rows(cube, player_names)
+        
+        overall = rollup(['player_id']).sort_values(
+            ['victory_rate', 'player_id'], ascending=[False, True]
+        )
+        
+        yearly = rollup(['year', 'player_id'])
+        yearly = yearly[yearly['year'] != NO_YEAR].sort_values(
+            ['year', 'victory_rate', 'player_id'], ascending=[True, False, True]
+        )
+        
+        per_game = rollup(['game_id', 'player_id'])
+        by_game = per_game.sort_values(
+            ['game_id', 'victory_rate', 'player_id'], ascending=[True, False, True]
+        )
+        by_player = per_game.sort_values(
+            ['player_id', 'victory_rate', 'game_id'], ascending=[True, False, True]
+        )
+        
+        player_games = {}
+        for player_id, cube in by_player.groupby('player_id', sort=False):
+            player_games[int(player_id)] = [{
+                'game_id': int(result.game_id),
+                'game_name': game_names.get(result.game_id),
+                'total_plays': int(result.total_plays),
+                'total_vps': float(result.total_vps),
+                'victory_rate': float(result.victory_rate)
+            } for result in cube.itertuples(index=False)]
+        
+        return {
+            'overall': player_rows(overall),
+            'yearly': {int(year): player_rows(cube) for year, cube in yearly.groupby('year', sort=False)},
+            'games': {int(game_id): player_rows(cube) for game_id, cube in by_game.groupby('game_id', sort=False)},
+            'player_games': player_games,
+            'game_names': game_names
+        }
+    
+    def overall_ranking(self):
+        self.refresh()
+        return list(self.leaderboards['overall'])
+    
+    def yearly_ranking(self, year):
+        self.refresh()
+        return list(self.leaderboards['yearly'].get(year, []))
+    
+    def game_ranking(self, game_id):
+        self.refresh()
+        return {
+            'game_id': game_id,
+            'game_name': self.leaderboards['game_names'].get(game_id, "Unknown Game"),
+            'rankings': list(self.leaderboards['games'].get(game_id, []))
+        }
+    
+    def game_rankings(self, game_ids=None, top=None):
+        self.refresh()
+        if game_ids is None:
+            game_ids = sorted(self.leaderboards['game_names'])
+        return [{
+            'game_id': game_id,
+            'game_name': self.leaderboards['game_names'].get(game_id, "Unknown Game"),
+            'rankings': self.leaderboards['games'].get(game_id, [])[:top]
+        } for game_id in game_ids]
+    
+    def player_game_ranking(self, player_id):
+        self.refresh()
+        return list(self.leaderboards['player_games'].get(player_id, []))
+    
+    def range_ranking(self, start=None, end=None):
+        """Leaderboard for plays with start_time in [start, end), computed from the frame"""
+        self.refresh()
+        frame = self.frame
+        mask = pd.Series(True, index=frame.index)
+        if start is not None:
+            mask &= frame['start_time'] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= frame['start_time'] < pd.Timestamp(end)
+        
+        cube = _with_rates(_totals(frame[mask], ['player_id']))
+        cube = cube.sort_values(['victory_rate', 'player_id'], ascending=[False, True])
+        return _player_rows(cube, self.player_names)
+
+def _totals(frame, keys):
+    """Distinct plays and victory point hundredths per group"""
+    # A player's play counts once however many result rows it has in that play
+    first_play = (~frame.duplicated(['play_id', 'player_id'])).astype(np.int64)
+    return frame.assign(first_play=first_play).groupby(keys, sort=False).agg(
+        total_plays=('first_play', 'sum'),
+        vp_cents=('vp_cents', 'sum')
+    ).reset_index()
+
+def _with_rates(cube):
+    cube['victory_rate'] = cube['vp_cents'] / (100 * cube['total_plays'])
+    cube['total_vps'] = cube['vp_cents'] / 100
+    return cube
+
+def _player_rows(cube, player_names):
+    """Turn a sorted per-player cube into the ranking dicts ranking_service returns"""
+    rows = []
+    for result in cube.itertuples(index=False):
+        if result.player_id not in player_names:
+            continue
+        rows.append({
+            'rank': len(rows) + 1,
+            'player_id': int(result.player_id),
+            'name': player_names[result.player_id],
+            'total_plays': int(result.total_plays),
+            'total_vps': float(result.total_vps),
+            'victory_rate': float(result.victory_rate)
+        })
+    return rows
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_ranking_engine():
+    """Get this worker's ranking engine, creating it on first use (shared by the worker's threads)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RankingEngine()
+    return _engine
@@ -2,7 +2,11 @@ from models.player import Player
 from models.game import Game
 from models.game_play import GamePlay
 from models.play_result import PlayResult
-from sqlalchemy import func, extract
+from models.player_ranking import PlayerRanking
+from sqlalchemy import func, extract, case, and_
+from sqlalchemy.orm import aliased
+from flask import current_app
+from utils.date_range import year_range
 from app import db
 from decimal import Decimal
 import math
@@ -44,29 +48,32 @@ def calculate_victory_points(player_ranks):
     
     return vp_map
 
+def ranking_engine_enabled():
+    """Whether leaderboards are served by the in-memory ranking engine"""
+    return current_app.config.get('RANKING_ENGINE') == 'memory'
+
+def _ranking_engine():
+    # Imported lazily so pandas/numpy are only needed when the engine is enabled
+    from services.ranking_engine import get_ranking_engine
+    return get_ranking_engine()
+
 def get_player_overall_ranking():
     """Get overall player ranking based on victory rate"""
-    # Subquery to get total number of plays for each player
-    plays_subquery = db.session.query(
-        PlayResult.player_id,
-        func.count(PlayResult.play_id.distinct()).label('total_plays')
-    ).group_by(PlayResult.player_id).subquery()
+    if ranking_engine_enabled():
+        return _ranking_engine().overall_ranking()
     
-    # Query for victory points and join with plays count
+    # Read the incrementally maintained leaderboard table instead of
+    # re-aggregating the whole play history
     results = db.session.query(
         Player.player_id,
         Player.name,
-        func.sum(PlayResult.victory_points).label('total_vps'),
-        plays_subquery.c.total_plays,
-        (func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays).label('victory_rate')
+        PlayerRanking.total_vps,
+        PlayerRanking.total_plays,
+        PlayerRanking.victory_rate
     ).join(
-        PlayResult, Player.player_id == PlayResult.player_id
-    ).join(
-        plays_subquery, Player.player_id == plays_subquery.c.player_id
-    ).group_by(
-        Player.player_id, Player.name, plays_subquery.c.total_plays
+        PlayerRanking, Player.player_id == PlayerRanking.player_id
     ).order_by(
-        func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays.desc()
+        PlayerRanking.victory_rate.desc(), Player.player_id
     ).all()
     
     rankings = []
@@ -82,40 +89,41 @@ def get_player_overall_ranking():
     
     return rankings
 
-def get_player_yearly_ranking(year):
-    """Get yearly player ranking based on victory rate"""
-    # Subquery to get game plays for the specified year
-    year_plays_subquery = db.session.query(
-        GamePlay.play_id
-    ).filter(
-        extract('year', GamePlay.start_time) == year
-    ).subquery()
+def get_player_range_ranking(start=None, end=None):
+    """
+    Get player ranking based on victory rate for plays in [start, end).
     
-    # Subquery to get total number of plays for each player in the specified year
-    plays_subquery = db.session.query(
-        PlayResult.player_id,
-        func.count(PlayResult.play_id.distinct()).label('total_plays')
-    ).filter(
-        PlayResult.play_id.in_(db.session.query(year_plays_subquery.c.play_id))
-    ).group_by(PlayResult.player_id).subquery()
+    Either bound may be None for an open range. The half-open timestamp
+    predicates can use the index on game_plays.start_time.
+    """
+    if ranking_engine_enabled():
+        return _ranking_engine().range_ranking(start, end)
+    
+    filters = []
+    if start is not None:
+        filters.append(GamePlay.start_time >= start)
+    if end is not None:
+        filters.append(GamePlay.start_time < end)
+    
+    total_plays = func.count(PlayResult.play_id.distinct())
+    total_vps = func.sum(PlayResult.victory_points)
     
-    # Query for victory points and join with plays count
     results = db.session.query(
         Player.player_id,
         Player.name,
-        func.sum(PlayResult.victory_points).label('total_vps'),
-        plays_subquery.c.total_plays,
-        (func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays).label('victory_rate')
+        total_vps.label('total_vps'),
+        total_plays.label('total_plays'),
+        (total_vps / total_plays).label('victory_rate')
     ).join(
         PlayResult, Player.player_id == PlayResult.player_id
-    ).filter(
-        PlayResult.play_id.in_(db.session.query(year_plays_subquery.c.play_id))
     ).join(
-        plays_subquery, Player.player_id == plays_subquery.c.player_id
+        GamePlay, PlayResult.play_id == GamePlay.play_id
+    ).filter(
+        *filters
     ).group_by(
-        Player.player_id, Player.name, plays_subquery.c.total_plays
+        Player.player_id, Player.name
     ).order_by(
-        func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays.desc()
+        (total_vps / total_plays).desc(), Player.player_id
     ).all()
     
     rankings = []
@@ -131,50 +139,69 @@ def get_player_yearly_ranking(year):
     
     return rankings
 
-def get_game_ranking(game_id):
-    """Get player ranking for a specific game"""
-    # Subquery to get game plays for the specified game
-    game_plays_subquery = db.session.query(
-        GamePlay.play_id
-    ).filter(
-        GamePlay.game_id == game_id
-    ).subquery()
+def get_player_yearly_ranking(year):
+    """Get yearly player ranking based on victory rate"""
+    if ranking_engine_enabled():
+        return _ranking_engine().yearly_ranking(year)
     
-    # Subquery to get total number of plays for each player in the specified game
-    plays_subquery = db.session.query(
-        PlayResult.player_id,
-        func.count(PlayResult.play_id.distinct()).label('total_plays')
-    ).filter(
-        PlayResult.play_id.in_(db.session.query(game_plays_subquery.c.play_id))
-    ).group_by(PlayResult.player_id).subquery()
+    start, end = year_range(year)
+    return get_player_range_ranking(start, end)
+
+def get_game_rankings(game_ids=None, top=None):
+    """
+    Get player rankings for several games at once (all games if game_ids is None).
     
-    # Query for victory points and join with plays count
-    results = db.session.query(
-        Player.player_id,
-        Player.name,
-        func.sum(PlayResult.victory_points).label('total_vps'),
-        plays_subquery.c.total_plays,
-        (func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays).label('victory_rate')
+    Every requested leaderboard comes from one grouped query ranked with
+    ROW_NUMBER() OVER (PARTITION BY game_id); top limits the players per game.
+    """
+    if ranking_engine_enabled():
+        return _ranking_engine().game_rankings(game_ids, top)
+    
+    totals = db.session.query(
+        GamePlay.game_id,
+        PlayResult.player_id,
+        func.count(PlayResult.play_id.distinct()).label('total_plays'),
+        func.sum(PlayResult.victory_points).label('total_vps')
     ).join(
-        PlayResult, Player.player_id == PlayResult.player_id
-    ).filter(
-        PlayResult.play_id.in_(db.session.query(game_plays_subquery.c.play_id))
+        PlayResult, GamePlay.play_id == PlayResult.play_id
+    )
+    if game_ids is not None:
+        totals = totals.filter(GamePlay.game_id.in_(game_ids))
+    totals = totals.group_by(GamePlay.game_id, PlayResult.player_id).subquery()
+    
+    victory_rate = totals.c.total_vps / totals.c.total_plays
+    
+    ranked = db.session.query(
+        totals.c.game_id,
+        totals.c.player_id,
+        totals.c.total_plays,
+        totals.c.total_vps,
+        victory_rate.label('victory_rate'),
+        func.row_number().over(
+            partition_by=totals.c.game_id,
+            order_by=(victory_rate.desc(), totals.c.player_id)
+        ).label('rank')
+    ).subquery()
+    
+    query = db.session.query(
+        ranked, Player.name
     ).join(
-        plays_subquery, Player.player_id == plays_subquery.c.player_id
-    ).group_by(
-        Player.player_id, Player.name, plays_subquery.c.total_plays
-    ).order_by(
-        func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays.desc()
-    ).all()
+        Player, Player.player_id == ranked.c.player_id
+    )
+    if top is not None:
+        query = query.filter(ranked.c.rank <= top)
+    results = query.order_by(ranked.c.game_id, ranked.c.rank).all()
     
-    # Get the game name
-    game = Game.query.get(game_id)
-    game_name = game.name if game else "Unknown Game"
+    # Get the game names
+    names = db.session.query(Game.game_id, Game.name)
+    if game_ids is not None:
+        names = names.filter(Game.game_id.in_(game_ids))
+    game_names = dict(names.all())
     
-    rankings = []
-    for i, result in enumerate(results):
-        rankings.append({
-            'rank': i + 1,
+    rankings = {}
+    for result in results:
+        rankings.setdefault(result.game_id, []).append({
+            'rank': result.rank,
             'player_id': result.player_id,
             'name': result.name,
             'total_plays': result.total_plays,
@@ -182,14 +209,24 @@ def get_game_ranking(game_id):
             'victory_rate': float(result.victory_rate)
         })
     
-    return {
+    return [{
         'game_id': game_id,
-        'game_name': game_name,
-        'rankings': rankings
-    }
+        'game_name': game_names.get(game_id, "Unknown Game"),
+        'rankings': rankings.get(game_id, [])
+    } for game_id in (game_ids if game_ids is not None else sorted(game_names))]
+
+def get_game_ranking(game_id):
+    """Get player ranking for a specific game"""
+    if ranking_engine_enabled():
+        return _ranking_engine().game_ranking(game_id)
+    
+    return get_game_rankings([game_id])[0]
 
 def get_player_game_ranking(player_id):
     """Get a player's performance across all games"""
+    if ranking_engine_enabled():
+        return _ranking_engine().player_game_ranking(player_id)
+    
     # Subquery to get total number of plays for each game by this player
     plays_subquery = db.session.query(
         GamePlay.game_id,
@@ -218,7 +255,7 @@ def get_player_game_ranking(player_id):
     ).group_by(
         Game.game_id, Game.name, plays_subquery.c.total_plays
     ).order_by(
-        func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays.desc()
+        (func.sum(PlayResult.victory_points) / plays_subquery.c.total_plays).desc()
     ).all()
     
     game_rankings = []
@@ -233,63 +270,102 @@ def get_player_game_ranking(player_id):
     
     return game_rankings
 
+def _ranked_player_totals(partition_column):
+    """
+    Per (partition, player) totals ranked by victory rate within each partition.
+    
+    Every player is ranked in a single set-based pass using ROW_NUMBER() OVER
+    (PARTITION BY ...), so callers can pick out one player's rows without
+    building each leaderboard separately. Ties are broken by player_id, so
+    ranks match the row positions on the leaderboards.
+    """
+    totals = db.session.query(
+        partition_column.label('partition_key'),
+        PlayResult.player_id,
+        func.count(PlayResult.play_id.distinct()).label('total_plays'),
+        func.sum(PlayResult.victory_points).label('total_vps')
+    ).join(
+        GamePlay, PlayResult.play_id == GamePlay.play_id
+    ).group_by(
+        partition_column, PlayResult.player_id
+    ).subquery()
+    
+    victory_rate = totals.c.total_vps / totals.c.total_plays
+    
+    return db.session.query(
+        totals.c.partition_key,
+        totals.c.player_id,
+        totals.c.total_plays,
+        totals.c.total_vps,
+        victory_rate.label('victory_rate'),
+        func.row_number().over(
+            partition_by=totals.c.partition_key,
+            order_by=(victory_rate.desc(), totals.c.player_id)
+        ).label('rank')
+    ).subquery()
+
 def get_player_stats(player_id):
     """Get comprehensive stats for a player"""
     player = Player.query.get(player_id)
     if not player:
         return {'error': 'Player not found'}
     
-    # Get overall stats
-    total_plays = db.session.query(func.count(PlayResult.play_id.distinct())).filter(
-        PlayResult.player_id == player_id
-    ).scalar() or 0
+    # Overall stats and rank come from the leaderboard table, ordered like get_player_overall_ranking()
+    overall_ranked = db.session.query(
+        PlayerRanking.player_id,
+        PlayerRanking.total_plays,
+        PlayerRanking.total_vps,
+        func.row_number().over(
+            order_by=(PlayerRanking.victory_rate.desc(), PlayerRanking.player_id)
+        ).label('rank')
+    ).subquery()
     
-    total_vps = db.session.query(func.sum(PlayResult.victory_points)).filter(
-        PlayResult.player_id == player_id
-    ).scalar() or 0
+    overall = db.session.query(overall_ranked).filter(
+        overall_ranked.c.player_id == player_id
+    ).first()
     
-    # Calculate victory rate
+    total_plays = overall.total_plays if overall else 0
+    total_vps = overall.total_vps if overall else 0
     victory_rate = float(total_vps) / total_plays if total_plays > 0 else 0
     
-    # Get player's rank in overall ranking
-    overall_ranking = get_player_overall_ranking()
-    player_rank = next((r['rank'] for r in overall_ranking if r['player_id'] == player_id), None)
-    
-    # Get game-specific stats
-    game_stats = get_player_game_ranking(player_id)
+    # Year-specific stats, for every year the player has plays in
+    yearly = _ranked_player_totals(extract('year', GamePlay.start_time))
+    year_results = db.session.query(yearly).filter(
+        yearly.c.player_id == player_id,
+        yearly.c.partition_key.isnot(None)
+    ).order_by(yearly.c.partition_key).all()
     
-    # Get year-specific stats
-    current_year = 2025  # This should be dynamically determined
-    years = range(2023, current_year + 1)  # Adjust the range as needed
     yearly_stats = {}
+    for result in year_results:
+        yearly_stats[int(result.partition_key)] = {
+            'total_plays': result.total_plays,
+            'total_vps': float(result.total_vps),
+            'victory_rate': float(result.total_vps) / result.total_plays,
+            'rank': result.rank
+        }
     
-    for year in years:
-        year_plays = db.session.query(func.count(PlayResult.play_id.distinct())).join(
-            GamePlay, PlayResult.play_id == GamePlay.play_id
-        ).filter(
-            PlayResult.player_id == player_id,
-            extract('year', GamePlay.start_time) == year
-        ).scalar() or 0
-        
-        if year_plays > 0:
-            year_vps = db.session.query(func.sum(PlayResult.victory_points)).join(
-                GamePlay, PlayResult.play_id == GamePlay.play_id
-            ).filter(
-                PlayResult.player_id == player_id,
-                extract('year', GamePlay.start_time) == year
-            ).scalar() or 0
-            
-            year_victory_rate = float(year_vps) / year_plays
-            
-            yearly_ranking = get_player_yearly_ranking(year)
-            player_year_rank = next((r['rank'] for r in yearly_ranking if r['player_id'] == player_id), None)
-            
-            yearly_stats[year] = {
-                'total_plays': year_plays,
-                'total_vps': float(year_vps),
-                'victory_rate': year_victory_rate,
-                'rank': player_year_rank
-            }
+    # Game-specific stats, including the player's rank among everyone who played the game
+    per_game = _ranked_player_totals(GamePlay.game_id)
+    game_results = db.session.query(
+        per_game, Game.name
+    ).join(
+        Game, Game.game_id == per_game.c.partition_key
+    ).filter(
+        per_game.c.player_id == player_id
+    ).order_by(
+        per_game.c.victory_rate.desc()
+    ).all()
+    
+    game_stats = []
+    for result in game_results:
+        game_stats.append({
+            'game_id': result.partition_key,
+            'game_name': result.name,
+            'total_plays': result.total_plays,
+            'total_vps': float(result.total_vps),
+            'victory_rate': float(result.victory_rate),
+            'rank': result.rank
+        })
     
     return {
         'player_id': player.player_id,
@@ -299,8 +375,65 @@ def get_player_stats(player_id):
             'total_plays': total_plays,
             'total_vps': float(total_vps),
             'victory_rate': victory_rate,
-            'rank': player_rank
+            'rank': overall.rank if overall else None
         },
         'yearly_stats': yearly_stats,
         'game_stats': game_stats
-    }
\ No newline at end of file
+    }
+
+def get_head_to_head(game_id=None, start=None, end=None):
+    """
+    Get player-vs-player records from a single self-join on play_results.
+    
+    Each pair is reported once with player_id < opponent_id; wins/losses are
+    from player_id's point of view (finishing ahead of / behind the opponent).
+    Optionally restricted to one game and/or plays in [start, end).
+    """
+    player_result = aliased(PlayResult)
+    opponent_result = aliased(PlayResult)
+    
+    query = db.session.query(
+        player_result.player_id.label('player_id'),
+        opponent_result.player_id.label('opponent_id'),
+        func.count(player_result.play_id.distinct()).label('shared_plays'),
+        func.sum(case((player_result.rank < opponent_result.rank, 1), else_=0)).label('wins'),
+        func.sum(case((player_result.rank > opponent_result.rank, 1), else_=0)).label('losses'),
+        func.sum(case((player_result.rank == opponent_result.rank, 1), else_=0)).label('ties')
+    ).join(
+        opponent_result, and_(
+            player_result.play_id == opponent_result.play_id,
+            player_result.player_id < opponent_result.player_id
+        )
+    )
+    
+    if game_id is not None or start is not None or end is not None:
+        query = query.join(GamePlay, player_result.play_id == GamePlay.play_id)
+        if game_id is not None:
+            query = query.filter(GamePlay.game_id == game_id)
+        if start is not None:
+            query = query.filter(GamePlay.start_time >= start)
+        if end is not None:
+            query = query.filter(GamePlay.start_time < end)
+    
+    results = query.group_by(
+        player_result.player_id, opponent_result.player_id
+    ).order_by(
+        player_result.player_id, opponent_result.player_id
+    ).all()
+    
+    player_ids = {result.player_id for result in results} | {result.opponent_id for result in results}
+    players = db.session.query(Player.player_id, Player.name).filter(
+        Player.player_id.in_(player_ids)
+    ).order_by(Player.player_id).all() if player_ids else []
+    
+    return {
+        'players': [{'player_id': player.player_id, 'name': player.name} for player in players],
+        'pairs': [{
+            'player_id': result.player_id,
+            'opponent_id': result.opponent_id,
+            'shared_plays': result.shared_plays,
+            'wins': int(result.wins or 0),
+            'losses': int(result.losses or 0),
+            'ties': int(result.ties or 0)
+        } for result in results]
+    }
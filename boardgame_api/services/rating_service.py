@@ -0,0 +1,132 @@
+from itertools import groupby
+from flask import current_app
+from sqlalchemy import func, or_, and_
+from models.player import Player
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from models.data_version import DataVersion
+from models.rating_checkpoint import RatingCheckpoint
+from services.cache_service import bump_data_version, get_data_version
+from utils.elo import new_state, apply_play, dump_state, load_state
+from app import db
+
+# Bumped whenever checkpoints are invalidated; checkpoint writers check it before saving
+RATINGS_VERSION = 'ratings'
+
+# Plays are replayed in start_time order; plays logged without one fall back to created_at
+play_time = func.coalesce(GamePlay.start_time, GamePlay.created_at)
+
+def invalidate_rating_checkpoints(*play_times):
+    """
+    Drop checkpoints that include any play at or after the earliest given time.
+    
+    Call this in the same transaction as a play insert, edit or delete, passing
+    both the old and the new play time for edits. Called with no times (e.g.
+    after deleting plays in bulk) it drops every checkpoint.
+    """
+    # Bumping first takes the version row lock, so a concurrent checkpoint
+    # writer either commits before this delete or sees the new version and backs off
+    bump_data_version(RATINGS_VERSION)
+    
+    if not play_times:
+        RatingCheckpoint.query.delete(synchronize_session=False)
+        return
+    
+    play_times = [t for t in play_times if t is not None]
+    if play_times:
+        RatingCheckpoint.query.filter(
+            RatingCheckpoint.play_time >= min(play_times)
+        ).delete(synchronize_session=False)
+
+def _plays_after(checkpoint):
+    """Yield (play_id, game_id, play_time, [(player_id, rank)]) after a checkpoint, in replay order"""
+    query = db.session.query(
+        GamePlay.play_id,
+        GamePlay.game_id,
+        play_time.label('play_time'),
+        PlayResult.player_id,
+        PlayResult.rank
+    ).join(
+        PlayResult, GamePlay.play_id == PlayResult.play_id
+    )
+    
+    if checkpoint:
+        query = query.filter(or_(
+            play_time > checkpoint.play_time,
+            and_(play_time == checkpoint.play_time, GamePlay.play_id > checkpoint.play_id)
+        ))
+    
+    rows = query.order_by(play_time, GamePlay.play_id).yield_per(1000)
+    for (play_id, game_id, time), results in groupby(rows, key=lambda row: (row.play_id, row.game_id, row.play_time)):
+        yield play_id, game_id, time, [(result.player_id, result.rank) for result in results]
+
+def get_current_ratings():
+    """
+    Get the current rating state, replaying only plays after the latest checkpoint.
+    
+    New checkpoints are stored every RATING_CHECKPOINT_INTERVAL replayed plays.
+    Returns (state, number of plays replayed).
+    """
+    interval = current_app.config['RATING_CHECKPOINT_INTERVAL']
+    ratings_version = get_data_version(RATINGS_VERSION)
+    
+    checkpoint = RatingCheckpoint.query.order_by(
+        RatingCheckpoint.play_time.desc(), RatingCheckpoint.play_id.desc()
+    ).first()
+    
+    state = load_state(checkpoint.state) if checkpoint else new_state()
+    position = checkpoint.plays_replayed if checkpoint else 0
+    
+    replayed = 0
+    new_checkpoints = []
+    for play_id, game_id, time, player_ranks in _plays_after(checkpoint):
+        apply_play(state, game_id, player_ranks)
+        replayed += 1
+        position += 1
+        
+        if position % interval == 0:
+            new_checkpoints.append(RatingCheckpoint(
+                play_time=time,
+                play_id=play_id,
+                plays_replayed=position,
+                state=dump_state(state)
+            ))
+    
+    if new_checkpoints:
+        # Only save if no play was written since the replay started
+        current_version = db.session.query(DataVersion.version).filter_by(
+            name=RATINGS_VERSION
+        ).with_for_update().scalar() or 0
+        
+        if current_version == ratings_version:
+            db.session.add_all(new_checkpoints)
+            db.session.commit()
+        else:
+            db.session.rollback()
+    
+    return state, replayed
+
+def get_rating_ranking(game_id=None):
+    """Get players ordered by Elo rating, overall or for one game"""
+    state, _ = get_current_ratings()
+    table = state['games'].get(game_id, {}) if game_id is not None else state['overall']
+    
+    names = dict(db.session.query(Player.player_id, Player.name).filter(
+        Player.player_id.in_(list(table.keys()))
+    ).all()) if table else {}
+    
+    ordered = sorted(table.items(), key=lambda item: (-item[1][0], item[0]))
+    
+    rankings = []
+    for player_id, (rating, plays) in ordered:
+        if player_id not in names:
+            continue
+        rankings.append({
+            'rank': len(rankings) + 1,
+            'player_id': player_id,
+            'name': names[player_id],
+            'rating': round(rating, 1),
+            'total_plays': plays
+        })
+    
+    return rankings
@@ -0,0 +1,82 @@
+from itertools import groupby
+from decimal import Decimal
+from sqlalchemy import update
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from services.ranking_service import calculate_victory_points
+from services.leaderboard_service import round_victory_points, rebuild_leaderboard
+from services.cache_service import bump_data_version, RANKINGS_VERSION, RANKINGS_REWRITE_VERSION, GAME_PLAYS_VERSION
+from app import db
+
+def select_play_ids(game_id=None, start=None, end=None, play_ids=None):
+    """Get the ids of plays to recompute, optionally filtered by game, [start, end) or explicit ids"""
+    query = db.session.query(GamePlay.play_id)
+    if game_id is not None:
+        query = query.filter(GamePlay.game_id == game_id)
+    if start is not None:
+        query = query.filter(GamePlay.start_time >= start)
+    if end is not None:
+        query = query.filter(GamePlay.start_time < end)
+    if play_ids:
+        query = query.filter(GamePlay.play_id.in_(play_ids))
+    return [play_id for play_id, in query.order_by(GamePlay.play_id).all()]
+
+def recompute_chunk(play_ids, dry_run=False, sample_size=5):
+    """
+    Recompute victory points for a chunk of plays with the current scoring rule.
+    
+    Changed rows are written with one executemany UPDATE by primary key and
+    committed. Returns a dict with rows scanned, rows changed, plays skipped
+    (results without a rank) and a few sample changes.
+    """
+    rows = db.session.query(
+        PlayResult.result_id,
+        PlayResult.play_id,
+        PlayResult.player_id,
+        PlayResult.rank,
+        PlayResult.victory_points
+    ).filter(
+        PlayResult.play_id.in_(play_ids)
+    ).order_by(PlayResult.play_id, PlayResult.result_id).all()
+    
+    updates = []
+    samples = []
+    skipped = 0
+    for play_id, results in groupby(rows, key=lambda row: row.play_id):
+        results = list(results)
+        if any(result.rank is None for result in results):
+            skipped += 1
+            continue
+        
+        victory_points_map = calculate_victory_points([(result.player_id, result.rank) for result in results])
+        
+        for result in results:
+            new_vps = round_victory_points(victory_points_map.get(result.player_id, 0))
+            old_vps = Decimal(result.victory_points) if result.victory_points is not None else None
+            if old_vps == new_vps:
+                continue
+            
+            updates.append({'result_id': result.result_id, 'victory_points': new_vps})
+            if len(samples) < sample_size:
+                samples.append({
+                    'result_id': result.result_id,
+                    'play_id': play_id,
+                    'player_id': result.player_id,
+                    'rank': result.rank,
+                    'old': float(old_vps) if old_vps is not None else None,
+                    'new': float(new_vps)
+                })
+    
+    if updates and not dry_run:
+        db.session.execute(update(PlayResult), updates)
+        db.session.commit()
+    else:
+        db.session.rollback()
+    
+    return {'scanned': len(rows), 'changed': len(updates), 'skipped_plays': skipped, 'samples': samples}
+
+def finish_recompute():
+    """Bring derived data back in line after victory points were rewritten"""
+    rebuild_leaderboard()
+    bump_data_version(RANKINGS_VERSION, RANKINGS_REWRITE_VERSION, GAME_PLAYS_VERSION)
+    db.session.commit()
@@ -0,0 +1,62 @@
+"""
+gzip/brotli response compression negotiated from Accept-Encoding.
+
+Brotli is used when the brotli package is installed and the client accepts
+it; otherwise gzip. Only JSON and text responses of at least
+COMPRESS_MIN_SIZE bytes are compressed, and streamed responses (such as the
+NDJSON export) are left alone.
+"""
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html', 'text/csv')
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def choose_encoding():
+    """Best content coding the client accepts for this request, or None"""
+    return request.accept_encodings.best_match(supported_encodings())
+
+def compress(body, encoding):
+    """Compress bytes with the given content coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=current_app.config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(body, compresslevel=current_app.config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+def should_compress(response):
+    """Whether a finished response is worth compressing"""
+    return (
+        response.status_code == 200
+        and not response.is_streamed
+        and not response.direct_passthrough
+        and 'Content-Encoding' not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        and (response.content_length or 0) >= current_app.config['COMPRESS_MIN_SIZE']
+    )
+
+def set_encoded_body(response, body, encoding):
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def compress_response(response):
+    """after_request hook compressing eligible responses in place"""
+    if request.method == 'HEAD' or not should_compress(response):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+    return set_encoded_body(response, compress(response.get_data(), encoding), encoding)
+
+def init_compression(app):
+    """Compress responses of every blueprint"""
+    app.after_request(compress_response)
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, MAXYEAR
+
+# Rolling windows, in days, accepted as ?preset= values
+ROLLING_PRESETS = {
+    'last-30-days': 30,
+    'last-90-days': 90,
+    'last-365-days': 365,
+}
+SEASON_PRESET = 'this-season'
+
+# Years year_range can cover; the year after MAX_YEAR must still be a valid datetime
+MIN_YEAR = 1
+MAX_YEAR = MAXYEAR - 1
+
+def parse_datetime(value):
+    """Parse an ISO date or datetime query argument; None if empty"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value}")
+
+def year_range(year):
+    """Half-open [start, end) range covering a calendar year (ValueError outside MIN_YEAR..MAX_YEAR)"""
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        raise ValueError(f"year must be between {MIN_YEAR} and {MAX_YEAR}")
+    return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+
+def season_range(now):
+    """Half-open range covering the calendar quarter containing now"""
+    first_month = 3 * ((now.month - 1) // 3) + 1
+    start = datetime(now.year, first_month, 1)
+    end = datetime(now.year + 1, 1, 1) if first_month == 10 else datetime(now.year, first_month + 3, 1)
+    return start, end
+
+def preset_range(preset, now=None):
+    """
+    Resolve a named preset to a half-open (start, end) range.
+    
+    Rolling windows start at midnight so the range (and any cache key built
+    from it) only changes once a day; their end is left open.
+    """
+    now = now or datetime.utcnow()
+    if preset in ROLLING_PRESETS:
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=ROLLING_PRESETS[preset]), None
+    if preset == SEASON_PRESET:
+        return season_range(now)
+    raise ValueError(f"Unknown preset: {preset}")
+
+def parse_range_args(args):
+    """
+    Read a half-open date range from request args: either ?preset= or ?from=&to=.
+    
+    Raises ValueError on malformed input.
+    """
+    preset = args.get('preset')
+    if preset:
+        return preset_range(preset)
+    
+    start = parse_datetime(args.get('from'))
+    end = parse_datetime(args.get('to'))
+    if start and end and start >= end:
+        raise ValueError("'from' must be before 'to'")
+    return start, end
@@ -0,0 +1,68 @@
+"""
+Multiplayer Elo ratings.
+
+A play with n players is scored as n - 1 pairwise games per player: finishing
+ahead of an opponent counts as a win, the same rank as a draw. The K factor
+is divided by n - 1 so a single play moves a rating about as much as one
+two-player game would.
+"""
+import json
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32.0
+
+def new_state():
+    """Empty rating state: overall ratings plus one table per game"""
+    return {'overall': {}, 'games': {}}
+
+def expected_score(rating, opponent_rating):
+    """Probability that a player with `rating` beats one with `opponent_rating`"""
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - rating) / 400.0))
+
+def rate_play(table, player_ranks, k_factor=K_FACTOR):
+    """
+    Update a {player_id: [rating, plays]} table in place for one play.
+    
+    player_ranks is a list of (player_id, rank); players without a rank are ignored.
+    """
+    ranked = [(player_id, rank) for player_id, rank in player_ranks if rank is not None]
+    if len(ranked) < 2:
+        return
+    
+    before = {player_id: table.get(player_id, [DEFAULT_RATING, 0])[0] for player_id, _ in ranked}
+    k = k_factor / (len(ranked) - 1)
+    
+    for player_id, rank in ranked:
+        delta = 0.0
+        for opponent_id, opponent_rank in ranked:
+            if opponent_id == player_id:
+                continue
+            if rank < opponent_rank:
+                actual = 1.0
+            elif rank == opponent_rank:
+                actual = 0.5
+            else:
+                actual = 0.0
+            delta += actual - expected_score(before[player_id], before[opponent_id])
+        
+        plays = table.get(player_id, [DEFAULT_RATING, 0])[1]
+        table[player_id] = [before[player_id] + k * delta, plays + 1]
+
+def apply_play(state, game_id, player_ranks):
+    """Apply one play to both the overall and the per-game ratings"""
+    rate_play(state['overall'], player_ranks)
+    rate_play(state['games'].setdefault(game_id, {}), player_ranks)
+
+def dump_state(state):
+    return json.dumps(state)
+
+def load_state(data):
+    """Inverse of dump_state; JSON object keys come back as strings"""
+    raw = json.loads(data)
+    return {
+        'overall': {int(player_id): entry for player_id, entry in raw['overall'].items()},
+        'games': {
+            int(game_id): {int(player_id): entry for player_id, entry in table.items()}
+            for game_id, table in raw['games'].items()
+        }
+    }
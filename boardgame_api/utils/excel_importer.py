@@ -6,6 +6,11 @@ from models.player import Player
 from models.game_play import GamePlay
 from models.play_result import PlayResult
 from services.ranking_service import calculate_victory_points
+from services.leaderboard_service import apply_results_to_leaderboard
+from services.cache_service import (
+    bump_data_version, RANKINGS_VERSION, GAMES_VERSION, PLAYERS_VERSION, GAME_PLAYS_VERSION
+)
+from services.rating_service import invalidate_rating_checkpoints
 
 def import_from_excel(file_path, game_id):
     """
@@ -131,6 +136,7 @@ def import_from_excel(file_path, game_id):
                 victory_points_map = calculate_victory_points(player_ranks)
                 
                 # Create result entries
+                results = []
                 for player_id, rank in player_ranks:
                     result = PlayResult(
                         play_id=game_play.play_id,
@@ -141,7 +147,11 @@ def import_from_excel(file_path, game_id):
                         notes=None
                     )
                     db.session.add(result)
+                    results.append(result)
                 
+                apply_results_to_leaderboard(results)
+                invalidate_rating_checkpoints(game_play.start_time or game_play.created_at)
+                bump_data_version(RANKINGS_VERSION, GAMES_VERSION, PLAYERS_VERSION, GAME_PLAYS_VERSION)
                 db.session.commit()
                 print(f"Imported game play #{row['No']}")
                 
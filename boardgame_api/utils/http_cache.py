@@ -0,0 +1,67 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import request, make_response, current_app
+from services.cache_service import get_version_stamps, get_cached_response, store_cached_response
+from utils.compression import choose_encoding, compress, should_compress, set_encoded_body
+
+def version_etag(stamps, extra=''):
+    """Weak ETag for a set of data version stamps"""
+    key = '|'.join(
+        f"{name}:{version}:{updated_at.isoformat() if updated_at else ''}"
+        for name, (version, updated_at) in sorted(stamps.items())
+    )
+    return hashlib.sha1(f"{key}|{extra}".encode()).hexdigest()[:20]
+
+def conditional(*families, vary=None):
+    """
+    Serve a GET view with ETag/Last-Modified headers from the given data versions.
+    
+    A request whose If-None-Match (or If-Modified-Since) still matches gets a
+    304 before the view runs, so no query or serialization happens. `vary`
+    may return a string folded into the ETag for responses that also change
+    without a write, such as rolling date presets.
+    
+    Compressed bodies are cached under (ETag, encoding, URL), so repeat
+    requests from clients without the ETag skip both the view and compression.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            stamps = get_version_stamps(*families)
+            etag = version_etag(stamps, vary() if vary else '')
+            modified = [updated_at for _, updated_at in stamps.values() if updated_at]
+            last_modified = max(modified).replace(tzinfo=timezone.utc, microsecond=0) if modified else None
+            
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and last_modified <= since)
+            
+            encoding = None if request.method == 'HEAD' else choose_encoding()
+            cache_key = f"{etag}|{encoding}|{request.full_path}"
+            cached = None if not_modified or encoding is None else get_cached_response(cache_key)
+            
+            if not_modified:
+                response = make_response('', 304)
+            elif cached is not None:
+                body, mimetype = cached
+                response = set_encoded_body(current_app.response_class(mimetype=mimetype), body, encoding)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if encoding is not None and should_compress(response):
+                    set_encoded_body(response, compress(response.get_data(), encoding), encoding)
+                    store_cached_response(cache_key, response.get_data(), response.mimetype)
+            
+            response.vary.add('Accept-Encoding')
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Let browsers keep the body but revalidate on every use
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
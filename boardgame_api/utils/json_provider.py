@@ -0,0 +1,41 @@
+"""
+orjson-backed Flask JSON provider.
+
+Registered on the app when orjson is installed; otherwise Flask's default
+provider is kept. Values serialize the same way as with the default
+provider (dates as HTTP dates, Decimal and UUID as strings, sorted keys),
+except that non-ASCII text is emitted as UTF-8 rather than \\u escapes.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Drop-in replacement for DefaultJSONProvider using orjson"""
+    
+    def _options(self, indent=False):
+        # Datetimes are passed through to default() so they keep Flask's HTTP date format
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options(kwargs.get('indent'))).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def init_json_provider(app):
+    """Use orjson for request and response JSON if it is installed"""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,191 @@
+"""
+Column-tuple serializers for list endpoints.
+
+Each *_FIELDS spec lists (key, column, convert) in the same order and with the
+same value types as the matching model's to_dict(), so list endpoints can
+select plain column tuples instead of hydrating ORM objects. Keep the two in
+sync when adding columns.
+"""
+from itertools import groupby
+from models.game import Game
+from models.player import Player
+from models.game_play import GamePlay
+from models.play_result import PlayResult
+from app import db
+
+# Upper bound on ids per IN (...) when loading results for a set of plays
+RESULT_BATCH_SIZE = 1000
+
+def iso(value):
+    return value.isoformat() if value else None
+
+def to_float(value):
+    return float(value) if value is not None else None
+
+GAME_FIELDS = (
+    ('game_id', Game.game_id, None),
+    ('name', Game.name, None),
+    ('description', Game.description, None),
+    ('release_year', Game.release_year, None),
+    ('image_url', Game.image_url, None),
+    ('min_players', Game.min_players, None),
+    ('max_players', Game.max_players, None),
+    ('avg_play_time', Game.avg_play_time, None),
+    ('bgg_id', Game.bgg_id, None),
+    ('publisher', Game.publisher, None),
+    ('complexity', Game.complexity, None),
+    ('comment', Game.comment, None),
+    ('created_at', Game.created_at, iso),
+)
+
+PLAYER_FIELDS = (
+    ('player_id', Player.player_id, None),
+    ('name', Player.name, None),
+    ('alias', Player.alias, None),
+    ('created_at', Player.created_at, iso),
+)
+
+GAME_PLAY_FIELDS = (
+    ('play_id', GamePlay.play_id, None),
+    ('game_id', GamePlay.game_id, None),
+    ('start_time', GamePlay.start_time, iso),
+    ('end_time', GamePlay.end_time, iso),
+    ('duration', GamePlay.duration, None),
+    ('mode', GamePlay.mode, None),
+    ('notes', GamePlay.notes, None),
+    ('created_at', GamePlay.created_at, iso),
+)
+
+# Named ?fields= presets
+GAME_FIELD_PRESETS = {
+    # Everything the game library grid and game pickers need, without the large text columns
+    'compact': {'game_id', 'name', 'release_year', 'image_url', 'min_players', 'max_players',
+                'avg_play_time', 'bgg_id', 'publisher', 'complexity'},
+}
+
+PLAY_RESULT_FIELDS = (
+    ('result_id', PlayResult.result_id, None),
+    ('play_id', PlayResult.play_id, None),
+    ('player_id', PlayResult.player_id, None),
+    ('score', PlayResult.score, None),
+    ('rank', PlayResult.rank, None),
+    ('victory_points', PlayResult.victory_points, to_float),
+    ('notes', PlayResult.notes, None),
+    ('created_at', PlayResult.created_at, iso),
+)
+
+def columns(fields):
+    return [column for _, column, _ in fields]
+
+def field_names(fields):
+    return [key for key, _, _ in fields]
+
+def parse_fields(value, allowed, presets=None, always=()):
+    """
+    Resolve a ?fields=a,b,c argument (or a preset name) to a set of field names.
+    
+    Returns None, meaning all fields, when value is empty. Fields in `always`
+    are always included. Raises ValueError on unknown names.
+    """
+    if not value:
+        return None
+    presets = presets or {}
+    if value in presets:
+        return set(presets[value]) | set(always)
+    
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return names | set(always)
+
+def select_fields(fields, only=None):
+    """Narrow a field spec to the names in `only` (all fields if None)"""
+    return fields if only is None else tuple(field for field in fields if field[0] in only)
+
+def row_to_dict(fields, row):
+    """Build a to_dict()-shaped dict from a row selected with columns(fields)"""
+    return {
+        key: convert(value) if convert and value is not None else value
+        for (key, _, convert), value in zip(fields, row)
+    }
+
+def rows_to_dicts(fields, rows):
+    return [row_to_dict(fields, row) for row in rows]
+
+def game_dicts(query=None, only=None):
+    """Serialize games (all, or those matched by a Game query) like Game.to_dict(), optionally only some fields"""
+    query = query if query is not None else Game.query
+    fields = select_fields(GAME_FIELDS, only)
+    return rows_to_dicts(fields, query.with_entities(*columns(fields)))
+
+def player_dicts(query=None, only=None):
+    """Serialize players (all, or those matched by a Player query) like Player.to_dict(), optionally only some fields"""
+    query = query if query is not None else Player.query
+    fields = select_fields(PLAYER_FIELDS, only)
+    return rows_to_dicts(fields, query.with_entities(*columns(fields)))
+
+def _results_by_play(play_ids, expand=()):
+    """Serialized results for the given plays, grouped by play_id in result_id order"""
+    fields = PLAY_RESULT_FIELDS
+    player_columns = [Player.player_id, Player.name, Player.alias] if 'players' in expand else []
+    
+    results = {}
+    for offset in range(0, len(play_ids), RESULT_BATCH_SIZE):
+        query = db.session.query(*columns(fields), *player_columns).filter(
+            PlayResult.play_id.in_(play_ids[offset:offset + RESULT_BATCH_SIZE])
+        )
+        if player_columns:
+            query = query.outerjoin(Player, PlayResult.player_id == Player.player_id)
+        rows = query.order_by(PlayResult.play_id, PlayResult.result_id).all()
+        
+        for play_id, play_rows in groupby(rows, key=lambda row: row.play_id):
+            serialized = []
+            for row in play_rows:
+                result = row_to_dict(fields, row)
+                if player_columns:
+                    player_id, name, alias = row[len(fields):]
+                    result['player'] = {
+                        'player_id': player_id, 'name': name, 'alias': alias
+                    } if player_id is not None else None
+                serialized.append(result)
+            results[play_id] = serialized
+    return results
+
+def game_play_dicts(query=None, expand=(), only=None):
+    """
+    Serialize plays matched by a GamePlay query like GamePlay.to_dict(expand).
+    
+    Plays come from one query, their results from one more per
+    RESULT_BATCH_SIZE plays and, when expanding 'game', game names from one more.
+    `only` limits the output to some fields ('results' being one of them);
+    results are not queried at all when they are left out.
+    """
+    query = query if query is not None else GamePlay.query
+    with_results = only is None or 'results' in only
+    # Keys needed to attach results and games, selected even when not returned
+    needed = {'play_id', 'game_id'}
+    fields = select_fields(GAME_PLAY_FIELDS, None if only is None else only | needed)
+    rows = query.with_entities(*columns(fields)).all()
+    
+    results = _results_by_play([row.play_id for row in rows], expand) if with_results else {}
+    
+    game_names = {}
+    if 'game' in expand:
+        game_ids = list({row.game_id for row in rows})
+        game_names = dict(db.session.query(Game.game_id, Game.name).filter(Game.game_id.in_(game_ids)).all())
+    
+    plays = []
+    for row in rows:
+        play = row_to_dict(fields, row)
+        if with_results:
+            play['results'] = results.get(row.play_id, [])
+        if 'game' in expand:
+            play['game'] = {
+                'game_id': row.game_id, 'name': game_names[row.game_id]
+            } if row.game_id in game_names else None
+        if only is not None:
+            for key in needed - only:
+                del play[key]
+        plays.append(play)
+    return plays
@@ -0,0 +1,7 @@
+import apiClient from './index';
+import { DashboardSummary, DashboardFilters } from '../models/Dashboard';
+
+export const getDashboard = async (filters: DashboardFilters = {}): Promise<DashboardSummary> => {
+  const response = await apiClient.get<DashboardSummary>('/dashboard', { params: filters });
+  return response.data;
+};
\ No newline at end of file
@@ -1,8 +1,9 @@
 import apiClient from './index';
 import { Game } from '../models/Game';
 
-export const getGames = async (): Promise<Game[]> => {
-  const response = await apiClient.get<Game[]>('/games');
+// The compact projection leaves out description and comment; pass '' for every field
+export const getGames = async (fields: string = 'compact'): Promise<Game[]> => {
+  const response = await apiClient.get<Game[]>('/games', { params: { fields: fields || undefined } });
   return response.data;
 };
 
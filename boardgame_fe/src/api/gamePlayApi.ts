@@ -1,13 +1,18 @@
 import apiClient from './index';
-import { Play } from '../models/Play';
+import { Play, PlayPage, PlayFilters } from '../models/Play';
 
 export const getGamePlays = async (): Promise<Play[]> => {
   const response = await apiClient.get<Play[]>('/game-plays');
   return response.data;
 };
 
-export const getGamePlay = async (playId: number): Promise<Play> => {
-  const response = await apiClient.get<Play>(`/game-plays/${playId}`);
+export const getGamePlaysPage = async (filters: PlayFilters = {}): Promise<PlayPage> => {
+  const response = await apiClient.get<PlayPage>('/game-plays', { params: { limit: 50, ...filters } });
+  return response.data;
+};
+
+export const getGamePlay = async (playId: number, expand?: string): Promise<Play> => {
+  const response = await apiClient.get<Play>(`/game-plays/${playId}`, { params: { expand } });
   return response.data;
 };
 
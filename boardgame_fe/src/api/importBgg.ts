@@ -1,24 +1,47 @@
 import apiClient from './index';
-import { Game } from '../models/Game';
+import { Job, ImportedGame } from '../models/Job';
 
 export interface BGGImportResponse {
-  addedGames: Game[];
+  addedGames: ImportedGame[];
   errors: string[];
 }
 
-export const importBGGCollection = async (username: string): Promise<BGGImportResponse> => {
+const POLL_INTERVAL_MS = 1000;
+
+export const getJob = async <TResult = unknown>(jobId: number): Promise<Job<TResult>> => {
+  const response = await apiClient.get<Job<TResult>>(`/jobs/${jobId}`);
+  return response.data;
+};
+
+// Starts a background import and polls it until it finishes, reporting progress on the way
+export const importBGGCollection = async (
+  username: string,
+  onProgress?: (job: Job<ImportedGame>) => void
+): Promise<BGGImportResponse> => {
   try {
     if (!username) {
       throw new Error('BGG username is required');
     }
 
-    const response = await apiClient.post<BGGImportResponse>('/games/import-bgg', { username });
+    const response = await apiClient.post<Job<ImportedGame>>('/games/import-bgg', { username });
     
     if (!response.data) {
       throw new Error('No data received from BGG import');
     }
 
-    return response.data;
+    let job = response.data;
+    while (job.status === 'queued' || job.status === 'running') {
+      onProgress?.(job);
+      await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+      job = await getJob<ImportedGame>(job.job_id);
+    }
+    onProgress?.(job);
+
+    if (job.status === 'failed' && job.result.length === 0) {
+      throw new Error(job.errors[job.errors.length - 1] || 'Import job failed');
+    }
+
+    return { addedGames: job.result, errors: job.errors };
   } catch (error) {
     if (error instanceof Error) {
       throw new Error(`Failed to import BGG collection: ${error.message}`);
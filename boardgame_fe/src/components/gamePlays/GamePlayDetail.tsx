@@ -4,11 +4,7 @@ import Card from "../common/Card";
 import LoadingSpinner from "../common/LoadingSpinner";
 import ErrorMessage from "../common/ErrorMessage";
 import { getGamePlay } from "../../api/gamePlayApi";
-import { getGame } from "../../api/gameApi";
-import { getPlayer } from "../../api/playerApi";
-import { Player } from "../../models/Player";
 import { Play } from "../../models/Play";
-import { Game } from "../../models/Game";
 import { PencilIcon } from "@heroicons/react/24/outline";
 
 const GamePlayDetail: React.FC = () => {
@@ -16,34 +12,13 @@ const GamePlayDetail: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [gamePlay, setGamePlay] = useState<Play | null>(null);
-  const [game, setGame] = useState<Game | null>(null);
-  const [players, setPlayers] = useState<Record<number, Player>>({});
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const playData = await getGamePlay(Number(id));
+        // The game and result players come embedded in the one response
+        const playData = await getGamePlay(Number(id), "game,players");
         setGamePlay(playData);
-
-        if (playData?.game_id) {
-          const gameData = await getGame(playData.game_id);
-          setGame(gameData);
-        }
-
-        if (playData?.results) {
-          const playerPromises = playData.results.map((result) =>
-            getPlayer(result.player_id)
-          );
-          const playerData = await Promise.all(playerPromises);
-          const playerMap = playerData.reduce((acc, player) => {
-            if (player) {
-              acc[player.player_id] = player;
-            }
-            return acc;
-          }, {} as Record<number, Player>);
-          setPlayers(playerMap);
-        }
-
         setLoading(false);
       } catch (err) {
         console.error("Error fetching game play:", err);
@@ -63,6 +38,8 @@ const GamePlayDetail: React.FC = () => {
   if (error) return <ErrorMessage message={error} />;
   if (!gamePlay) return <ErrorMessage message="Game play not found" />;
 
+  const game = gamePlay.game;
+
   return (
     <div className="container mx-auto px-4 py-8">
       <div className="flex justify-between items-center mb-6">
@@ -132,7 +109,7 @@ const GamePlayDetail: React.FC = () => {
                       to={`/players/${result.player_id}`}
                       className="font-medium hover:text-blue-600"
                     >
-                      {players[result.player_id]?.name || "Unknown Player"}
+                      {result.player?.name || "Unknown Player"}
                     </Link>
                     <span className="text-sm text-gray-600">
                       Rank: {result.rank}
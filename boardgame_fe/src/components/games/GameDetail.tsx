@@ -10,14 +10,14 @@ import {
 } from "../../utils/gradeCalculator";
 import { PlusIcon } from "@heroicons/react/24/outline";
 import { cleanDescription } from "../../utils/textUtils";
-import { usePlayers, useGamePlays, useGameDetail } from '../../hooks';
+import { usePlayers, useAllGamePlays, useGameDetail } from '../../hooks';
 
 const GameDetail: React.FC = () => {
   const { id } = useParams<{ id: string }>();
   const [isDescriptionExpanded, setIsDescriptionExpanded] = useState(false);
 
   const { data: game, isLoading: gameLoading, error: gameError } = useGameDetail(Number(id));
-  const { data: allGamePlays = [], isLoading: playsLoading } = useGamePlays();
+  const { data: allGamePlays = [], isLoading: playsLoading } = useAllGamePlays();
   const { data: players = [], isLoading: playersLoading } = usePlayers();
 
   const gamePlays = useMemo(() => {
@@ -10,7 +10,7 @@ import {
   calculateOverallPlayerStats,
   getPlayerCount,
 } from "../../utils/gradeCalculator";
-import { useGames, useGamePlays, usePlayerDetail } from "../../hooks";
+import { useGames, useAllGamePlays, usePlayerDetail } from "../../hooks";
 
 const PlayerDetail: React.FC = () => {
   const { id } = useParams<{ id: string }>();
@@ -23,7 +23,7 @@ const PlayerDetail: React.FC = () => {
 
   const { data: games = [], isLoading: gamesLoading } = useGames();
 
-  const { data: allGamePlays = [], isLoading: playsLoading } = useGamePlays();
+  const { data: allGamePlays = [], isLoading: playsLoading } = useAllGamePlays();
 
   const gamePlays = useMemo(() => {
     return allGamePlays.filter(
@@ -1,9 +1,24 @@
-import { useQuery } from '@tanstack/react-query';
-import { getGamePlays } from '../api/gamePlayApi';
+import { keepPreviousData, useInfiniteQuery, useQuery } from '@tanstack/react-query';
+import { getGamePlays, getGamePlaysPage } from '../api/gamePlayApi';
+import { PlayFilters } from '../models/Play';
 
-export const useGamePlays = () => {
+// One page at a time, newest first; fetchNextPage() follows next_cursor
+export const useGamePlays = (filters: PlayFilters = {}) => {
+  return useInfiniteQuery({
+    queryKey: ['gamePlays', 'pages', filters],
+    queryFn: ({ pageParam }) => getGamePlaysPage({ ...filters, cursor: pageParam }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    // Keep showing the current list while a changed filter loads
+    placeholderData: keepPreviousData,
+    staleTime: 5 * 60 * 1000,
+  });
+};
+
+// The whole play history, for pages that compute stats over every play
+export const useAllGamePlays = () => {
   return useQuery({
-    queryKey: ['gamePlays'],
+    queryKey: ['gamePlays', 'all'],
     queryFn: getGamePlays,
     staleTime: 5 * 60 * 1000,
   });
@@ -4,7 +4,7 @@ import { getGames, getGame } from "../api/gameApi";
 export const useGames = () => {
   return useQuery({
     queryKey: ["games"],
-    queryFn: getGames,
+    queryFn: () => getGames(),
     staleTime: 5 * 60 * 1000, // 5 minutes
   });
 };
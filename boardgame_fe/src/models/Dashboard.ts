@@ -0,0 +1,37 @@
+import { Play } from "./Play";
+
+// Same shape as gradeCalculator's PlayerGameStats
+export interface PlayerRankingEntry {
+    player_id: number;
+    player_name: string;
+    total_plays: number;
+    grade_point: number;
+}
+
+export interface WinRateEntry {
+    player_id: number;
+    name: string;
+    total_plays: number;
+    wins: number;
+    win_rate: number;
+}
+
+export interface DashboardSummary {
+    totals: {
+        games: number;
+        players: number;
+        plays: number;
+        games_played: number;
+        average_duration: number;
+    };
+    recent_plays: Play[];
+    player_rankings: PlayerRankingEntry[];
+    win_rates: WinRateEntry[];
+    years: number[];
+}
+
+export interface DashboardFilters {
+    year?: number;
+    min_plays?: number;
+    top?: number;
+}
\ No newline at end of file
@@ -0,0 +1,20 @@
+import { Game } from "./Game";
+
+export type JobStatus = "queued" | "running" | "succeeded" | "failed";
+
+export interface Job<TResult = unknown> {
+    job_id: number;
+    kind: string;
+    status: JobStatus;
+    params: Record<string, unknown>;
+    progress: number;
+    total: number | null;
+    result: TResult[];
+    errors: string[];
+    attempts: number;
+    created_at: string | null;
+    started_at: string | null;
+    finished_at: string | null;
+}
+
+export type ImportedGame = Pick<Game, "game_id" | "name" | "bgg_id">;
\ No newline at end of file
@@ -11,7 +11,8 @@ export interface Play {
     notes?: string;
     created_at?: string;
     results: PlayResult[];
-    game?: Game;
+    // Embedded with ?expand=game
+    game?: Pick<Game, "game_id" | "name">;
 }
 
 export interface PlayResult {
@@ -23,5 +24,22 @@ export interface PlayResult {
     victory_points?: number;
     notes?: string;
     created_at?: string;
-    player?: Player;
-}
\ No newline at end of file
+    // Embedded with ?expand=players
+    player?: Pick<Player, "player_id" | "name" | "alias">;
+}
+
+export interface PlayPage {
+    items: Play[];
+    next_cursor: string | null;
+}
+
+export interface PlayFilters {
+    limit?: number;
+    cursor?: string;
+    game_id?: number;
+    player_id?: number;
+    mode?: string;
+    from?: string;
+    to?: string;
+    expand?: string;
+}
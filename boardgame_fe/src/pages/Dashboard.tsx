@@ -1,12 +1,10 @@
-import React, { useState, useMemo } from "react";
-import { useQuery } from "@tanstack/react-query";
+import React, { useState } from "react";
+import { useQuery, keepPreviousData } from "@tanstack/react-query";
 import { Link } from "react-router-dom";
 import Card from "../components/common/Card";
 import LoadingSpinner from "../components/common/LoadingSpinner";
 import ErrorMessage from "../components/common/ErrorMessage";
-import { getGamePlays } from "../api/gamePlayApi";
-import { getPlayers } from "../api/playerApi";
-import { getGames } from "../api/gameApi";
+import { getDashboard } from "../api/dashboardApi";
 import {
   PlusIcon,
   DocumentTextIcon,
@@ -14,162 +12,42 @@ import {
   UserGroupIcon,
   PlayIcon,
 } from "@heroicons/react/24/outline";
-import {
-  calculateOverallPlayerStats,
-  getGradeLabel,
-  getGradeColor,
-} from "../utils/gradeCalculator";
-import { Player } from "../models/Player";
+import { getGradeLabel, getGradeColor } from "../utils/gradeCalculator";
 import { Play } from "../models/Play";
 
+const getWinnerName = (play: Play): string =>
+  play.results.find((result) => result.rank === 1)?.player?.name ||
+  "Unknown Player";
+
 const Dashboard: React.FC = () => {
-  const [error, setError] = useState<string | null>(null);
   const [selectedYear, setSelectedYear] = useState<number | undefined>(
     undefined
   );
   const [minPlays, setMinPlays] = useState<number>(10);
-  const { data: games = [], isLoading: gamesLoading } = useQuery({
-    queryKey: ["games"],
-    queryFn: getGames,
-  });
 
-  const { data: players = [], isLoading: playersLoading } = useQuery({
-    queryKey: ["players"],
-    queryFn: getPlayers,
+  // One summary request replaces fetching every game, player and play
+  const { data: dashboard, isLoading, error } = useQuery({
+    queryKey: ["dashboard", selectedYear, minPlays],
+    queryFn: () =>
+      getDashboard({
+        year: selectedYear,
+        min_plays: minPlays,
+      }),
+    placeholderData: keepPreviousData,
   });
 
-  const { data: gamePlays = [], isLoading: playsLoading } = useQuery({
-    queryKey: ["gamePlays"],
-    queryFn: getGamePlays,
-  });
-
-  const stats = useMemo(() => {
-    try {
-      if (!games.length || !players.length || !gamePlays.length) {
-        return {
-          totalGames: 0,
-          totalPlayers: 0,
-          totalPlays: 0,
-          recentPlays: [],
-        };
-      }
-
-      const recentPlays = gamePlays
-        .filter((play) => {
-          try {
-            return (
-              play && Array.isArray(play.results) && play.results.length > 0
-            );
-          } catch (err) {
-            console.error("Error filtering play:", err);
-            return false;
-          }
-        })
-        .sort((a, b) => {
-          try {
-            return (
-              new Date(b.start_time).getTime() -
-              new Date(a.start_time).getTime()
-            );
-          } catch (err) {
-            console.error("Error sorting dates:", err);
-            return 0;
-          }
-        })
-        .slice(0, 5)
-        .map((play) => {
-          try {
-            const winnerResult = play.results?.find((r) => r?.rank === 1);
-            const game = games.find((g) => g?.game_id === play.game_id);
-            const winner = players.find(
-              (p) => p?.player_id === winnerResult?.player_id
-            );
-
-            return {
-              game_play_id: play.play_id,
-              game_name: game?.name || "Unknown Game",
-              date: play.start_time
-                ? new Date(play.start_time).toLocaleDateString()
-                : "Unknown Date",
-              winner: winner?.name || "Unknown Player",
-            };
-          } catch (err) {
-            console.error("Error mapping play data:", err);
-            return {
-              game_play_id: play.play_id || 0,
-              game_name: "Error Loading Game",
-              date: "Unknown Date",
-              winner: "Unknown Player",
-            };
-          }
-        });
-
-      return {
-        totalGames: games.length || 0,
-        totalPlayers: players.length || 0,
-        totalPlays: gamePlays.length || 0,
-        recentPlays,
-      };
-    } catch (err) {
-      console.error("Error calculating dashboard stats:", err);
-      setError(
-        err instanceof Error ? err.message : "Failed to calculate stats"
-      );
-      return {
-        totalGames: 0,
-        totalPlayers: 0,
-        totalPlays: 0,
-        recentPlays: [],
-      };
-    }
-  }, [games, players, gamePlays]);
-
-  const loading = gamesLoading || playersLoading || playsLoading;
-
-  const getAvailableYears = (plays: Play[]): number[] => {
-    const years = plays.map((play) => new Date(play.start_time).getFullYear());
-    return Array.from(new Set(years)).sort((a, b) => b - a); // Sort descending
-  };
-
-  const calculateWinRates = (
-    players: Player[],
-    plays: Play[],
-    minPlays: number,
-    year?: number
-  ) => {
-    const filteredPlays = year
-      ? plays.filter((play) => new Date(play.start_time).getFullYear() === year)
-      : plays;
-
-    return players
-      .map((player) => {
-        const playerPlays = filteredPlays.filter((play) =>
-          play?.results?.some((r) => r?.player_id === player.player_id)
-        );
-
-        const wins = playerPlays.filter((play) =>
-          play?.results?.some(
-            (r) => r?.player_id === player.player_id && r?.rank === 1
-          )
-        ).length;
-
-        const totalPlays = playerPlays.length;
-        const winRate = totalPlays > 0 ? (wins / totalPlays) * 100 : 0;
+  if (isLoading) return <LoadingSpinner />;
+  if (error)
+    return (
+      <ErrorMessage
+        message={
+          error instanceof Error ? error.message : "Failed to load dashboard"
+        }
+      />
+    );
+  if (!dashboard) return null;
 
-        return {
-          player_id: player.player_id,
-          player_name: player.name,
-          winRate: Number(winRate.toFixed(1)),
-          totalPlays,
-        };
-      })
-      .filter((player) => player.totalPlays >= minPlays)
-      .sort((a, b) => b.winRate - a.winRate)
-      .slice(0, 5);
-  };
-
-  if (loading) return <LoadingSpinner />;
-  if (error) return <ErrorMessage message={error} />;
+  const { totals } = dashboard;
 
   return (
     <div className="container mx-auto px-4 py-8">
@@ -207,7 +85,7 @@ const Dashboard: React.FC = () => {
               Total Games
             </h3>
             <div className="text-4xl font-bold text-blue-600">
-              {stats.totalGames}
+              {totals.games}
             </div>
           </div>
         </Card>
@@ -218,7 +96,7 @@ const Dashboard: React.FC = () => {
               Total Players
             </h3>
             <div className="text-4xl font-bold text-green-600">
-              {stats.totalPlayers}
+              {totals.players}
             </div>
           </div>
         </Card>
@@ -229,7 +107,7 @@ const Dashboard: React.FC = () => {
               Total Plays
             </h3>
             <div className="text-4xl font-bold text-purple-600">
-              {stats.totalPlays}
+              {totals.plays}
             </div>
           </div>
         </Card>
@@ -261,7 +139,7 @@ const Dashboard: React.FC = () => {
               className="p-2 border border-gray-300 rounded-md text-sm"
             >
               <option value="">All Time</option>
-              {getAvailableYears(gamePlays).map((year) => (
+              {dashboard.years.map((year) => (
                 <option key={year} value={year}>
                   {year}
                 </option>
@@ -270,42 +148,35 @@ const Dashboard: React.FC = () => {
           </div>
 
           <div className="divide-y">
-            {calculateOverallPlayerStats(
-              games,
-              gamePlays,
-              players,
-              selectedYear
-            )
-              .filter((stat) => stat.total_plays >= minPlays)
-              .map((stat, index) => (
-                <div
-                  key={stat.player_id}
-                  className="py-4 flex items-center justify-between hover:bg-blue-50 transition-colors rounded-lg px-4"
-                >
-                  <div className="flex items-center space-x-4">
-                    <div className="flex items-center justify-center w-8 h-8 rounded-full bg-blue-100 text-blue-600 font-bold">
-                      {index + 1}
-                    </div>
-                    <Link
-                      to={`/players/${stat.player_id}`}
-                      className="hover:text-blue-600"
-                    >
-                      {stat.player_name}
-                    </Link>
-                  </div>
-                  <div className="flex items-center space-x-4">
-                    <span className="text-sm text-gray-600">
-                      {stat.total_plays} plays
-                    </span>
-                    <span
-                      className={`font-bold ${getGradeColor(stat.grade_point)}`}
-                    >
-                      {stat.grade_point.toFixed(2)} (
-                      {getGradeLabel(Number(stat.grade_point.toFixed(2)))})
-                    </span>
+            {dashboard.player_rankings.map((stat, index) => (
+              <div
+                key={stat.player_id}
+                className="py-4 flex items-center justify-between hover:bg-blue-50 transition-colors rounded-lg px-4"
+              >
+                <div className="flex items-center space-x-4">
+                  <div className="flex items-center justify-center w-8 h-8 rounded-full bg-blue-100 text-blue-600 font-bold">
+                    {index + 1}
                   </div>
+                  <Link
+                    to={`/players/${stat.player_id}`}
+                    className="hover:text-blue-600"
+                  >
+                    {stat.player_name}
+                  </Link>
                 </div>
-              ))}
+                <div className="flex items-center space-x-4">
+                  <span className="text-sm text-gray-600">
+                    {stat.total_plays} plays
+                  </span>
+                  <span
+                    className={`font-bold ${getGradeColor(stat.grade_point)}`}
+                  >
+                    {stat.grade_point.toFixed(2)} (
+                    {getGradeLabel(Number(stat.grade_point.toFixed(2)))})
+                  </span>
+                </div>
+              </div>
+            ))}
           </div>
         </Card>
       </div>
@@ -314,15 +185,20 @@ const Dashboard: React.FC = () => {
         {/* Recent Plays */}
         <Card title="Recent Game Plays">
           <div className="divide-y">
-            {stats.recentPlays.map((play) => (
-              <div key={play.game_play_id} className="py-3">
+            {dashboard.recent_plays.map((play) => (
+              <div key={play.play_id} className="py-3">
                 <Link
-                  to={`/game-plays/${play.game_play_id}`}
+                  to={`/game-plays/${play.play_id}`}
                   className="hover:text-blue-600"
                 >
-                  <p className="font-medium">{play.game_name}</p>
+                  <p className="font-medium">
+                    {play.game?.name || "Unknown Game"}
+                  </p>
                   <p className="text-sm text-gray-600">
-                    Winner: {play.winner} - {play.date}
+                    Winner: {getWinnerName(play)} -{" "}
+                    {play.start_time
+                      ? new Date(play.start_time).toLocaleDateString()
+                      : "Unknown Date"}
                   </p>
                 </Link>
               </div>
@@ -333,32 +209,30 @@ const Dashboard: React.FC = () => {
         {/* Win Rate Rankings */}
         <Card title="Win Rate Rankings">
           <div className="divide-y">
-            {calculateWinRates(players, gamePlays, minPlays, selectedYear).map(
-              (player, index) => (
-                <div
-                  key={player.player_id}
-                  className="py-3 flex justify-between items-center"
-                >
-                  <div className="flex items-center space-x-4">
-                    <span className="text-lg font-medium w-8">{index + 1}</span>
-                    <Link
-                      to={`/players/${player.player_id}`}
-                      className="font-medium hover:text-blue-600"
-                    >
-                      {player.player_name}
-                    </Link>
-                  </div>
-                  <div className="text-sm text-gray-600 space-x-2">
-                    <span className="font-semibold text-blue-600">
-                      {player.winRate}%
-                    </span>
-                    <span className="text-gray-400">
-                      ({player.totalPlays} plays)
-                    </span>
-                  </div>
+            {dashboard.win_rates.map((player, index) => (
+              <div
+                key={player.player_id}
+                className="py-3 flex justify-between items-center"
+              >
+                <div className="flex items-center space-x-4">
+                  <span className="text-lg font-medium w-8">{index + 1}</span>
+                  <Link
+                    to={`/players/${player.player_id}`}
+                    className="font-medium hover:text-blue-600"
+                  >
+                    {player.name}
+                  </Link>
                 </div>
-              )
-            )}
+                <div className="text-sm text-gray-600 space-x-2">
+                  <span className="font-semibold text-blue-600">
+                    {player.win_rate}%
+                  </span>
+                  <span className="text-gray-400">
+                    ({player.total_plays} plays)
+                  </span>
+                </div>
+              </div>
+            ))}
           </div>
         </Card>
       </div>
@@ -13,12 +13,15 @@ const GameLibrary: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState("");
   const [sortBy, setSortBy] = useState<"name" | "avg_play_time">("name");
   const [importing, setImporting] = useState(false);
+  const [importProgress, setImportProgress] = useState("");
 
   const handleBGGImport = async () => {
     try {
       setImporting(true);
 
-      const result = await importBGGCollection("HarryTr");
+      const result = await importBGGCollection("HarryTr", (job) => {
+        setImportProgress(job.total ? ` ${job.progress}/${job.total}` : "");
+      });
 
       // Invalidate and refetch games
       await queryClient.invalidateQueries({ queryKey: ['games'] });
@@ -29,6 +32,7 @@ const GameLibrary: React.FC = () => {
       console.error("BGG import error:", err);
     } finally {
       setImporting(false);
+      setImportProgress("");
     }
   };
 
@@ -53,7 +57,7 @@ const GameLibrary: React.FC = () => {
           disabled={importing}
           className="px-4 py-2 bg-green-600 text-white rounded-md hover:bg-green-700 disabled:opacity-50 disabled:cursor-not-allowed"
         >
-          {importing ? "Importing..." : "Retrieve from BGG"}
+          {importing ? `Importing${importProgress}...` : "Retrieve from BGG"}
         </button>
       </div>
 
@@ -106,9 +110,6 @@ const GameLibrary: React.FC = () => {
                 <div className="mt-4 text-sm text-gray-600">
                   {game.min_players}-{game.max_players} players • {game.avg_play_time} min
                 </div>
-                <p className="mt-2 text-sm text-gray-600 line-clamp-2">
-                  {game.description}
-                </p>
               </div>
             </Link>
           </Card>
@@ -1,15 +1,15 @@
-import React, { useState } from "react";
+import React, { useMemo, useState } from "react";
 import { Link } from "react-router-dom";
 import Card from "../components/common/Card";
 import LoadingSpinner from "../components/common/LoadingSpinner";
 import ErrorMessage from "../components/common/ErrorMessage";
 import { PlusIcon } from "@heroicons/react/24/outline";
 import { useGames, usePlayers, useGamePlays } from "../hooks";
+import { PlayFilters } from "../models/Play";
 
 const GamePlayLog: React.FC = () => {
   const { data: games = [], isLoading: gamesLoading } = useGames();
   const { data: players = [], isLoading: playersLoading } = usePlayers();
-  const { data: gamePlays = [], isLoading: playsLoading } = useGamePlays();
   const [filters, setFilters] = useState({
     gameId: "",
     playerId: "",
@@ -17,6 +17,29 @@ const GamePlayLog: React.FC = () => {
     dateTo: "",
   });
 
+  // Filtering happens on the server, one page at a time
+  const playFilters = useMemo<PlayFilters>(
+    () => ({
+      game_id: filters.gameId ? parseInt(filters.gameId) : undefined,
+      player_id: filters.playerId ? parseInt(filters.playerId) : undefined,
+      from: filters.dateFrom || undefined,
+      to: filters.dateTo || undefined,
+    }),
+    [filters]
+  );
+  const {
+    data: playPages,
+    isLoading: playsLoading,
+    error: playsError,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useGamePlays(playFilters);
+  const gamePlays = useMemo(
+    () => playPages?.pages.flatMap((page) => page.items) ?? [],
+    [playPages]
+  );
+
   const isLoading = gamesLoading || playersLoading || playsLoading;
 
   const handleFilterChange = (
@@ -29,23 +52,8 @@ const GamePlayLog: React.FC = () => {
     }));
   };
 
-  const filteredGamePlays = gamePlays.filter((play) => {
-    const matchesGame =
-      !filters.gameId || play.game_id === parseInt(filters.gameId);
-    const matchesPlayer =
-      !filters.playerId ||
-      play.results.some((r) => r.player_id === parseInt(filters.playerId));
-    const matchesDateFrom =
-      !filters.dateFrom ||
-      new Date(play.start_time) >= new Date(filters.dateFrom);
-    const matchesDateTo =
-      !filters.dateTo || new Date(play.start_time) <= new Date(filters.dateTo);
-
-    return matchesGame && matchesPlayer && matchesDateFrom && matchesDateTo;
-  });
-
   if (isLoading) return <LoadingSpinner />;
-  if (!games || !players || !gamePlays) return <ErrorMessage message="Failed to load data" />;
+  if (!games || !players) return <ErrorMessage message="Failed to load data" />;
 
   return (
     <div className="container mx-auto px-4 py-8">
@@ -127,68 +135,76 @@ const GamePlayLog: React.FC = () => {
         </div>
       </Card>
 
+      {playsError && <ErrorMessage message={playsError.message} />}
+
       <div className="space-y-4">
-        {filteredGamePlays.length === 0 ? (
+        {gamePlays.length === 0 ? (
           <div className="text-center py-8 text-gray-500">
             No game plays found matching your criteria.
           </div>
         ) : (
-          filteredGamePlays
-            .sort(
-              (a, b) =>
-                new Date(b.start_time).getTime() -
-                new Date(a.start_time).getTime()
-            )
-            .map((play) => (
-              <Card key={play.play_id} className="transition-all duration-300 hover:ring-4 hover:ring-blue-600 hover:ring-opacity-50 rounded-lg">
-                <Link
-                  to={`/game-plays/${play.play_id}`}
-                  className="block p-4"
-                >
-                  <div className="flex justify-between items-start">
-                    <div>
-                      <h2 className="text-xl font-bold mb-2">
-                        {games.find((g) => g.game_id === play.game_id)?.name}
-                      </h2>
-                      <p className="text-gray-600">
-                        {new Date(play.start_time).toLocaleDateString()} •{" "}
-                        {play.mode || "Standard Game"}
-                      </p>
-                      <div className="mt-2">
-                        {play.results
-                          .sort((a, b) => a.rank - b.rank)
-                          .map((result, index) => (
-                            <span
-                              key={result.player_id}
-                              className="text-sm text-gray-600"
-                            >
-                              {index > 0 ? ", " : ""}
-                              {
-                                players.find(
-                                  (p) => p.player_id === result.player_id
-                                )?.name
-                              }
-                              {result.score !== null
-                                ? ` (${result.score})`
-                                : ""}
-                            </span>
-                          ))}
-                      </div>
-                    </div>
-                    <div className="text-sm text-gray-500">
-                      {Math.round(
-                        (new Date(play.end_time).getTime() -
-                          new Date(play.start_time).getTime()) /
-                          (1000 * 60)
-                      )}{" "}
-                      min
+          gamePlays.map((play) => (
+            <Card key={play.play_id} className="transition-all duration-300 hover:ring-4 hover:ring-blue-600 hover:ring-opacity-50 rounded-lg">
+              <Link
+                to={`/game-plays/${play.play_id}`}
+                className="block p-4"
+              >
+                <div className="flex justify-between items-start">
+                  <div>
+                    <h2 className="text-xl font-bold mb-2">
+                      {games.find((g) => g.game_id === play.game_id)?.name}
+                    </h2>
+                    <p className="text-gray-600">
+                      {new Date(play.start_time).toLocaleDateString()} •{" "}
+                      {play.mode || "Standard Game"}
+                    </p>
+                    <div className="mt-2">
+                      {play.results
+                        .sort((a, b) => a.rank - b.rank)
+                        .map((result, index) => (
+                          <span
+                            key={result.player_id}
+                            className="text-sm text-gray-600"
+                          >
+                            {index > 0 ? ", " : ""}
+                            {
+                              players.find(
+                                (p) => p.player_id === result.player_id
+                              )?.name
+                            }
+                            {result.score !== null
+                              ? ` (${result.score})`
+                              : ""}
+                          </span>
+                        ))}
                     </div>
                   </div>
-                </Link>
-              </Card>
-            ))
+                  <div className="text-sm text-gray-500">
+                    {Math.round(
+                      (new Date(play.end_time).getTime() -
+                        new Date(play.start_time).getTime()) /
+                        (1000 * 60)
+                    )}{" "}
+                    min
+                  </div>
+                </div>
+              </Link>
+            </Card>
+          ))
         )}
       </div>
+
+      {hasNextPage && (
+        <div className="mt-6 flex justify-center">
+          <button
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+            className="px-4 py-2 bg-blue-600 text-white rounded-md hover:bg-blue-700 transition-colors disabled:opacity-50"
+          >
+            {isFetchingNextPage ? "Loading..." : "Load More"}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -8,14 +8,14 @@ import {
   getGradeLabel,
   getGradeColor,
 } from "../utils/gradeCalculator";
-import { useGames, usePlayers, useGamePlays } from "../hooks";
+import { useGames, usePlayers, useAllGamePlays } from "../hooks";
 
 const PlayerDirectory: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState("");
   const [sortBy, setSortBy] = useState<"name" | "plays" | "wins">("name");
   const { data: games = [], isLoading: gamesLoading } = useGames();
   const { data: players = [], isLoading: playersLoading } = usePlayers();
-  const { data: gamePlays = [], isLoading: playsLoading } = useGamePlays();
+  const { data: gamePlays = [], isLoading: playsLoading } = useAllGamePlays();
 
   const getPlayerStats = (playerId: number) => {
     const playerPlays = gamePlays.filter((play) =>